@@ -178,6 +178,7 @@ async def main(message: cl.Message):
         
         thread_id = str(uuid.uuid4())
         cl.user_session.set("graph", graph)
+        cl.user_session.set("retriever", retriever)
         cl.user_session.set("thread_id", thread_id)
         
         prev_report = cl.user_session.get("previous_context", "")
@@ -327,6 +328,11 @@ async def execute_research(graph, input_state, config_dict):
         logger.error(f"Execution Error: {err_msg}")
         await cl.Message(content=f"❌ **システムエラーが発生しました:**\n```python\n{err_msg}\n```").send()
         cl.user_session.set("graph", None)
+    finally:
+        # Release pooled connections after every run; the next message opens new ones as needed
+        retriever = cl.user_session.get("retriever")
+        if retriever is not None:
+            await retriever.aclose()
 
 if __name__ == "__main__":
     # Standard entry point for debugging, but typically run via `chainlit run`
@@ -44,6 +44,7 @@ class Configuration(BaseSettings):
     # Research Loop Configuration
     MAX_RESEARCH_LOOPS: int = Field(default=5)
     MAX_SEARCH_RESULTS_PER_QUERY: int = Field(default=10)
+    PARALLEL_QUERIES: int = Field(default=1, ge=1, description="Search queries reflection may propose per follow-up loop; above 1 they are searched concurrently and merged by link")
 
     # Skill Configuration
     EVOLVE_SKILLS: bool = Field(default=True, description="Whether to extract and save new domain skills during research.")
@@ -63,6 +64,14 @@ class Configuration(BaseSettings):
     # Summarization Configuration
     SUMMARIZATION_CHUNK_SIZE_CHARS: int = Field(default=12000)
     SUMMARIZATION_CHUNK_OVERLAP_CHARS: int = Field(default=500)
+    MIN_CHUNK_SUMMARIZE_CHARS: int = Field(default=0, description="Chunks with fewer non-whitespace chars are used verbatim instead of being summarized by the LLM (0 disables)")
+    CHUNK_SUMMARY_BATCH_SIZE: int = Field(default=1, description="Chunks summarized per LLM call; above 1, segments share one prompt and are split from tagged output")
+    CHUNK_DEDUP_MAX_DISTANCE: int = Field(default=-1, ge=-1, description="Skip a chunk whose SimHash is within this many bits of an earlier chunk in the same batch (e.g. 3; 0 drops exact duplicates only; -1 disables)")
+    CHUNK_SUMMARY_BATCH_MAX_TOKENS: int = Field(default=0, ge=0, description="Estimated input tokens allowed per batched chunk-summary call; batches close early once full (0 caps by CHUNK_SUMMARY_BATCH_SIZE only)")
+    MAX_SUMMARY_INPUT_TOKENS: int = Field(default=0, description="Token budget for page content summarized per query; least relevant sources beyond it are skipped (0 disables)")
+    COMBINE_SUMMARY_AND_KG: bool = Field(default=False, description="Extract the knowledge graph in the same structured call as each query's summary synthesis instead of a separate extraction call")
+    KG_FROM_CHUNK_SUMMARIES: bool = Field(default=False, description="Extract the knowledge graph from the per-chunk summaries in one batched call that overlaps the summary synthesis, instead of from the synthesized summary")
+    MAX_CACHED_PAGES: int = Field(default=256, ge=0, description="Fetched page texts kept in memory for reuse across loops and sections; least recently used are evicted (0 = unbounded)")
 
     # Optimization Configuration
     MAX_CONCURRENT_CHUNKS: int = Field(default=10)
@@ -73,10 +82,22 @@ class Configuration(BaseSettings):
 
     ENABLE_CACHING: bool = Field(default=True, description="Enable persistent caching")
     CACHE_DIR: str = Field(default=".cache", description="Directory for cache files")
+    SEARCH_CACHE_TTL_SECONDS: int = Field(default=3600, description="How long search results are reused from the disk cache (0 disables)")
+    CONTENT_CACHE_TTL_SECONDS: int = Field(default=86400, description="Lifetime of cached page content in seconds")
+    LLM_MEMORY_CACHE_MAX_ENTRIES: int = Field(default=100, description="Maximum prompts kept in the in-process LLM response cache")
+    LLM_MEMORY_CACHE_TTL_SECONDS: float = Field(default=60.0, description="Lifetime of in-process LLM response cache entries in seconds")
     
+    COMBINE_GROUP_SIZE: int = Field(default=5, description="Chunk summaries combined per call when reducing many summaries before the final synthesis")
+    MAX_CONCURRENT_LLM_CALLS: int = Field(default=8, description="Maximum LLM requests in flight at once across all research steps")
+    PROGRESS_QUEUE_MAX_MESSAGES: int = Field(default=1000, description="Progress messages buffered for the UI callback before new ones are dropped")
     MAX_CONCURRENT_RETRIEVALS: int = Field(default=20, description="Maximum concurrent web content retrievals")
+    MAX_POOLED_HOSTS: int = Field(default=32, ge=1, description="Hosts whose keep-alive connections are kept open by the content retriever; the least recently used host's client is closed beyond this")
+    MAX_CONCURRENT_SEARCHES: int = Field(default=5, ge=1, description="Maximum search API requests in flight at once")
     BATCH_SIZE_RELEVANCE: int = Field(default=5, description="Number of results to score in one LLM call")
+    KG_EXTRACTION_BATCH_SIZE: int = Field(default=1, description="Summaries buffered per knowledge graph extraction call (1 extracts immediately)")
 
+    ENABLE_STREAMING: bool = Field(default=False, description="Stream the per-query synthesis so partial summaries are visible early")
+    STREAM_FLUSH_CHARS: int = Field(default=8192, description="Characters buffered between partial-summary updates when streaming")
     USE_SNIPPETS_ONLY_MODE: bool = Field(default=False, validation_alias=AliasChoices("USE_SNIPPETS_ONLY_MODE", "SNIPPETS_ONLY"))
     MAX_TEXT_LENGTH_PER_SOURCE_CHARS: int = Field(default=0)
     PROCESS_PDF_FILES: bool = Field(default=True)
@@ -94,6 +115,8 @@ class Configuration(BaseSettings):
     CLEANUP_AGE_SECONDS: int = Field(default=3600)
     DEFAULT_LANGUAGE: str = Field(default="Japanese")
     MAX_FINAL_REPORT_CONTEXT_CHARS: int = Field(default=102400, description="Max characters of context passed to final report generation to prevent overflow.")
+    MIN_TOKENS_FOR_SYNTHESIS: int = Field(default=0, description="A single-section run whose summary is shorter than this many tokens uses it as the report body without an LLM synthesis call (0 disables)")
+    FINAL_REPORT_MAX_TOKENS: int = Field(default=0, ge=0, description="Stop streaming the final report once this many tokens have been generated (0 disables)")
     
     # Relevance Filtering Configuration (Phase 6)
     ENABLE_RELEVANCE_FILTERING: bool = Field(default=True, description="Enable relevance filtering for search results")
@@ -216,17 +239,36 @@ class Configuration(BaseSettings):
             f"  Search API: {self.SEARCH_API}",
             f"  Max Research Loops: {self.MAX_RESEARCH_LOOPS}",
             f"  Max Search Results: {self.MAX_SEARCH_RESULTS_PER_QUERY}",
+            f"  Parallel Queries: {self.PARALLEL_QUERIES}",
             f"  Output Filename: {self.OUTPUT_FILENAME}",
             f"  Interactive Mode: {self.INTERACTIVE_MODE}",
             f"  Summarization Chunk Size Chars: {self.SUMMARIZATION_CHUNK_SIZE_CHARS}",
             f"  Summarization Chunk Overlap Chars: {self.SUMMARIZATION_CHUNK_OVERLAP_CHARS}",
+            f"  Min Chunk Summarize Chars: {self.MIN_CHUNK_SUMMARIZE_CHARS}",
+            f"  Chunk Summary Batch Size: {self.CHUNK_SUMMARY_BATCH_SIZE}",
+            f"  Chunk Dedup Max Distance: {self.CHUNK_DEDUP_MAX_DISTANCE}",
+            f"  Chunk Summary Batch Max Tokens: {self.CHUNK_SUMMARY_BATCH_MAX_TOKENS}",
+            f"  Max Summary Input Tokens: {self.MAX_SUMMARY_INPUT_TOKENS}",
+            f"  Combine Summary And KG: {self.COMBINE_SUMMARY_AND_KG}",
+            f"  KG From Chunk Summaries: {self.KG_FROM_CHUNK_SUMMARIES}",
+            f"  Max Cached Pages: {self.MAX_CACHED_PAGES}",
             f"  Max Concurrent Chunks: {self.MAX_CONCURRENT_CHUNKS}",
             f"  LLM Rate Limit RPM: {self.LLM_RATE_LIMIT_RPM}",
             f"  LLM Rate Limit TPM: {self.LLM_RATE_LIMIT_TPM}",
             f"  Enable Caching: {self.ENABLE_CACHING}",
             f"  Cache Dir: {self.CACHE_DIR}",
+            f"  Search Cache TTL: {self.SEARCH_CACHE_TTL_SECONDS}s",
+            f"  Content Cache TTL: {self.CONTENT_CACHE_TTL_SECONDS}s",
+            f"  LLM Memory Cache: {self.LLM_MEMORY_CACHE_MAX_ENTRIES} entries, TTL {self.LLM_MEMORY_CACHE_TTL_SECONDS}s",
+            f"  Combine Group Size: {self.COMBINE_GROUP_SIZE}",
+            f"  Max Concurrent LLM Calls: {self.MAX_CONCURRENT_LLM_CALLS}",
+            f"  Progress Queue Max Messages: {self.PROGRESS_QUEUE_MAX_MESSAGES}",
             f"  Max Concurrent Retrievals: {self.MAX_CONCURRENT_RETRIEVALS}",
+            f"  Max Pooled Hosts: {self.MAX_POOLED_HOSTS}",
+            f"  Max Concurrent Searches: {self.MAX_CONCURRENT_SEARCHES}",
             f"  Batch Size Relevance: {self.BATCH_SIZE_RELEVANCE}",
+            f"  KG Extraction Batch Size: {self.KG_EXTRACTION_BATCH_SIZE}",
+            f"  Enable Streaming: {self.ENABLE_STREAMING} (flush every {self.STREAM_FLUSH_CHARS} chars)",
             f"  Use Snippets Only Mode: {self.USE_SNIPPETS_ONLY_MODE}",
             f"  Max Text Length per Source (Chars): {self.MAX_TEXT_LENGTH_PER_SOURCE_CHARS}",
             f"  Process PDF Files: {self.PROCESS_PDF_FILES}",
@@ -235,6 +277,8 @@ class Configuration(BaseSettings):
             f"  SearxNG Language: {self.SEARXNG_LANGUAGE}",
             f"  SearxNG SafeSearch: {self.SEARXNG_SAFESEARCH}",
             f"  SearxNG Categories: {self.SEARXNG_CATEGORIES}",
+            f"  Min Tokens For Synthesis: {self.MIN_TOKENS_FOR_SYNTHESIS}",
+            f"  Final Report Max Tokens: {self.FINAL_REPORT_MAX_TOKENS}",
             f"  Research Plan Sections: {self.RESEARCH_PLAN_MIN_SECTIONS}-{self.RESEARCH_PLAN_MAX_SECTIONS}",
             f"  Max Query Words: {self.MAX_QUERY_WORDS}",
             f"  Report Directory: {self.REPORT_DIR}",
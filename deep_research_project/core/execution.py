@@ -1,21 +1,38 @@
 import asyncio
 import logging
+import re
+from dataclasses import replace
 from typing import List, Optional, Callable
 from pydantic import BaseModel
 from deep_research_project.config.config import Configuration
 from deep_research_project.tools.llm_client import LLMClient
 from deep_research_project.tools.search_client import SearchClient
 from deep_research_project.tools.content_retriever import ContentRetriever
-from deep_research_project.core.state import SearchResult
-from deep_research_project.core.utils import split_text_into_chunks
+from deep_research_project.core.state import SearchResult, KnowledgeGraphModel, SummaryWithGraphModel
+from deep_research_project.core.utils import split_text_into_chunks, estimate_tokens, drop_near_duplicates
 from deep_research_project.core.prompts import (
     SUMMARIZE_CHUNK_PROMPT_JA, SUMMARIZE_CHUNK_PROMPT_EN,
+    SUMMARIZE_CHUNK_SYSTEM_PROMPT_JA, SUMMARIZE_CHUNK_SYSTEM_PROMPT_EN,
+    SUMMARIZE_CHUNKS_BATCH_PROMPT_JA, SUMMARIZE_CHUNKS_BATCH_PROMPT_EN,
+    SUMMARIZE_CHUNKS_BATCH_SYSTEM_PROMPT_JA, SUMMARIZE_CHUNKS_BATCH_SYSTEM_PROMPT_EN, SUMMARIZE_BATCH_SEGMENT_TEMPLATE,
     COMBINE_SUMMARIES_PROMPT_JA, COMBINE_SUMMARIES_PROMPT_EN,
-    RELEVANCE_SCORING_PROMPT_JA, RELEVANCE_SCORING_PROMPT_EN
+    SUMMARY_GRAPH_INSTRUCTION_JA, SUMMARY_GRAPH_INSTRUCTION_EN,
+    RELEVANCE_SCORING_PROMPT_JA, RELEVANCE_SCORING_PROMPT_EN,
+    BATCH_RELEVANCE_SCORING_PROMPT_JA, BATCH_RELEVANCE_SCORING_PROMPT_EN, BATCH_RELEVANCE_ITEM_TEMPLATE
 )
 
 logger = logging.getLogger(__name__)
 
+# Returned by retrieve_and_summarize when a batch yields nothing to report
+NO_CONTENT_SUMMARY = "Could not retrieve any content to summarize."
+NO_SEGMENT_SUMMARIES = "Failed to generate any summaries from the segments."
+
+# One tagged block per segment in a batched summarization response
+_BATCH_SUMMARY_RE = re.compile(r"<SUMMARY\s+id\s*=\s*[\"']?(\d+)[\"']?\s*>(.*?)</SUMMARY>", re.IGNORECASE | re.DOTALL)
+
+class ScoreBatch(BaseModel):
+    scores: List[float]
+
 class ResearchExecutor:
     def __init__(self, config: Configuration, llm_client: LLMClient, 
                  search_client: SearchClient, content_retriever: ContentRetriever):
@@ -24,17 +41,57 @@ class ResearchExecutor:
         self.search_client = search_client
         self.content_retriever = content_retriever
         self.chunk_semaphore = asyncio.Semaphore(getattr(self.config, "MAX_CONCURRENT_CHUNKS", 5))
-        self.retrieval_semaphore = asyncio.Semaphore(getattr(self.config, "MAX_CONCURRENT_RETRIEVALS", 5))
+        self.retrieval_semaphore = asyncio.Semaphore(getattr(self.config, "MAX_CONCURRENT_RETRIEVALS", 20))
+        self.search_semaphore = asyncio.Semaphore(getattr(self.config, "MAX_CONCURRENT_SEARCHES", 5))
 
     async def search(self, query: str, num_results: int) -> List[SearchResult]:
-        """Performs web search and returns results."""
-        logger.info(f"Searching for: {query}")
-        return await self.search_client.search(query, num_results=num_results)
+        """Performs web search and returns results, dropping repeated links so they are not scored or fetched twice."""
+        logger.info("Searching for: %s", query)
+        # Shared by sections, prefetches and multi-query searches, keeping the search API within its rate limits
+        async with self.search_semaphore:
+            results = await self.search_client.search(query, num_results=num_results)
+        seen_links = set()
+        unique_results = []
+        for res in results:
+            if res.link not in seen_links:
+                seen_links.add(res.link)
+                unique_results.append(res)
+        return unique_results
+
+    async def search_many(self, queries: List[str], num_results: int) -> List[SearchResult]:
+        """
+        Runs several searches concurrently and merges them by link, in query order.
+        A link found by more than one query keeps its longest snippet; a failed query contributes nothing.
+        """
+        if len(queries) == 1:
+            return await self.search(queries[0], num_results)
+        outcomes = await asyncio.gather(*[self.search(q, num_results) for q in queries], return_exceptions=True)
+        merged: dict = {}
+        for query, outcome in zip(queries, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Search failed for '{query}': {outcome}")
+                continue
+            for res in outcome:
+                kept = merged.get(res.link)
+                if kept is None:
+                    merged[res.link] = res
+                elif len(res.snippet or "") > len(kept.snippet or ""):
+                    merged[res.link] = replace(kept, snippet=res.snippet)
+        return list(merged.values())
 
     async def retrieve_and_summarize(self, results: List[SearchResult], query: str, 
                                    language: str, fetched_content: Optional[dict] = None, 
-                                   progress_callback: Optional[Callable] = None) -> str:
-        """Retrieves full content for search results and generates summaries in parallel."""
+                                   progress_callback: Optional[Callable] = None,
+                                   on_partial: Optional[Callable[[str], None]] = None,
+                                   on_graph: Optional[Callable[[KnowledgeGraphModel], None]] = None,
+                                   on_chunk_summaries: Optional[Callable[[List[str]], None]] = None) -> str:
+        """
+        Retrieves full content for search results and generates summaries in parallel.
+        With ENABLE_STREAMING, the final synthesis is streamed and `on_partial` receives the text so far.
+        When `on_graph` is given, the final synthesis also extracts a knowledge graph in the same structured
+        call and passes it to `on_graph`; if that call fails, a plain synthesis is returned and `on_graph` is not called.
+        `on_chunk_summaries` receives the per-chunk summaries before they are reduced and synthesized.
+        """
         if fetched_content is None:
             # We need to be careful here: if the caller expects us to update a persistent dict,
             # they must pass it. If they pass None, we use a local one for this session.
@@ -42,44 +99,83 @@ class ResearchExecutor:
         
         all_chunks_info = []
         
+        # One fetch per distinct uncached URL, decided before any await so duplicates never race.
+        # This batch's pages are held locally too, since a bounded fetched_content may evict them meanwhile.
+        page_content = {}
+        uncached = {}
+        for res in results:
+            if res.link in page_content or res.link in uncached:
+                continue
+            if res.link in fetched_content:
+                page_content[res.link] = fetched_content[res.link]
+            else:
+                uncached[res.link] = res
+
         async def get_content(res):
-            url = res.link
-            if url not in fetched_content:
-                async with self.retrieval_semaphore:
-                    if progress_callback: await progress_callback(f"Retrieving: {url}")
-                    if getattr(self.config, "USE_SNIPPETS_ONLY_MODE", False):
-                        content = res.snippet
-                    else:
-                        content = await self.content_retriever.retrieve_and_extract(url)
-                        if not content: content = res.snippet
-                    fetched_content[url] = content
-            return url, fetched_content[url]
-
-        # Parallel retrieval
-        await asyncio.gather(*[get_content(res) for res in results])
+            # Report outside the semaphore so a slow UI callback never holds a fetch slot
+            if progress_callback: await progress_callback(f"Retrieving: {res.link}")
+            if getattr(self.config, "USE_SNIPPETS_ONLY_MODE", False):
+                return res.snippet
+            async with self.retrieval_semaphore:
+                return await self.content_retriever.retrieve_and_extract(res.link)
 
-        for res in results:
-            url = res.link
-            content = fetched_content[url]
+        # Parallel retrieval; a failed fetch falls back to the snippet instead of failing the batch
+        contents = await asyncio.gather(*[get_content(res) for res in uncached.values()], return_exceptions=True)
+        for res, content in zip(uncached.values(), contents):
+            if isinstance(content, Exception):
+                logger.warning(f"Retrieval failed for {res.link}: {content}")
+                content = None
+            page_content[res.link] = fetched_content[res.link] = content or res.snippet
+
+        urls = self._within_token_budget(list(dict.fromkeys(res.link for res in results)), page_content)
+        for url in urls:
+            content = page_content[url]
             chunks = split_text_into_chunks(content, 
                                             getattr(self.config, "SUMMARIZATION_CHUNK_SIZE_CHARS", 10000), 
                                             getattr(self.config, "SUMMARIZATION_CHUNK_OVERLAP_CHARS", 500))
-            all_chunks_info.extend([(chunk, url) for chunk in chunks])
+            # isspace() stops at the first visible character; strip() would copy the whole chunk
+            all_chunks_info.extend([(chunk, url) for chunk in chunks if chunk and not chunk.isspace()])
 
         if not all_chunks_info:
-            return "Could not retrieve any content to summarize."
+            return NO_CONTENT_SUMMARY
+
+        # Mirrored and reprinted pages yield near-identical chunks; summarize each such chunk once.
+        # Hashing is CPU-bound, so it runs off the event loop to keep other sections' I/O moving.
+        max_distance = getattr(self.config, "CHUNK_DEDUP_MAX_DISTANCE", -1)
+        if max_distance >= 0 and len(all_chunks_info) > 1:
+            kept = await asyncio.to_thread(drop_near_duplicates, [c for c, _u in all_chunks_info], max_distance)
+            if len(kept) < len(all_chunks_info):
+                logger.info("Dropped %d of %d near-duplicate chunks before summarization.",
+                            len(all_chunks_info) - len(kept), len(all_chunks_info))
+                all_chunks_info = [all_chunks_info[i] for i in kept]
+
+        # Parallel summarization of chunks; tiny chunks are not worth a round-trip and stand in as their own summary
+        min_chars = getattr(self.config, "MIN_CHUNK_SUMMARIZE_CHARS", 0)
+        # Instructions and query form one system prompt shared by every chunk of this query, so only
+        # the segment differs between calls and the provider can reuse the cached prefix
+        if language == "Japanese":
+            chunk_template = SUMMARIZE_CHUNK_PROMPT_JA
+            chunk_system_prompt = SUMMARIZE_CHUNK_SYSTEM_PROMPT_JA.format(query=query)
+        else:
+            chunk_template = SUMMARIZE_CHUNK_PROMPT_EN
+            chunk_system_prompt = SUMMARIZE_CHUNK_SYSTEM_PROMPT_EN.format(query=query)
 
-        # Parallel summarization of chunks
         async def summarize_chunk(chunk, url):
+            if min_chars > 0 and len("".join(chunk.split())) < min_chars:
+                return chunk.strip()
             async with self.chunk_semaphore:
                 if progress_callback: await progress_callback(f"Summarizing chunk from {url}...")
-                if language == "Japanese":
-                    prompt = SUMMARIZE_CHUNK_PROMPT_JA.format(query=query, chunk=chunk)
-                else:
-                    prompt = SUMMARIZE_CHUNK_PROMPT_EN.format(query=query, chunk=chunk)
-                return await self.llm_client.generate_text(prompt=prompt)
+                return await self.llm_client.generate_text(
+                    prompt=chunk_template.format(chunk=chunk), system_prompt=chunk_system_prompt
+                )
 
-        chunk_summaries = await asyncio.gather(*[summarize_chunk(c, u) for c, u in all_chunks_info], return_exceptions=True)
+        batch_size = max(1, getattr(self.config, "CHUNK_SUMMARY_BATCH_SIZE", 1))
+        if batch_size > 1:
+            chunk_summaries = await self._summarize_chunks_batched(
+                all_chunks_info, query, language, batch_size, min_chars, summarize_chunk, progress_callback
+            )
+        else:
+            chunk_summaries = await asyncio.gather(*[summarize_chunk(c, u) for c, u in all_chunks_info], return_exceptions=True)
 
         valid_summaries = []
         for s in chunk_summaries:
@@ -95,62 +191,200 @@ class ResearchExecutor:
                 valid_summaries.append(s)
         
         if not valid_summaries:
-            return "Failed to generate any summaries from the segments."
+            return NO_SEGMENT_SUMMARIES
+        if on_chunk_summaries is not None:
+            on_chunk_summaries(list(valid_summaries))
+
+        # Reduce many summaries level by level so the final synthesis prompt stays bounded
+        valid_summaries = await self._tree_reduce(valid_summaries, query, language, progress_callback)
 
         # Final synthesis
-        combined = "\n\n---\n\n".join(valid_summaries)
-        if language == "Japanese":
-            prompt = COMBINE_SUMMARIES_PROMPT_JA.format(query=query, combined=combined)
-        else:
-            prompt = COMBINE_SUMMARIES_PROMPT_EN.format(query=query, combined=combined)
+        prompt = self._combine_prompt(valid_summaries, query, language)
+
+        if on_graph is not None:
+            combined = await self._synthesize_with_graph(prompt, urls, language)
+            if combined is not None:
+                on_graph(KnowledgeGraphModel(nodes=combined.nodes, edges=combined.edges))
+                return combined.summary
         
+        if getattr(self.config, "ENABLE_STREAMING", False):
+            return await self._stream_synthesis(prompt, on_partial)
+
         # INCREASED MAX TOKENS for synthesis to prevent truncation of combined detail
         return await self.llm_client.generate_text(prompt=prompt, temperature=0.3)
 
-    async def score_relevance_batch(self, query: str, results: List[SearchResult], language: str) -> List[float]:
+    async def _summarize_chunks_batched(self, chunks_info: List[tuple], query: str, language: str,
+                                        batch_size: int, min_chars: int, summarize_chunk: Callable,
+                                        progress_callback: Optional[Callable] = None) -> list:
         """
-        Scores the relevance of multiple search results to the query in a single LLM call to save RPM.
-        Returns a list of scores between 0.0 and 1.0.
+        Summarizes chunks batch_size at a time, one prompt per batch with tagged per-segment output.
+        Segments missing from a batch response are summarized individually; results keep chunk order.
         """
-        if not results:
-            return []
+        results: list = [None] * len(chunks_info)
+        # Tiny chunks stand in as their own summary without joining a batch
+        pending = [i for i, (c, _u) in enumerate(chunks_info) if min_chars <= 0 or len("".join(c.split())) >= min_chars]
+        for i in set(range(len(chunks_info))) - set(pending):
+            results[i] = chunks_info[i][0].strip()
+        if language == "Japanese":
+            template = SUMMARIZE_CHUNKS_BATCH_PROMPT_JA
+            system_prompt = SUMMARIZE_CHUNKS_BATCH_SYSTEM_PROMPT_JA.format(query=query)
+        else:
+            template = SUMMARIZE_CHUNKS_BATCH_PROMPT_EN
+            system_prompt = SUMMARIZE_CHUNKS_BATCH_SYSTEM_PROMPT_EN.format(query=query)
 
-        # Construct a batch prompt
-        items_text = ""
-        for i, res in enumerate(results):
-            items_text += f"\n---\nRESULT ID: {i}\nTITLE: {res.title}\nSNIPPET: {res.snippet}\n"
+        async def summarize_batch(indices):
+            segments = "\n\n".join(
+                SUMMARIZE_BATCH_SEGMENT_TEMPLATE.format(index=n + 1, chunk=chunks_info[i][0])
+                for n, i in enumerate(indices)
+            )
+            async with self.chunk_semaphore:
+                if progress_callback: await progress_callback(f"Summarizing {len(indices)} chunks in one batch...")
+                try:
+                    response = await self.llm_client.generate_text(
+                        prompt=template.format(segments=segments), system_prompt=system_prompt
+                    )
+                except Exception as e:
+                    logger.warning(f"Batched chunk summarization failed: {e}. Falling back to per-chunk calls.")
+                    response = ""
+            by_id = {}
+            for m in _BATCH_SUMMARY_RE.finditer(response or ""):
+                by_id.setdefault(int(m.group(1)), m.group(2).strip())
+            missing = []
+            for n, i in enumerate(indices):
+                if by_id.get(n + 1):
+                    results[i] = by_id[n + 1]
+                else:
+                    missing.append(i)
+            if missing:
+                logger.debug("Batch response lacked %d of %d segment summaries; summarizing them individually.", len(missing), len(indices))
+                fallback = await asyncio.gather(*[summarize_chunk(*chunks_info[i]) for i in missing], return_exceptions=True)
+                for i, r in zip(missing, fallback):
+                    results[i] = r
 
-        if language == "Japanese":
-            prompt = f"""クエリ: {query}
+        batches = self._pack_chunk_batches(pending, chunks_info, batch_size)
+        await asyncio.gather(*[summarize_batch(indices) for indices in batches])
+        return results
 
-以下の検索結果（複数）について、それぞれクエリへの関連性を 0.0〜1.0 でスコアリングしてください。
-- 1.0: 非常に関連性が高い
-- 0.5: やや関連性がある
-- 0.0: 全く関連性がない
+    def _pack_chunk_batches(self, pending: List[int], chunks_info: List[tuple], batch_size: int) -> List[List[int]]:
+        """
+        Groups chunk indices greedily, in order, into batches of at most batch_size chunks whose
+        estimated tokens stay within CHUNK_SUMMARY_BATCH_MAX_TOKENS (0 caps by count only).
+        A chunk larger than the budget gets a batch of its own.
+        """
+        max_tokens = getattr(self.config, "CHUNK_SUMMARY_BATCH_MAX_TOKENS", 0)
+        if not max_tokens or max_tokens <= 0:
+            return [pending[k:k + batch_size] for k in range(0, len(pending), batch_size)]
+        batches, current, used = [], [], 0
+        for i in pending:
+            tokens = estimate_tokens(chunks_info[i][0])
+            if current and (len(current) >= batch_size or used + tokens > max_tokens):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
 
-回答は以下のJSON形式のみで返してください：
-{{"scores": [スコア0, スコア1, ...]}}
+    def _within_token_budget(self, urls: List[str], fetched_content: dict) -> List[str]:
+        """
+        Keeps sources, in the given (relevance) order, whose content fits MAX_SUMMARY_INPUT_TOKENS.
+        A source that does not fit is skipped so smaller, less relevant ones can still be used;
+        the most relevant source is always kept so there is something to summarize.
+        """
+        budget = getattr(self.config, "MAX_SUMMARY_INPUT_TOKENS", 0)
+        if not budget or budget <= 0:
+            return urls
+        kept, dropped, used = [], [], 0
+        for url in urls:
+            tokens = estimate_tokens(fetched_content[url])
+            if used + tokens <= budget or not kept:
+                kept.append(url)
+                used += tokens
+            else:
+                dropped.append(url)
+        if dropped:
+            logger.debug("Summary input budget of %d tokens reached (%d used); skipped sources: %s", budget, used, dropped)
+        return kept
 
-検索結果リスト:{items_text}
-"""
-        else:
-            prompt = f"""Query: {query}
+    async def _synthesize_with_graph(self, prompt: str, urls: List[str], language: str) -> Optional[SummaryWithGraphModel]:
+        """One structured call returning the synthesis and its knowledge graph, or None if it fails."""
+        instruction = SUMMARY_GRAPH_INSTRUCTION_JA if language == "Japanese" else SUMMARY_GRAPH_INSTRUCTION_EN
+        try:
+            result = await self.llm_client.generate_structured(
+                prompt=prompt + instruction.format(urls="\n".join(f"- {u}" for u in urls)),
+                response_model=SummaryWithGraphModel
+            )
+        except Exception as e:
+            logger.warning(f"Combined summary and KG extraction failed: {e}. Falling back to a plain synthesis.")
+            return None
+        if not result or not result.summary.strip():
+            logger.warning("Combined summary and KG extraction returned no summary. Falling back to a plain synthesis.")
+            return None
+        return result
+
+    def _combine_prompt(self, summaries: List[str], query: str, language: str) -> str:
+        combined = "\n\n---\n\n".join(summaries)
+        template = COMBINE_SUMMARIES_PROMPT_JA if language == "Japanese" else COMBINE_SUMMARIES_PROMPT_EN
+        return template.format(query=query, combined=combined)
 
-Score the relevance of each of the following search results to the query on a scale of 0.0 to 1.0.
-- 1.0: Highly relevant
-- 0.5: Somewhat relevant
-- 0.0: Not relevant
+    async def _tree_reduce(self, summaries: List[str], query: str, language: str,
+                           progress_callback: Optional[Callable] = None) -> List[str]:
+        """
+        Combines summaries in groups of COMBINE_GROUP_SIZE, concurrently, until at most one group remains.
+        The caller performs the final synthesis over what is returned.
+        """
+        group_size = max(2, getattr(self.config, "COMBINE_GROUP_SIZE", 5))
+
+        async def combine_group(group):
+            if len(group) == 1:
+                return group[0]
+            async with self.chunk_semaphore:
+                return await self.llm_client.generate_text(prompt=self._combine_prompt(group, query, language))
+
+        while len(summaries) > group_size:
+            groups = [summaries[i:i + group_size] for i in range(0, len(summaries), group_size)]
+            if progress_callback: await progress_callback(f"Combining {len(summaries)} summaries in {len(groups)} groups...")
+            reduced = await asyncio.gather(*[combine_group(g) for g in groups], return_exceptions=True)
+            next_level = []
+            for group, r in zip(groups, reduced):
+                if isinstance(r, Exception) or not r:
+                    logger.error(f"Error combining summary group: {r}")
+                    # Keep the group's inputs rather than losing them; bounded by the next level's grouping
+                    r = "\n\n".join(group)
+                next_level.append(r)
+            summaries = next_level
+        return summaries
 
-Respond ONLY with a JSON object in this format:
-{{"scores": [score0, score1, ...]}}
+    async def _stream_synthesis(self, prompt: str, on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """Streams the synthesis, publishing the partial text every STREAM_FLUSH_CHARS characters."""
+        flush_chars = getattr(self.config, "STREAM_FLUSH_CHARS", 8192)
+        buf = []
+        pending = 0
+        async for chunk in self.llm_client.generate_text_stream(prompt, temperature=0.3):
+            buf.append(chunk)
+            pending += len(chunk)
+            if on_partial and pending >= flush_chars:
+                on_partial("".join(buf))
+                pending = 0
+        return "".join(buf)
+
+    async def score_relevance_batch(self, query: str, results: List[SearchResult], language: str) -> List[float]:
+        """
+        Scores the relevance of multiple search results to the query in a single LLM call to save RPM.
+        Returns a list of scores between 0.0 and 1.0.
+        """
+        if not results:
+            return []
 
-Search Results:{items_text}
-"""
+        items = "".join(
+            BATCH_RELEVANCE_ITEM_TEMPLATE.format(index=i, title=res.title, snippet=res.snippet)
+            for i, res in enumerate(results)
+        )
+        template = BATCH_RELEVANCE_SCORING_PROMPT_JA if language == "Japanese" else BATCH_RELEVANCE_SCORING_PROMPT_EN
+        prompt = template.format(query=query, items=items)
         
         try:
-            class ScoreBatch(BaseModel):
-                scores: List[float]
-            
             try:
                 response = await self.llm_client.generate_structured(prompt, ScoreBatch)
                 scores = [max(0.0, min(1.0, s)) for s in response.scores]
@@ -169,26 +403,31 @@ Search Results:{items_text}
             return scores
         except Exception as e:
             logger.warning(f"Failed batch relevance scoring: {e}. Falling back to individual scoring.")
-            # Fallback to individual scoring if batch fails
-            individual_scores = await asyncio.gather(*[self.score_relevance(query, r, language) for r in results])
-            return list(individual_scores)
+            # Fallback to individual scoring if batch fails, dispatched as one batch of per-result prompts
+            responses = await self.llm_client.generate_text_batch(
+                [self._relevance_prompt(query, r, language) for r in results]
+            )
+            return [self._parse_relevance_score(response) for response in responses]
+
+    def _relevance_prompt(self, query: str, result: SearchResult, language: str) -> str:
+        if language == "Japanese":
+            return RELEVANCE_SCORING_PROMPT_JA.format(
+                query=query, title=result.title, snippet=result.snippet
+            )
+        return RELEVANCE_SCORING_PROMPT_EN.format(
+            query=query, title=result.title, snippet=result.snippet
+        )
 
     async def score_relevance(self, query: str, result: SearchResult, language: str) -> float:
         """
         Scores the relevance of a search result to the query using LLM.
         Returns a score between 0.0 (not relevant) and 1.0 (highly relevant).
         """
-        if language == "Japanese":
-            prompt = RELEVANCE_SCORING_PROMPT_JA.format(
-                query=query, title=result.title, snippet=result.snippet
-            )
-        else:
-            prompt = RELEVANCE_SCORING_PROMPT_EN.format(
-                query=query, title=result.title, snippet=result.snippet
-            )
-        
+        response = await self.llm_client.generate_text(prompt=self._relevance_prompt(query, result, language))
+        return self._parse_relevance_score(response)
+
+    def _parse_relevance_score(self, response: str) -> float:
         try:
-            response = await self.llm_client.generate_text(prompt=prompt)
             # Extract numeric value from response
             score_str = response.strip().split()[0]  # Get first token
             score = float(score_str)
@@ -225,7 +464,7 @@ Search Results:{items_text}
         batch_size = getattr(self.config, "BATCH_SIZE_RELEVANCE", 5)
         scored_results = []
         
-        logger.info(f"Scoring {len(results)} search results for relevance (batch size: {batch_size}, threshold: {relevance_threshold})...")
+        logger.info("Scoring %s search results for relevance (batch size: %s, threshold: %s)...", len(results), batch_size, relevance_threshold)
         
         for i in range(0, len(results), batch_size):
             batch = results[i:i + batch_size]
@@ -234,12 +473,12 @@ Search Results:{items_text}
             batch_scores = await self.score_relevance_batch(query, batch, language)
             for result, score in zip(batch, batch_scores):
                 result.relevance_score = score
-                logger.debug(f"Relevance score for '{result.title}': {score:.2f}")
+                logger.debug("Relevance score for '%s': %.2f", result.title, score)
                 scored_results.append(result)
         
         # Filter by threshold
         relevant = [r for r in scored_results if r.relevance_score >= relevance_threshold]
-        logger.info(f"Found {len(relevant)}/{len(results)} results above threshold {relevance_threshold:.2f}. Total unique sources being passed: {len(relevant)}")
+        logger.info("Found %s/%s results above threshold %.2f. Total unique sources being passed: %s", len(relevant), len(results), relevance_threshold, len(relevant))
         
         # Sort by relevance score (descending) and take top MAX_RELEVANT_RESULTS
         filtered = sorted(relevant, key=lambda r: r.relevance_score, reverse=True)
@@ -1,7 +1,6 @@
 import logging
 import asyncio
 import re
-import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from langgraph.graph import StateGraph, END
@@ -10,10 +9,12 @@ from deep_research_project.core.graph_state import AgentState
 from deep_research_project.core.skills_manager import SkillRegistry
 from deep_research_project.config.config import Configuration
 from deep_research_project.tools.llm_client import LLMClient
+from deep_research_project.core.utils import iter_json_values
 from deep_research_project.core.planning import ResearchPlanner
 from deep_research_project.core.execution import ResearchExecutor
 from deep_research_project.core.reflection import ResearchReflector
 from deep_research_project.core.reporting import ResearchReporter
+from deep_research_project.core.prompts import SKILL_SELECTION_PROMPT
 
 logger = logging.getLogger(__name__)
 
@@ -30,28 +31,13 @@ async def planner_node(state: AgentState, config: Configuration, planner: Resear
     selected_skill_ids = []
     if available_skills:
         skill_descriptions = "\n".join([f"- {s['id']}: {s['description']}" for s in available_skills])
-        trigger_prompt = (
-            f"Current Topic: {state['topic']}\n\n"
-            f"Available Past Research Skills:\n{skill_descriptions}\n\n"
-            "Task: Select ONLY the skills that are strictly necessary and highly relevant to the current topic.\n"
-            "Strict Guidelines:\n"
-            "1. ONLY select 'domain-xxx' skills if the current topic is a direct follow-up or covers the exact same domain. If the topic is just broadly related, DO NOT select it.\n"
-            "2. 'web-search' is a general tool and should be selected for most cases.\n"
-            "3. If multiple skills seem similar, select only the most relevant one.\n"
-            "4. Accuracy is more important than helpfulness. Do not pollute the context with irrelevant past data.\n\n"
-            "Respond in JSON format:\n"
-            "{\n"
-            "  \"selected_ids\": [\"id1\", \"id2\"],\n"
-            "  \"reasoning\": \"Brief explanation of why these specific skills are needed\"\n"
-            "}"
-        )
+        trigger_prompt = SKILL_SELECTION_PROMPT.format(topic=state['topic'], skill_descriptions=skill_descriptions)
         try:
             # Using generate_text but parsing as JSON for reliability
             trigger_resp = await planner.llm_client.generate_text(trigger_prompt)
-            # Find JSON block if any
-            json_match = re.search(r"(\{.*\})", trigger_resp, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(1))
+            # First JSON object in the reply, if any
+            data = next((v for v in iter_json_values(trigger_resp) if isinstance(v, dict)), None)
+            if data is not None:
                 selected_skill_ids = [sid for sid in data.get("selected_ids", []) if sid in skills_mgr.skills]
                 logger.info(f"Skill Selection Reasoning: {data.get('reasoning')}")
             else:
@@ -128,14 +114,27 @@ async def researcher_node(state: AgentState, config: RunnableConfig, planner: Re
         r_state.research_plan = state["plan"]
         r_state.current_section_index = idx
         
-        loop = ResearchLoop(app_config, r_state, progress_callback=progress_cb)
-        await loop.run_loop()
+        # Share the graph's clients so the run reuses one set of connection pools, caches and LLM limits;
+        # the app that created the retriever closes its connections after the run
+        loop = ResearchLoop(
+            app_config, r_state, progress_callback=progress_cb,
+            llm_client=executor.llm_client, search_client=executor.search_client,
+            content_retriever=executor.content_retriever
+        )
+        try:
+            await loop.run_loop()
+        finally:
+            await loop.aclose()
         
         all_findings = []
         all_sources = []
+        seen_links = set()
         for sec in r_state.research_plan:
             if sec.get('summary'): all_findings.append(sec['summary'])
-            if sec.get('sources'): all_sources.extend(sec['sources'])
+            for src in sec.get('sources') or []:
+                if src['link'] not in seen_links:
+                    seen_links.add(src['link'])
+                    all_sources.append(src)
         
         return {
             "findings": all_findings,
@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional
 from deep_research_project.tools.llm_client import LLMClient
+from deep_research_project.core.utils import iter_json_values
 from deep_research_project.core.prompts import (
     KI_METADATA_PROMPT_JA, KI_METADATA_PROMPT_EN
 )
@@ -26,17 +27,10 @@ class KIDistiller:
         
         metadata_raw = await self.llm_client.generate_text(prompt=full_prompt)
         
-        # Simple JSON cleanup
-        try:
-            # Look for JSON block if LLM added formatting
-            if "```json" in metadata_raw:
-                metadata_raw = metadata_raw.split("```json")[1].split("```")[0].strip()
-            elif "{" in metadata_raw:
-                metadata_raw = metadata_raw[metadata_raw.find("{"):metadata_raw.rfind("}")+1].strip()
-            
-            metadata = json.loads(metadata_raw)
-        except Exception as e:
-            logger.error(f"Failed to parse KI metadata JSON: {e}. Raw: {metadata_raw}")
+        # The first JSON object in the reply, wherever the LLM put it (code fence, surrounding prose)
+        metadata = next((v for v in iter_json_values(metadata_raw) if isinstance(v, dict)), None)
+        if metadata is None:
+            logger.error(f"Failed to parse KI metadata JSON. Raw: {metadata_raw}")
             # Fallback metadata
             metadata = {
                 "title": "Untitled Research",
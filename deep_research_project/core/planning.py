@@ -6,6 +6,7 @@ from deep_research_project.core.state import ResearchPlanModel, Section
 from deep_research_project.core.prompts import (
     RESEARCH_PLAN_PROMPT_JA, RESEARCH_PLAN_PROMPT_EN,
     INITIAL_QUERY_PROMPT_JA, INITIAL_QUERY_PROMPT_EN,
+    INITIAL_QUERY_SYSTEM_PROMPT_JA, INITIAL_QUERY_SYSTEM_PROMPT_EN,
     REGENERATE_QUERY_PROMPT_JA, REGENERATE_QUERY_PROMPT_EN
 )
 from deep_research_project.core.utils import sanitize_query
@@ -44,7 +45,7 @@ class ResearchPlanner:
         try:
             plan_model = await self.llm_client.generate_structured(prompt, ResearchPlanModel)
             # Convert Pydantic model to the list of dictionaries expected by ResearchState
-            return [
+            plan = [
                 {
                     "title": sec.title,
                     "description": sec.description,
@@ -53,6 +54,11 @@ class ResearchPlanner:
                     "sources": []
                 } for sec in plan_model.sections
             ]
+            # The plan call also proposes the first section's query, saving a round-trip at startup
+            first_query = self._sanitize_query(plan_model.first_query)
+            if plan and first_query and first_query.lower() != "none":
+                plan[0]["initial_query"] = first_query
+            return plan
         except Exception as e:
             logger.error(f"Failed to generate research plan: {e}. Using fallback.")
             return [{
@@ -71,24 +77,21 @@ class ResearchPlanner:
         current_date = datetime.now().strftime("%Y-%m-%d")
 
         if language == "Japanese":
-            prompt = INITIAL_QUERY_PROMPT_JA.format(
-                topic=topic,
-                current_date=current_date,
-                section_title=section_title,
-                section_description=section_description
-            )
+            template, system_prompt = INITIAL_QUERY_PROMPT_JA, INITIAL_QUERY_SYSTEM_PROMPT_JA
         else:
-            prompt = INITIAL_QUERY_PROMPT_EN.format(
-                topic=topic,
-                current_date=current_date,
-                section_title=section_title,
-                section_description=section_description
-            )
-            
+            template, system_prompt = INITIAL_QUERY_PROMPT_EN, INITIAL_QUERY_SYSTEM_PROMPT_EN
+        prompt = template.format(
+            topic=topic,
+            current_date=current_date,
+            section_title=section_title,
+            section_description=section_description
+        )
+
         logger.info("Generating initial query.")
         if progress_callback: await progress_callback("Generating initial search query...")
         
-        raw_query = await self.llm_client.generate_text(prompt=prompt)
+        # Guidelines go in the system prompt so the concurrent per-section calls share one cacheable prefix
+        raw_query = await self.llm_client.generate_text(prompt=prompt, system_prompt=system_prompt)
         return self._sanitize_query(raw_query)
 
     def _sanitize_query(self, query: str) -> str:
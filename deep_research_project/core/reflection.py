@@ -1,22 +1,57 @@
 import logging
 import asyncio
-from typing import List, Optional, Tuple, Callable
+import re
+from typing import Dict, Hashable, List, Optional, Tuple, Callable
 from deep_research_project.config.config import Configuration
 from deep_research_project.tools.llm_client import LLMClient
-from deep_research_project.core.state import KnowledgeGraphModel, Source, KGNode, KGEdge
+from deep_research_project.core.state import KnowledgeGraphModel, KnowledgeGraphBatchModel, Source, KGNode, KGEdge
 from deep_research_project.core.prompts import (
     KG_EXTRACTION_PROMPT_JA, KG_EXTRACTION_PROMPT_EN,
-    REFLECTION_PROMPT_JA, REFLECTION_PROMPT_EN
+    KG_BATCH_EXTRACTION_PROMPT_JA, KG_BATCH_EXTRACTION_PROMPT_EN, KG_BATCH_ITEM_TEMPLATE,
+    REFLECTION_PROMPT_JA, REFLECTION_PROMPT_EN,
+    REFLECTION_SYSTEM_PROMPT_JA, REFLECTION_SYSTEM_PROMPT_EN,
+    REFLECTION_EXTRA_QUERIES_INSTRUCTION_JA, REFLECTION_EXTRA_QUERIES_INSTRUCTION_EN
 )
 from deep_research_project.core.utils import sanitize_query
 
 
 logger = logging.getLogger(__name__)
 
+# Reflection response labels, anywhere in a line; tolerate markdown decoration like "**EVALUATION:**"
+_REFLECTION_FIELD_RE = re.compile(
+    r"(?P<field>evaluation|query)[ *]*:[ *]*(?P<value>.*)$", re.IGNORECASE | re.MULTILINE
+)
+
+class _ListIndex:
+    """Key -> entry index over a list that only grows by appends, updated incrementally instead of rebuilt."""
+    def __init__(self, key_fn: Callable[[dict], Hashable]):
+        self._key_fn = key_fn
+        self._source: Optional[List[dict]] = None
+        self._indexed = 0
+        self._index: Dict[Hashable, dict] = {}
+
+    def sync(self, entries: List[dict]) -> Dict[Hashable, dict]:
+        if entries is not self._source or len(entries) < self._indexed:
+            # A different (or shrunk) list: index it from scratch
+            self._source, self._indexed, self._index = entries, 0, {}
+        for entry in entries[self._indexed:]:
+            self._index[self._key_fn(entry)] = entry
+        self._indexed = len(entries)
+        return self._index
+
+    def append(self, entries: List[dict], key: Hashable, entry: dict):
+        entries.append(entry)
+        self._index[key] = entry
+        self._indexed = len(entries)
+
 class ResearchReflector:
     def __init__(self, config: Configuration, llm_client: LLMClient):
         self.config = config
         self.llm_client = llm_client
+        # Serializes merges into the shared node/edge lists while the merge itself runs off-loop
+        self._merge_lock = asyncio.Lock()
+        self._node_index = _ListIndex(lambda n: n['id'])
+        self._edge_index = _ListIndex(lambda e: (e['source'], e['target'], e.get('label')))
 
     async def extract_knowledge_graph(self, text: str, sources: List[Source], 
                                     section_title: str, language: str, 
@@ -24,8 +59,7 @@ class ResearchReflector:
         """Extracts entities and relations from text and merges them into the existing graph."""
         if not text or len(text) < 20: return
 
-        active_urls = [s.link for s in sources]
-        urls_str = "\n".join([f"- {url}" for url in active_urls])
+        urls_str = "\n".join(f"- {s.link}" for s in sources)
 
         if language == "Japanese":
             prompt = KG_EXTRACTION_PROMPT_JA.format(
@@ -38,13 +72,63 @@ class ResearchReflector:
 
         try:
             kg_model = await self.llm_client.generate_structured(prompt=prompt, response_model=KnowledgeGraphModel)
-            self._merge_knowledge_graph(kg_model, existing_nodes, existing_edges)
+            await self.merge_knowledge_graph(kg_model, existing_nodes, existing_edges)
         except Exception as e:
             logger.error(f"KG extraction or merge failed: {e}")
 
+    async def merge_knowledge_graph(self, kg_model: KnowledgeGraphModel,
+                                    existing_nodes: List[dict], existing_edges: List[dict]):
+        """Merges an already extracted graph into the existing graph."""
+        # CPU-bound merge runs in a worker thread so other extractions keep the event loop busy
+        async with self._merge_lock:
+            await asyncio.to_thread(self._merge_knowledge_graph, kg_model, existing_nodes, existing_edges)
+
+    async def extract_knowledge_graph_batch(self, items: List[Tuple[str, List[Source], str]], language: str,
+                                            existing_nodes: List[dict], existing_edges: List[dict]):
+        """Extracts graphs for several (text, sources, section_title) items with one structured call."""
+        items = [item for item in items if item[0] and len(item[0]) >= 20]
+        if not items: return
+        if len(items) == 1:
+            text, sources, section_title = items[0]
+            await self.extract_knowledge_graph(text, sources, section_title, language, existing_nodes, existing_edges)
+            return
+
+        inputs = "\n\n".join(
+            KG_BATCH_ITEM_TEMPLATE.format(
+                index=i + 1, section_title=section_title, text=text,
+                urls="\n".join(f"- {s.link}" for s in sources)
+            )
+            for i, (text, sources, section_title) in enumerate(items)
+        )
+        template = KG_BATCH_EXTRACTION_PROMPT_JA if language == "Japanese" else KG_BATCH_EXTRACTION_PROMPT_EN
+        prompt = template.format(inputs=inputs)
+
+        try:
+            batch = await self.llm_client.generate_structured(prompt=prompt, response_model=KnowledgeGraphBatchModel)
+        except Exception as e:
+            logger.warning(f"Batched KG extraction failed, extracting per text: {e}")
+            await asyncio.gather(*[
+                self.extract_knowledge_graph(text, sources, section_title, language, existing_nodes, existing_edges)
+                for text, sources, section_title in items
+            ])
+            return
+
+        if len(batch.graphs) != len(items):
+            logger.warning(f"Batched KG extraction returned {len(batch.graphs)} graphs for {len(items)} texts.")
+        try:
+            async with self._merge_lock:
+                await asyncio.to_thread(self._merge_graphs, batch.graphs, existing_nodes, existing_edges)
+        except Exception as e:
+            logger.error(f"KG merge failed: {e}")
+
+    def _merge_graphs(self, kg_models: List[KnowledgeGraphModel],
+                      existing_nodes: List[dict], existing_edges: List[dict]):
+        for kg_model in kg_models:
+            self._merge_knowledge_graph(kg_model, existing_nodes, existing_edges)
+
     def _merge_nodes(self, new_nodes: List[KGNode], existing_nodes: List[dict]):
         """Merges new nodes into the existing nodes list."""
-        node_map = {n['id']: n for n in existing_nodes}
+        node_map = self._node_index.sync(existing_nodes)
         for new_node in new_nodes:
             if new_node.id in node_map:
                 existing_node = node_map[new_node.id]
@@ -65,12 +149,11 @@ class ResearchReflector:
             else:
                 node_data = new_node.model_dump()
                 node_data.setdefault('properties', {})['mention_count'] = "1"
-                existing_nodes.append(node_data)
-                node_map[new_node.id] = node_data
+                self._node_index.append(existing_nodes, new_node.id, node_data)
 
     def _merge_edges(self, new_edges: List[KGEdge], existing_edges: List[dict]):
         """Merges new edges into the existing edges list."""
-        edge_map = {(e['source'], e['target'], e.get('label')): e for e in existing_edges}
+        edge_map = self._edge_index.sync(existing_edges)
         for new_edge in new_edges:
             edge_key = (new_edge.source, new_edge.target, new_edge.label)
             if edge_key in edge_map:
@@ -82,13 +165,11 @@ class ResearchReflector:
                 existing_urls.update(new_edge.source_urls)
                 existing_edge['source_urls'] = list(existing_urls)
             else:
-                edge_data = new_edge.model_dump()
-                existing_edges.append(edge_data)
-                edge_map[edge_key] = edge_data
+                self._edge_index.append(existing_edges, edge_key, new_edge.model_dump())
 
     def _merge_knowledge_graph(self, kg_model: KnowledgeGraphModel,
                                 existing_nodes: List[dict], existing_edges: List[dict]):
-        """Internal logic to merge newly extracted graph data into state using O(N) indexing."""
+        """Internal logic to merge newly extracted graph data into state using incrementally maintained indexes."""
         self._merge_nodes(kg_model.nodes, existing_nodes)
         self._merge_edges(kg_model.edges, existing_edges)
 
@@ -96,52 +177,67 @@ class ResearchReflector:
                                  section_description: str, accumulated_summary: str, 
                                  language: str) -> Tuple[str, Optional[str]]:
         """Evaluates if more research is needed for the current context."""
+        evaluation, queries = await self._reflect(
+            topic, section_title, section_description, accumulated_summary, language
+        )
+        return evaluation, queries[0] if queries else None
+
+    async def _reflect(self, topic: str, section_title: str, section_description: str,
+                       accumulated_summary: str, language: str, max_queries: int = 1) -> Tuple[str, List[str]]:
+        """Runs the reflection call; with max_queries > 1 the model may propose alternative queries."""
         from datetime import datetime
         current_date = datetime.now().strftime("%Y-%m-%d")
 
         if language == "Japanese":
-            prompt = REFLECTION_PROMPT_JA.format(
-                topic=topic,
-                current_date=current_date,
-                section_title=section_title,
-                section_description=section_description,
-                accumulated_summary=accumulated_summary
-            )
+            template, system_prompt = REFLECTION_PROMPT_JA, REFLECTION_SYSTEM_PROMPT_JA
+            extra_queries = REFLECTION_EXTRA_QUERIES_INSTRUCTION_JA
         else:
-            prompt = REFLECTION_PROMPT_EN.format(
-                topic=topic,
-                current_date=current_date,
-                section_title=section_title,
-                section_description=section_description,
-                accumulated_summary=accumulated_summary
-            )
+            template, system_prompt = REFLECTION_PROMPT_EN, REFLECTION_SYSTEM_PROMPT_EN
+            extra_queries = REFLECTION_EXTRA_QUERIES_INSTRUCTION_EN
+        prompt = template.format(
+            topic=topic,
+            current_date=current_date,
+            section_title=section_title,
+            section_description=section_description,
+            accumulated_summary=accumulated_summary
+        )
+        if max_queries > 1:
+            prompt += extra_queries.format(count=max_queries - 1)
 
-        response = await self.llm_client.generate_text(prompt=prompt)
-        lines = response.split('\n')
-        evaluation = "CONCLUDE"
-        next_query = None
-        for line in lines:
-            if "EVALUATION:" in line.upper(): 
-                val = line.split(":", 1)[-1].strip().upper()
-                if "CONTINUE" in val:
-                    evaluation = "CONTINUE"
-                else:
-                    evaluation = "CONCLUDE"
-            if "QUERY:" in line.upper():
-                q = line.split(":", 1)[-1].strip()
-                # Clean up potential markdown or quotes
-                q = q.replace("`", "").replace("\"", "").strip()
-                if q.lower() != "none" and len(q) > 2: 
-                    # Sanitize the reflected query similarly to the initial query
-                    next_query = sanitize_query(q)
+        # Instructions go in the system prompt so every reflection call shares the same cacheable prefix
+        response = await self.llm_client.generate_text(prompt=prompt, system_prompt=system_prompt)
+
+        # One scan over the response; as with line-by-line parsing, later labels override earlier ones
+        evaluation_value = None
+        raw_queries: List[str] = []
+        for m in _REFLECTION_FIELD_RE.finditer(response):
+            if m.group("field").lower() == "evaluation":
+                evaluation_value = m.group("value")
+            else:
+                raw_queries.append(m.group("value"))
+
+        evaluation = "CONTINUE" if "CONTINUE" in (evaluation_value or "").upper() else "CONCLUDE"
+
+        # The last valid QUERY is the primary one; alternatives are taken from the labels before it
+        queries: List[str] = []
+        for raw in reversed(raw_queries):
+            # Clean up potential markdown or quotes
+            q = raw.replace("`", "").replace("\"", "").strip(" \t\r*")
+            if q.lower() != "none" and len(q) > 2:
+                # Sanitize the reflected query similarly to the initial query
+                q = sanitize_query(q)
+                if q not in queries:
+                    queries.append(q)
+                    if len(queries) >= max_queries:
+                        break
         
-        return evaluation, next_query
+        return evaluation, queries
 
     async def reflect(self, topic: str, section_title: str, 
                       section_description: str, accumulated_summary: str, 
-                      language: str) -> dict:
-        """Alias for reflect_and_decide returning dict format for graph nodes."""
-        evaluation, next_query = await self.reflect_and_decide(
-            topic, section_title, section_description, accumulated_summary, language
+                      language: str, max_queries: int = 1) -> dict:
+        """Reflection in dict format for graph nodes; "queries" lists the primary query first."""
+        evaluation, queries = await self._reflect(
+            topic, section_title, section_description, accumulated_summary, language, max_queries
         )
-        return {"evaluation": evaluation, "query": next_query}
+        return {"evaluation": evaluation, "query": queries[0] if queries else None, "queries": queries}
@@ -1,10 +1,12 @@
 import logging
 import re
-from typing import List
+from typing import Callable, List, Optional
 from deep_research_project.tools.llm_client import LLMClient
 from deep_research_project.core.state import VisualSummaryModel
+from deep_research_project.core.utils import estimate_tokens
 from deep_research_project.core.prompts import (
     FINAL_REPORT_PROMPT_JA, FINAL_REPORT_PROMPT_EN,
+    FINAL_REPORT_SYSTEM_PROMPT_JA, FINAL_REPORT_SYSTEM_PROMPT_EN,
     NO_SOURCE_INFO_MSG_JA, NO_CITATION_INSTRUCTION_JA,
     NO_SOURCE_INFO_MSG_EN, NO_CITATION_INSTRUCTION_EN,
     SOURCE_INFO_PROMPT_JA, CITATION_INSTRUCTION_JA,
@@ -18,21 +20,30 @@ class ResearchReporter:
     def __init__(self, llm_client: LLMClient):
         self.llm_client = llm_client
 
-    async def finalize_report(self, topic: str, findings: List[str], sources: List[dict], language: str) -> str:
-        """Synthesizes the final report from all completed sections."""
+    async def finalize_report(self, topic: str, findings: List[str], sources: List[dict], language: str,
+                              on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Synthesizes the final report from all completed sections.
+        When `on_partial` is given, the report is streamed and `on_partial` receives the text so far.
+        """
         logger.info("Synthesizing final report.")
         
         # Findings are already accumulated text summaries from the research loops
         # We add section headers if findings are separate pieces to help the LLM structure the final report
-        full_context = ""
-        for i, f in enumerate(findings):
-            full_context += f"\n\n--- SECTION {i+1} ---\n{f}"
-
-        # Context length protection
+        # Context length protection: sections are added until the limit, so text past it is never joined
         max_context_chars = getattr(self.llm_client.config, "MAX_FINAL_REPORT_CONTEXT_CHARS", 100000)
-        if len(full_context) > max_context_chars:
-            logger.warning(f"Full context ({len(full_context)} chars) exceeds safety limit ({max_context_chars}). Truncating.")
-            full_context = full_context[:max_context_chars] + "\n\n[...一部の内容はコンテキストの制限により割愛されました / Some content truncated...]"
+        pieces = []
+        total_chars = 0
+        for i, f in enumerate(findings):
+            piece = f"\n\n--- SECTION {i+1} ---\n{f}"
+            if total_chars + len(piece) > max_context_chars:
+                logger.warning(f"Context exceeds safety limit ({max_context_chars} chars) at section {i+1} of {len(findings)}. Truncating.")
+                pieces.append(piece[:max_context_chars - total_chars])
+                pieces.append("\n\n[...一部の内容はコンテキストの制限により割愛されました / Some content truncated...]")
+                break
+            pieces.append(piece)
+            total_chars += len(piece)
+        full_context = "".join(pieces)
 
         all_sources = []
         seen_links = set()
@@ -55,7 +66,7 @@ class ResearchReporter:
                 all_sources.append({"title": title, "link": link})
                 seen_links.add(link)
 
-        source_list_str = "\n".join([f"[{i+1}] {s['title']} ({s['link']})" for i, s in enumerate(all_sources)])
+        source_list_str = "\n".join(f"[{i+1}] {s['title']} ({s['link']})" for i, s in enumerate(all_sources))
 
         if not source_list_str:
             if language == "Japanese":
@@ -84,6 +95,7 @@ class ResearchReporter:
                 citation_instruction=citation_instruction
             )
             visual_summary_prompt = VISUAL_SUMMARY_PROMPT_JA.format(topic=topic)
+            system_prompt = FINAL_REPORT_SYSTEM_PROMPT_JA
         else:
             prompt = FINAL_REPORT_PROMPT_EN.format(
                 topic=topic,
@@ -93,9 +105,19 @@ class ResearchReporter:
                 citation_instruction=citation_instruction
             )
             visual_summary_prompt = VISUAL_SUMMARY_PROMPT_EN.format(topic=topic)
+            system_prompt = FINAL_REPORT_SYSTEM_PROMPT_EN
 
+        max_tokens = getattr(self.llm_client.config, "FINAL_REPORT_MAX_TOKENS", 0)
+        # A single short section summary is already report-shaped; rewriting it would cost a full LLM round-trip
+        min_tokens = getattr(self.llm_client.config, "MIN_TOKENS_FOR_SYNTHESIS", 0)
+        if min_tokens and len(findings) == 1 and estimate_tokens(findings[0]) < min_tokens:
+            logger.info("Single short section; using its summary as the report body without synthesis.")
+            report = f"# {topic}\n\n{findings[0].strip()}"
         # We increase temperature slightly to allow for more creative synthesis of details
-        report = await self.llm_client.generate_text(prompt=prompt, temperature=0.3)
+        elif on_partial or max_tokens:
+            report = await self._stream_report(prompt, system_prompt, on_partial, max_tokens)
+        else:
+            report = await self.llm_client.generate_text(prompt=prompt, system_prompt=system_prompt, temperature=0.3)
         
         # Safety cleanup: Remove any LLM-generated reference sections to prevent duplicates
         # We only match if it looks like a header (starting with #) at the beginning of a line
@@ -126,7 +148,34 @@ class ResearchReporter:
         if not visual_data.strip().startswith("```"):
             visual_data = f"```json\n{visual_data}\n```"
 
-        sources_footer = f"\n\n## Sources\n{source_list_str}" if source_list_str else ""
-        
-        final_output = f"{report}\n\n## Visual Summary\n{visual_data}{sources_footer}"
-        return final_output
+        parts = [report, "", "## Visual Summary", visual_data]
+        if source_list_str:
+            parts.extend(("", "## Sources", source_list_str))
+        return "\n".join(parts)
+
+    async def _stream_report(self, prompt: str, system_prompt: str,
+                             on_partial: Optional[Callable[[str], None]], max_tokens: int = 0) -> str:
+        """
+        Streams the report, publishing the partial text every STREAM_FLUSH_CHARS characters.
+        With max_tokens, the stream is closed once that many tokens have arrived, ending generation early.
+        """
+        flush_chars = getattr(self.llm_client.config, "STREAM_FLUSH_CHARS", 8192)
+        buf = []
+        pending = 0
+        tokens = 0
+        stream = self.llm_client.generate_text_stream(prompt, system_prompt=system_prompt, temperature=0.3)
+        try:
+            async for chunk in stream:
+                buf.append(chunk)
+                pending += len(chunk)
+                if on_partial and pending >= flush_chars:
+                    on_partial("".join(buf))
+                    pending = 0
+                if max_tokens:
+                    tokens += estimate_tokens(chunk)
+                    if tokens >= max_tokens:
+                        logger.info("Final report reached FINAL_REPORT_MAX_TOKENS (%d); stopping generation.", max_tokens)
+                        break
+        finally:
+            await stream.aclose()
+        return "".join(buf)
@@ -1,16 +1,19 @@
 import asyncio
 import logging
-from typing import List, Dict, Optional, Any, Callable
+from dataclasses import asdict
+from functools import cached_property
+from typing import List, Dict, Optional, Any, Callable, Tuple
 
 from deep_research_project.config.config import Configuration
-from deep_research_project.core.state import ResearchState, Source, SearchResult
+from deep_research_project.core.state import ResearchState, Source, SearchResult, KnowledgeGraphModel
 from deep_research_project.tools.llm_client import LLMClient
 from deep_research_project.tools.search_client import SearchClient
 from deep_research_project.tools.content_retriever import ContentRetriever
+from deep_research_project.tools.cache_manager import LRUDict
 
 # New modular components
 from deep_research_project.core.planning import ResearchPlanner
-from deep_research_project.core.execution import ResearchExecutor
+from deep_research_project.core.execution import ResearchExecutor, NO_CONTENT_SUMMARY, NO_SEGMENT_SUMMARIES
 from deep_research_project.core.reflection import ResearchReflector
 from deep_research_project.core.reporting import ResearchReporter
 from deep_research_project.core.prompts import (
@@ -21,23 +24,138 @@ from deep_research_project.core.prompts import (
 logger = logging.getLogger(__name__)
 
 
+class ResearchInterrupted(Exception):
+    """Raised when the user interrupts research while a step is still awaiting."""
+    pass
+
+
 class ResearchLoop:
-    def __init__(self, config: Configuration, state: ResearchState, progress_callback: Optional[Callable[[str], Any]] = None):
+    def __init__(self, config: Configuration, state: ResearchState, progress_callback: Optional[Callable[[str], Any]] = None,
+                 llm_client: Optional[LLMClient] = None, search_client: Optional[SearchClient] = None,
+                 content_retriever: Optional[ContentRetriever] = None):
         self.config = config
         self.state = state
         self.progress_callback = progress_callback
         self.interactive_mode = getattr(config, "INTERACTIVE_MODE", False)
 
-        # Clients
-        self.llm_client = LLMClient(config)
-        self.search_client = SearchClient(config)
-        self.content_retriever = ContentRetriever(config=self.config, progress_callback=progress_callback)
+        # Clients passed in are shared with the caller (connection pools, caches); they are used as-is and not closed here
+        if llm_client is not None:
+            self.llm_client = llm_client
+        if search_client is not None:
+            self.search_client = search_client
+        if content_retriever is not None:
+            self.content_retriever = content_retriever
+        self._owns_content_retriever = content_retriever is None
+
+        # (text, sources, section_title) summaries awaiting a batched KG extraction
+        self._pending_kg_inputs: List[Tuple[str, List[Source], str]] = []
+        # Graph returned alongside the latest summary when COMBINE_SUMMARY_AND_KG is on
+        self._summary_graph: Optional[KnowledgeGraphModel] = None
+        # Extraction over the latest chunk summaries when KG_FROM_CHUNK_SUMMARIES is on
+        self._chunk_graph_task: Optional[asyncio.Task] = None
+
+        # Progress messages from the section pipeline are delivered in order by one background worker
+        self._progress_queue: Optional[asyncio.Queue] = None
+        self._progress_worker: Optional[asyncio.Task] = None
+
+        # Step API: search for the query proposed by _reflect_on_summary, started while it awaits approval
+        self._prefetched_search: Optional[Tuple[str, asyncio.Task]] = None
+
+    # Clients and modular components (SRP) are built on first use, so constructing a loop stays cheap
+
+    @cached_property
+    def llm_client(self) -> LLMClient:
+        return LLMClient(self.config)
+
+    @cached_property
+    def search_client(self) -> SearchClient:
+        return SearchClient(self.config)
+
+    @cached_property
+    def content_retriever(self) -> ContentRetriever:
+        return ContentRetriever(config=self.config, progress_callback=self.progress_callback)
+
+    @cached_property
+    def planner(self) -> ResearchPlanner:
+        return ResearchPlanner(self.config, self.llm_client)
+
+    @cached_property
+    def executor(self) -> ResearchExecutor:
+        return ResearchExecutor(self.config, self.llm_client, self.search_client, self.content_retriever)
+
+    @cached_property
+    def reflector(self) -> ResearchReflector:
+        return ResearchReflector(self.config, self.llm_client)
+
+    @cached_property
+    def reporter(self) -> ResearchReporter:
+        return ResearchReporter(self.llm_client)
 
-        # Modular components (SRP)
-        self.planner = ResearchPlanner(config, self.llm_client)
-        self.executor = ResearchExecutor(config, self.llm_client, self.search_client, self.content_retriever)
-        self.reflector = ResearchReflector(config, self.llm_client)
-        self.reporter = ResearchReporter(self.llm_client)
+    async def _run_or_interrupt(self, aw):
+        """Awaits `aw`, but cancels it and raises ResearchInterrupted as soon as an interrupt is requested."""
+        task = asyncio.ensure_future(aw)
+        waiter = asyncio.ensure_future(self.state.interrupt_event.wait())
+        try:
+            done, _ = await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            waiter.cancel()
+            raise
+        waiter.cancel()
+        if task in done:
+            return task.result()
+        task.cancel()
+        raise ResearchInterrupted()
+
+    def _nonblocking(self, callback):
+        """Wraps `callback` so calling it queues the message instead of waiting on UI I/O."""
+        if callback is None:
+            return None
+        async def enqueue(msg: str):
+            self._emit(callback, msg)
+        return enqueue
+
+    def _emit(self, callback, msg: str):
+        if self._progress_queue is None:
+            self._progress_queue = asyncio.Queue(maxsize=max(1, getattr(self.config, "PROGRESS_QUEUE_MAX_MESSAGES", 1000)))
+            self._progress_worker = asyncio.create_task(self._deliver_progress())
+        try:
+            self._progress_queue.put_nowait((callback, msg))
+        except asyncio.QueueFull:
+            logger.debug("Progress queue full, dropping message: %s", msg)
+
+    async def _deliver_progress(self):
+        while True:
+            callback, msg = await self._progress_queue.get()
+            try:
+                await callback(msg)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+            finally:
+                self._progress_queue.task_done()
+
+    async def _drain_progress(self):
+        """Waits for queued progress messages to be delivered, then stops the worker."""
+        if self._progress_worker is None:
+            return
+        await self._progress_queue.join()
+        self._progress_worker.cancel()
+        self._progress_queue, self._progress_worker = None, None
+
+    def _cancel_progress(self):
+        """Stops the worker without delivering what is still queued."""
+        if self._progress_worker is not None:
+            self._progress_worker.cancel()
+            self._progress_queue, self._progress_worker = None, None
+
+    async def aclose(self):
+        """Releases pooled HTTP connections held by the clients."""
+        self._cancel_progress()
+        self._discard_prefetched_search()
+        self._discard_chunk_graph_task()
+        # Only close a retriever this loop built itself
+        if self._owns_content_retriever and 'content_retriever' in self.__dict__:
+            await self.content_retriever.aclose()
 
     async def _generate_research_plan(self):
         """Delegates research plan generation to the planner module."""
@@ -67,24 +185,43 @@ class ResearchLoop:
             section_description = current_section.get('description', section_title)
         
         callback = self.progress_callback
-        self.state.current_query = await self.planner.generate_initial_query(
-            topic=topic,
-            section_title=section_title,
-            section_description=section_description,
-            language=self.state.language,
-            progress_callback=callback
-        )
+        if current_section and current_section.get('initial_query'):
+            self.state.current_query = current_section['initial_query']
+        else:
+            self.state.current_query = await self.planner.generate_initial_query(
+                topic=topic,
+                section_title=section_title,
+                section_description=section_description,
+                language=self.state.language,
+                progress_callback=callback
+            )
         if callback: 
             await callback(f"Initial query: {self.state.current_query}")
 
+    def _discard_prefetched_search(self):
+        if self._prefetched_search is not None:
+            self._prefetched_search[1].cancel()
+            self._prefetched_search = None
+
+    def _discard_chunk_graph_task(self):
+        if self._chunk_graph_task is not None:
+            self._chunk_graph_task.cancel()
+            self._chunk_graph_task = None
+
     async def _web_search(self, callback_override=None):
         """Delegates web search to the execution module with relevance filtering."""
         if not self.state.current_query: return
         
-        # Perform initial search
-        results = await self.executor.search(
-            self.state.current_query, getattr(self.config, "MAX_SEARCH_RESULTS_PER_QUERY", 3)
-        )
+        # Perform initial search, reusing the prefetch when the approved query is the proposed one
+        prefetched = self._prefetched_search
+        if prefetched is not None and prefetched[0] == self.state.current_query:
+            self._prefetched_search = None
+            results = await prefetched[1]
+        else:
+            self._discard_prefetched_search()
+            results = await self.executor.search(
+                self.state.current_query, getattr(self.config, "MAX_SEARCH_RESULTS_PER_QUERY", 3)
+            )
         
         # Apply relevance filtering if enabled
         enable_rel = getattr(self.config, "ENABLE_RELEVANCE_FILTERING", True)
@@ -164,6 +301,12 @@ class ResearchLoop:
         if callback:
             await callback(f"Found {len(results)} relevant results.")
 
+    def _page_cache(self) -> dict:
+        """Run-wide page text cache, created on first use and capped at MAX_CACHED_PAGES (least recently used evicted)."""
+        if self.state.fetched_content is None:
+            self.state.fetched_content = LRUDict(getattr(self.config, "MAX_CACHED_PAGES", 256))
+        return self.state.fetched_content
+
     async def _summarize_sources(self, selected_results: List[SearchResult], callback_override=None):
         """Delegates retrieval and summarization to the execution module."""
         # Handle empty results (from relevance filtering)
@@ -178,39 +321,91 @@ class ResearchLoop:
             return
         
         callback = self.progress_callback
+
+        def publish_partial(text: str):
+            # Expose the streamed synthesis on the state while it is still being generated
+            self.state.new_information = text
+
+        def keep_graph(kg_model: KnowledgeGraphModel):
+            # Merged by _extract_entities_and_relations instead of a second extraction call
+            self._summary_graph = kg_model
+
+        current_section = self._get_current_section()
+        section_title = current_section['title'] if current_section else "General"
+        sources = [Source(title=res.title, link=res.link) for res in selected_results]
+
+        def extract_chunk_graphs(summaries: List[str]):
+            # Runs while the executor synthesizes; _extract_entities_and_relations awaits it
+            self._chunk_graph_task = asyncio.create_task(self.reflector.extract_knowledge_graph_batch(
+                [(summary, sources, section_title) for summary in summaries], self.state.language,
+                self.state.knowledge_graph_nodes, self.state.knowledge_graph_edges
+            ))
+
+        self._summary_graph = None
+        self._discard_chunk_graph_task()
+        chunk_graphs = getattr(self.config, "KG_FROM_CHUNK_SUMMARIES", False)
         self.state.new_information = await self.executor.retrieve_and_summarize(
             selected_results, self.state.current_query, self.state.language,
-            self.state.fetched_content, callback
+            self._page_cache(), callback, on_partial=publish_partial,
+            on_graph=keep_graph if getattr(self.config, "COMBINE_SUMMARY_AND_KG", False) and not chunk_graphs else None,
+            on_chunk_summaries=extract_chunk_graphs if chunk_graphs else None
         )
         
         if self.state.new_information:
             self.state.accumulated_summary.append(f"\n\n## {self.state.current_query}\n{self.state.new_information}")
         
-        # Add new sources to gathered list (O(N) source deduplication)
-
-        gathered_links = {s.link for s in self.state.sources_gathered}
+        # Add new sources to gathered list (O(1) dedup against the persistent seen-set)
+        seen = self.state.sources_seen
         for res in selected_results:
-            if res.link not in gathered_links:
+            if res.link not in seen:
+                seen.add(res.link)
                 self.state.sources_gathered.append(Source(title=res.title, link=res.link))
-                gathered_links.add(res.link)
         
         self.state.pending_source_selection = False
 
     async def _extract_entities_and_relations(self, callback_override=None):
-        """Delegates KG extraction and merging to the reflection module."""
+        """Delegates KG extraction and merging to the reflection module.
+
+        Summaries are buffered and extracted KG_EXTRACTION_BATCH_SIZE at a time
+        with a single structured call; the remainder is flushed when finalizing.
+        A graph already returned with the summary (COMBINE_SUMMARY_AND_KG) is merged directly, and an
+        extraction started over the chunk summaries (KG_FROM_CHUNK_SUMMARIES) is awaited instead.
+        """
         current_section = self._get_current_section()
         section_title = current_section['title'] if current_section else "General"
-        
-        await self.reflector.extract_knowledge_graph(
-            self.state.new_information, self.state.sources_gathered,
-            section_title, self.state.language,
-            self.state.knowledge_graph_nodes, self.state.knowledge_graph_edges
-        )
+
+        chunk_graph_task, self._chunk_graph_task = self._chunk_graph_task, None
+        graph, self._summary_graph = self._summary_graph, None
+        if chunk_graph_task is not None:
+            await chunk_graph_task
+        elif graph is not None:
+            for item in (*graph.nodes, *graph.edges):
+                item.properties.setdefault("section", section_title)
+            await self.reflector.merge_knowledge_graph(
+                graph, self.state.knowledge_graph_nodes, self.state.knowledge_graph_edges
+            )
+        else:
+            if self.state.new_information:
+                self._pending_kg_inputs.append(
+                    (self.state.new_information, list(self.state.sources_gathered), section_title)
+                )
+            if len(self._pending_kg_inputs) < max(1, getattr(self.config, "KG_EXTRACTION_BATCH_SIZE", 1)):
+                return
+            await self._flush_knowledge_graph()
         
         callback = self.progress_callback
         if callback: 
             await callback(f"Knowledge graph enhanced: {len(self.state.knowledge_graph_nodes)} nodes, {len(self.state.knowledge_graph_edges)} edges.")
 
+    async def _flush_knowledge_graph(self):
+        """Extracts and merges any buffered summaries into the knowledge graph."""
+        pending, self._pending_kg_inputs = self._pending_kg_inputs, []
+        if pending:
+            await self.reflector.extract_knowledge_graph_batch(
+                pending, self.state.language,
+                self.state.knowledge_graph_nodes, self.state.knowledge_graph_edges
+            )
+
     async def _reflect_on_summary(self):
         """Delegates reflection and decision making to the reflection module."""
         section = self._get_current_section()
@@ -229,27 +424,41 @@ class ResearchLoop:
             language=self.state.language
         )
 
+        self._discard_prefetched_search()
         if "CONCLUDE" in evaluation:
             self.state.proposed_query = None
         else:
             self.state.proposed_query = next_query
+            if next_query:
+                # The search runs while the query waits for approval; _web_search drops it if the query is edited
+                self._prefetched_search = (next_query, asyncio.create_task(self.executor.search(
+                    next_query, getattr(self.config, "MAX_SEARCH_RESULTS_PER_QUERY", 3)
+                )))
 
     async def _finalize_summary(self):
         """Delegates final report synthesis to the reporting module."""
         callback = self.progress_callback
+        await self._flush_knowledge_graph()
         if callback: await callback("Synthesizing final research report...")
         
         # Extract findings and sources from the completed research plan
         findings = []
-        sources = []
+        # First occurrence of each link wins; sections often cite the same pages
+        sources_by_link: Dict[Any, Any] = {}
         for section in self.state.research_plan:
             if section.get('summary'):
                 findings.append(section['summary'])
-            if section.get('sources'):
-                sources.extend(section['sources'])
+            for src in section.get('sources') or []:
+                link = src.get('link') if isinstance(src, dict) else getattr(src, 'link', None)
+                sources_by_link.setdefault(link, src)
+
+        def publish_partial(text: str):
+            # Expose the streamed report on the state while it is still being generated
+            self.state.final_report = text
 
         self.state.final_report = await self.reporter.finalize_report(
-            self.state.research_topic, findings, sources, self.state.language
+            self.state.research_topic, findings, list(sources_by_link.values()), self.state.language,
+            on_partial=publish_partial if getattr(self.config, "ENABLE_STREAMING", False) else None
         )
         if callback: await callback("Final report generation complete.")
 
@@ -266,119 +475,198 @@ class ResearchLoop:
                 question=question
             )
 
-    async def _process_section(self, section, callback_override=None):
-        """Processes a single research section and returns results."""
-        section_findings = []
-        section_sources = []
-        
-        callback = callback_override or self.progress_callback
-        if callback: await callback(f"Starting research for section: '{section['title']}'")
-
-        # Step 1: Initial Query
-        current_query = await self.planner.generate_initial_query(
+    async def _section_initial_query(self, section, callback=None) -> str:
+        if section.get('initial_query'):
+            return section['initial_query']
+        return await self.planner.generate_initial_query(
             topic=self.state.research_topic,
             section_title=section['title'],
             section_description=section.get('description', section['title']),
             language=self.state.language,
             progress_callback=callback
         )
+
+    async def _process_section(self, section, callback_override=None):
+        """Processes a single research section and returns results."""
+        # Findings joined with blank lines, extended as each summary arrives instead of re-joined per loop
+        section_text = ""
+        section_sources: Dict[str, Source] = {}  # keyed by link so repeat hits across loops are kept once
+        
+        section['status'] = 'researching'
+        callback = self._nonblocking(callback_override or self.progress_callback)
+        if callback: await callback(f"Starting research for section: '{section['title']}'")
+
+        # Step 1: Initial Query
+        current_query = await self._section_initial_query(section, callback)
         if callback: await callback(f"[{section['title']}] Initial query: {current_query}")
         
-        for loop_idx in range(getattr(self.config, "MAX_RESEARCH_LOOPS", 5)):
-            if self.state.is_interrupted: break
-            
-            # Step 2: Search
-            results = await self.executor.search(current_query, getattr(self.config, "MAX_SEARCH_RESULTS_PER_QUERY", 3))
-            
-            # Step 3: Filter and Summarize
-            relevant = await self.executor.filter_by_relevance(current_query, results, self.state.language)
-            if callback: await callback(f"[{section['title']}] Found {len(relevant)} relevant results.")
-            
-            if not relevant:
-                if callback: await callback(f"[{section['title']}] No relevant information found.")
-                break
-                
-            summary = await self.executor.retrieve_and_summarize(
-                relevant, current_query, self.state.language, {}, callback
-            )
-            
-            if summary:
-                section_findings.append(summary)
+        max_loops = getattr(self.config, "MAX_RESEARCH_LOOPS", 5)
+        num_results = getattr(self.config, "MAX_SEARCH_RESULTS_PER_QUERY", 3)
+        parallel_queries = max(1, getattr(self.config, "PARALLEL_QUERIES", 1))
+        # Search for the next query, started as soon as reflection picks it so it overlaps the bookkeeping
+        prefetched_search: Optional[asyncio.Task] = None
+        last_summary: Optional[str] = None
+        try:
+            for loop_idx in range(max_loops):
+                if self.state.is_interrupted: break
+
+                # Step 2: Search
+                if prefetched_search is not None:
+                    results = await self._run_or_interrupt(prefetched_search)
+                    prefetched_search = None
+                else:
+                    results = await self._run_or_interrupt(self.executor.search(current_query, num_results))
+
+                # Pages summarized in an earlier loop of this section are not scored, fetched or summarized again
+                fresh = [r for r in results if r.link not in section_sources]
+                if results and not fresh:
+                    if callback: await callback(f"[{section['title']}] All results were already summarized.")
+                    break
+
+                # Step 3: Filter and Summarize
+                relevant = await self._run_or_interrupt(
+                    self.executor.filter_by_relevance(current_query, fresh, self.state.language)
+                )
+                if callback: await callback(f"[{section['title']}] Found {len(relevant)} relevant results.")
+
+                if not relevant:
+                    if callback: await callback(f"[{section['title']}] No relevant information found.")
+                    break
+
+                # Page content is shared across loops and sections so overlapping URLs are fetched once per run
+                summary = await self._run_or_interrupt(self.executor.retrieve_and_summarize(
+                    relevant, current_query, self.state.language, self._page_cache(), callback
+                ))
+
+                # A loop that added nothing new cannot change the reflector's verdict, so the section ends here
+                if not summary or summary in (NO_CONTENT_SUMMARY, NO_SEGMENT_SUMMARIES) or summary == last_summary:
+                    if callback: await callback(f"[{section['title']}] No new information found; concluding section.")
+                    break
+                last_summary = summary
+                section_text = f"{section_text}\n\n{summary}" if section_text else summary
                 for r in relevant:
-                    section_sources.append(Source(title=r.title, link=r.link))
-            
-            # Step 4: Reflect & Decide loop continuation
-            reflection = await self.reflector.reflect(
-                topic=self.state.research_topic,
-                section_title=section['title'],
-                section_description=section.get('description', ''),
-                accumulated_summary="\n\n".join(section_findings),
-                language=self.state.language
-            )
-            
-            evaluation = reflection.get("evaluation", "CONCLUDE")
-            next_query = reflection.get("query")
-            
-            if evaluation == "CONTINUE" and next_query and next_query.lower() != "none":
-                current_query = next_query
-                if callback: await callback(f"[{section['title']}] Continuing with new query: {current_query}")
-            else:
-                break
+                    section_sources.setdefault(r.link, Source(title=r.title, link=r.link))
+
+                # Step 4: Reflect & Decide loop continuation. The last loop ends regardless of the
+                # verdict, so its reflection call would only delay the section's completion.
+                if loop_idx + 1 >= max_loops:
+                    break
+                reflection = await self._run_or_interrupt(self.reflector.reflect(
+                    topic=self.state.research_topic,
+                    section_title=section['title'],
+                    section_description=section.get('description', ''),
+                    accumulated_summary=section_text,
+                    language=self.state.language,
+                    max_queries=parallel_queries
+                ))
+
+                evaluation = reflection.get("evaluation", "CONCLUDE")
+                next_query = reflection.get("query")
+
+                if evaluation == "CONTINUE" and next_query and next_query.lower() != "none":
+                    current_query = next_query
+                    # Alternative queries are searched alongside the primary one; results are scored against it
+                    queries = reflection.get("queries") or [next_query]
+                    prefetched_search = asyncio.create_task(self.executor.search_many(queries, num_results))
+                    if callback: await callback(f"[{section['title']}] Continuing with new query: {current_query}")
+                else:
+                    break
+        except ResearchInterrupted:
+            logger.info(f"Research interrupted during section '{section['title']}'.")
+        finally:
+            if prefetched_search is not None:
+                prefetched_search.cancel()
 
         # Finalize section state
         section['status'] = 'completed'
-        section['summary'] = "\n\n".join(section_findings)
-        section['sources'] = [s.dict() if hasattr(s, 'dict') else s for s in section_sources]
+        section['summary'] = section_text
+        section['sources'] = [asdict(s) for s in section_sources.values()]
         
         if callback: await callback(f"[{section['title']}] Section research complete.")
         return True
 
+    async def _precompute_initial_queries(self):
+        """Generates the initial query of every pending section concurrently, before any section starts."""
+        pending = [s for s in self.state.research_plan
+                   if s['status'] != 'completed' and not s.get('initial_query')]
+        if not pending or self.state.is_interrupted:
+            return
+        callback = self._nonblocking(self.progress_callback)
+        queries = await asyncio.gather(
+            *[self._section_initial_query(s, callback) for s in pending], return_exceptions=True
+        )
+        for section, query in zip(pending, queries):
+            if isinstance(query, Exception):
+                # Leave it unset; the section generates its query when it starts
+                logger.warning(f"Initial query generation failed for '{section['title']}': {query}")
+            elif query:
+                section['initial_query'] = query
+
     async def run_loop(self):
         if not self.state.research_plan: await self._generate_research_plan()
         if self.interactive_mode and not self.state.plan_approved: return
+
+        try:
+            await self._precompute_initial_queries()
         
-        # In non-interactive mode, we can process all incomplete sections in parallel
-        if not self.interactive_mode:
-            incomplete_sections = [s for s in self.state.research_plan if s['status'] != 'completed']
-            if incomplete_sections:
-                if self.progress_callback:
-                    await self.progress_callback(f"🚀 Processing {len(incomplete_sections)} sections in parallel (max {getattr(self.config, 'MAX_CONCURRENT_SECTIONS', 3)} at once)...")
+            # In non-interactive mode, we can process all incomplete sections in parallel
+            if not self.interactive_mode:
+                incomplete_sections = [s for s in self.state.research_plan if s['status'] != 'completed']
+                if incomplete_sections:
+                    max_sections = getattr(self.config, "MAX_CONCURRENT_SECTIONS", 3)
+                    if self.progress_callback:
+                        self._emit(self.progress_callback, f"🚀 Processing {len(incomplete_sections)} sections in parallel (max {max_sections} at once)...")
                 
-                # Instance-level semaphore to control concurrency within this loop
-                max_sections = getattr(self.config, "MAX_CONCURRENT_SECTIONS", 3)
-                section_semaphore = asyncio.Semaphore(max_sections)
-
-                # Wrap progress callback to include section title context
-                async def run_section_with_context(sec):
-                    async with section_semaphore: # Control parallel execution
-                        orig_callback = self.progress_callback
-                        if orig_callback:
-                            async def wrapped_callback(msg):
-                                await orig_callback(f"[{sec['title']}] {msg}")
-                            return await self._process_section(sec, callback_override=wrapped_callback)
-                        else:
-                            return await self._process_section(sec)
-
-                # Execute all sections concurrently, but limited by the semaphore
-                await asyncio.gather(*[run_section_with_context(s) for s in incomplete_sections])
-        else:
-            # Sequential processing for interactive mode to allow per-step approval
-            if self.state.current_section_index == -1: self.state.current_section_index = 0
-            while self.state.current_section_index < len(self.state.research_plan):
-                if self.state.is_interrupted:
-                    logger.info("Research interrupted by user.")
-                    break
+                    # Instance-level semaphore to control concurrency within this loop
+                    section_semaphore = asyncio.Semaphore(max_sections)
 
-                section = self.state.research_plan[self.state.current_section_index]
-                if section['status'] == 'completed':
-                    self.state.current_section_index += 1
-                    continue
+                    # Wrap progress callback to include section title context
+                    async def run_section_with_context(sec):
+                        async with section_semaphore: # Control parallel execution
+                            orig_callback = self.progress_callback
+                            if orig_callback:
+                                async def wrapped_callback(msg):
+                                    await orig_callback(f"[{sec['title']}] {msg}")
+                                return await self._process_section(sec, callback_override=wrapped_callback)
+                            else:
+                                return await self._process_section(sec)
+
+                    # Execute all sections concurrently, but limited by the semaphore.
+                    # Sections are isolated: a failure in one must not discard the others' results.
+                    outcomes = await asyncio.gather(
+                        *[run_section_with_context(s) for s in incomplete_sections], return_exceptions=True
+                    )
+                    for sec, outcome in zip(incomplete_sections, outcomes):
+                        if isinstance(outcome, Exception):
+                            logger.error(f"Section '{sec['title']}' failed: {outcome}")
+                            sec['status'] = 'pending'
+            else:
+                # Sequential processing for interactive mode to allow per-step approval
+                if self.state.current_section_index == -1: self.state.current_section_index = 0
+                while self.state.current_section_index < len(self.state.research_plan):
+                    if self.state.is_interrupted:
+                        logger.info("Research interrupted by user.")
+                        break
+
+                    section = self.state.research_plan[self.state.current_section_index]
+                    if section['status'] == 'completed':
+                        self.state.current_section_index += 1
+                        continue
 
-                success = await self._process_section(section)
-                if not success and self.interactive_mode:
-                    return None # Wait for interactive input
+                    success = await self._process_section(section)
+                    if not success and self.interactive_mode:
+                        return None # Wait for interactive input
 
-                self.state.current_section_index += 1
+                    self.state.current_section_index += 1
+                    self.state.reset_section_state()
 
-        await self._finalize_summary()
-        return self.state.final_report
+            # Section progress is delivered before the report's own messages
+            await self._drain_progress()
+            await self._finalize_summary()
+            return self.state.final_report
+        except BaseException:
+            # Don't leave the delivery worker running after a failed or cancelled run
+            self._cancel_progress()
+            raise
+        finally:
+            await self._drain_progress()
@@ -1,13 +1,18 @@
-from typing import List, Dict, Optional, TypedDict, Set
+import asyncio
+from dataclasses import dataclass
+from typing import List, Dict, NotRequired, Optional, TypedDict, Set
 from pydantic import BaseModel, Field
 
-class SearchResult(BaseModel):
+# Search records are created in bulk per query, so they are slotted dataclasses rather than pydantic models
+@dataclass(slots=True)
+class SearchResult:
     title: str
     link: str
     snippet: str # Or any other relevant fields from search API
     relevance_score: Optional[float] = None  # Added for relevance filtering
 
-class Source(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Source:
     title: str
     link: str
 
@@ -18,6 +23,7 @@ class Section(BaseModel):
 
 class ResearchPlanModel(BaseModel):
     sections: List[Section] = Field(description="List of research sections")
+    first_query: Optional[str] = Field(default=None, description="Concise web search query to start researching the first section")
 
 class KGNode(BaseModel):
     id: str = Field(description="Unique identifier for the node")
@@ -37,6 +43,14 @@ class KnowledgeGraphModel(BaseModel):
     nodes: List[KGNode]
     edges: List[KGEdge]
 
+class KnowledgeGraphBatchModel(BaseModel):
+    graphs: List[KnowledgeGraphModel] = Field(description="One graph per numbered input text, in input order")
+
+class SummaryWithGraphModel(BaseModel):
+    summary: str = Field(default="", description="The combined summary text")
+    nodes: List[KGNode] = Field(default_factory=list, description="Key entities found in the summarized sources")
+    edges: List[KGEdge] = Field(default_factory=list, description="Relationships between those entities")
+
 class VisualSummaryNode(BaseModel):
     id: str = Field(description="Unique identifier for the node")
     label: str = Field(description="Label or name of the concept")
@@ -62,21 +76,15 @@ class SectionPlan(TypedDict):
     status: str # "pending", "researching", "completed"
     summary: str
     sources: List[Source]
+    initial_query: NotRequired[str] # Precomputed query, used instead of generating one when the section starts
 
 class ResearchState:
     def __init__(self, research_topic: str, language: str = "Japanese"):
         self.research_topic: str = research_topic
         self.language: str = language
         self.initial_query: Optional[str] = None
-        self.proposed_query: Optional[str] = None
-        self.current_query: Optional[str] = None
-        self.search_results: Optional[List[SearchResult]] = None
-        self.new_information: Optional[str] = None # Summary of the latest search results
-        self.sources_gathered: List[Source] = []
-        self.accumulated_summary: List[str] = [] # Initialize as empty list
-        self.completed_loops: int = 0
+        self.reset_section_state()
         self.final_report: Optional[str] = None
-        self.pending_source_selection: bool = False
         self.fetched_content: Optional[Dict[str, str]] = None
         self.knowledge_graph_nodes: List[Dict] = []
         self.knowledge_graph_edges: List[Dict] = []
@@ -86,11 +94,38 @@ class ResearchState:
         self.research_plan: List[SectionPlan] = []
         self.current_section_index: int = -1 # -1 means plan not yet generated
         self.plan_approved: bool = False
-        self.is_interrupted: bool = False
+        # Set to interrupt research; in-flight awaits race against it (see is_interrupted)
+        self.interrupt_event: asyncio.Event = asyncio.Event()
         
         # Relevance filtering fields (Phase 6)
         self.regenerated_queries: Set[str] = set()  # Track regenerated queries to prevent infinite loops
 
+    def reset_section_state(self):
+        """Clears the per-section step fields in one place (run-wide caches like fetched_content are kept)."""
+        self.proposed_query: Optional[str] = None
+        self.current_query: Optional[str] = None
+        self.search_results: Optional[List[SearchResult]] = None
+        self.new_information: Optional[str] = None # Summary of the latest search results
+        self.sources_gathered: List[Source] = []
+        self.sources_seen: Set[str] = set()  # Links already in sources_gathered, for O(1) dedup
+        self.accumulated_summary: List[str] = [] # Initialize as empty list
+        self.completed_loops: int = 0
+        self.pending_source_selection: bool = False
+
+    @property
+    def is_interrupted(self) -> bool:
+        return self.interrupt_event.is_set()
+
+    @is_interrupted.setter
+    def is_interrupted(self, value: bool):
+        if value:
+            self.interrupt_event.set()
+        else:
+            self.interrupt_event.clear()
+
+    def request_interrupt(self):
+        self.interrupt_event.set()
+
     def __str__(self):
         plan_status = f"{len(self.research_plan)} sections" if self.research_plan else "Not generated"
         current_sec = f"{self.current_section_index + 1}/{len(self.research_plan)}" if self.research_plan else "N/A"
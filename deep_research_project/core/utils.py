@@ -1,4 +1,27 @@
-from typing import List
+import asyncio
+import json
+import re
+from collections import Counter
+from typing import Any, Coroutine, Iterator, List
+
+try:
+    import orjson
+except ImportError:  # optional speedup for iter_json_values
+    orjson = None
+
+def run_async(coro: Coroutine) -> Any:
+    """Runs a coroutine to completion on uvloop when it is installed, else on the stdlib event loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+def estimate_tokens(text: str) -> int:
+    """Estimates tokens as ~4 chars per ASCII token and 1 per other char (e.g. Japanese), without a tokenizer."""
+    if not text: return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
 
 def split_text_into_chunks(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
     """Splits a given text into overlapping chunks."""
@@ -10,15 +33,48 @@ def split_text_into_chunks(text: str, chunk_size: int, chunk_overlap: int) -> Li
         # Though the config validator handles this, we add a safety check here
         chunk_overlap = chunk_size // 2
 
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunks.append(text[start:end])
-        if end >= len(text):
-            break
-        start += (chunk_size - chunk_overlap)
-    return chunks
+    # Chunk starts are fixed up front: the last one is the first start whose chunk reaches the end of the text
+    text_len = len(text)
+    step = chunk_size - chunk_overlap
+    stop = min(text_len, text_len - chunk_size + step) if text_len > chunk_size else 1
+    return [text[i:i + chunk_size] for i in range(0, stop, step)]
+
+# SimHash bit counters packed into one int, one _SIMHASH_FIELD_BITS-wide field per hash bit,
+# so each n-gram adds its weight to all 64 counters with 8 byte lookups instead of 64 bit tests
+_SIMHASH_FIELD_BITS = 32
+_SIMHASH_BYTE_SPREAD = [
+    sum(1 << (bit * _SIMHASH_FIELD_BITS) for bit in range(8) if value >> bit & 1) for value in range(256)
+]
+
+def simhash(text: str, ngram: int = 3) -> int:
+    """
+    64-bit SimHash over character n-grams of the whitespace-normalized text (works without word
+    boundaries, e.g. Japanese). Near-identical texts differ in only a few bits. Uses the built-in
+    string hash, so values are only comparable within one process.
+    """
+    normalized = " ".join(text.lower().split())
+    grams = Counter(normalized[i:i + ngram] for i in range(max(1, len(normalized) - ngram + 1)))
+    counters = 0
+    for gram, count in grams.items():
+        spread = 0
+        for k, byte in enumerate((hash(gram) & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "little")):
+            spread |= _SIMHASH_BYTE_SPREAD[byte] << (8 * k * _SIMHASH_FIELD_BITS)
+        counters += count * spread
+    # A bit is set when more than half of the n-gram weight has it set
+    total = sum(grams.values())
+    field_mask = (1 << _SIMHASH_FIELD_BITS) - 1
+    return sum(1 << bit for bit in range(64) if 2 * (counters >> (bit * _SIMHASH_FIELD_BITS) & field_mask) > total)
+
+def drop_near_duplicates(texts: List[str], max_distance: int) -> List[int]:
+    """Indices of the texts to keep: each is kept unless its SimHash is within max_distance bits of an earlier kept one."""
+    kept, kept_hashes = [], []
+    for i, text in enumerate(texts):
+        h = simhash(text)
+        if any((h ^ other).bit_count() <= max_distance for other in kept_hashes):
+            continue
+        kept.append(i)
+        kept_hashes.append(h)
+    return kept
 
 def sanitize_query(query) -> str:
     """Cleans and truncates the query to prevent API errors."""
@@ -41,3 +97,25 @@ def sanitize_query(query) -> str:
         else:
             clean = clean[:100]
     return clean
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_START_RE = re.compile(r"[{\[]")
+
+def iter_json_values(text: str) -> Iterator[Any]:
+    """Yields each top-level JSON object or array embedded in text, decoding in place with raw_decode."""
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        # Usual case: the response is one JSON value, parsed in a single pass (with orjson when installed)
+        try:
+            yield orjson.loads(stripped) if orjson is not None else json.loads(stripped)
+            return
+        except ValueError:
+            pass
+    idx = 0
+    while (match := _JSON_START_RE.search(text, idx)) is not None:
+        try:
+            value, idx = _JSON_DECODER.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            idx = match.start() + 1
+            continue
+        yield value
@@ -11,6 +11,7 @@ load_dotenv()
 from deep_research_project.config.config import Configuration
 from deep_research_project.core.state import ResearchState
 from deep_research_project.core.research_loop import ResearchLoop
+from deep_research_project.core.utils import run_async
 import logging
 import asyncio
 
@@ -78,6 +79,8 @@ async def main():
                 print("\nResearch paused for user input. Please use a UI for interactive mode or run in automated mode.")
     except Exception as e:
         logger.error(f"An error occurred: {e}", exc_info=True)
+    finally:
+        await research_runner.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from deep_research_project.config.config import Configuration
 from deep_research_project.core.graph import create_research_graph
+from deep_research_project.core.utils import run_async
 from deep_research_project.tools.llm_client import LLMClient
 from deep_research_project.tools.search_client import SearchClient
 from deep_research_project.tools.content_retriever import ContentRetriever
@@ -96,6 +97,7 @@ async def run_research_graph(topic: str, config: Configuration, language: str):
     thread_id = str(uuid.uuid4())
     st.session_state.thread_id = thread_id
     st.session_state.graph = graph
+    st.session_state.retriever = retriever
     st.session_state.logs = [] 
     st.session_state.app_config = config
     
@@ -170,6 +172,9 @@ async def run_research_graph(topic: str, config: Configuration, language: str):
         except Exception as e:
             st.error(f"エラーが発生しました: {str(e)}")
             logger.error(traceback.format_exc())
+        finally:
+            # Pooled connections belong to this run's event loop; a resume opens new ones
+            await retriever.aclose()
 
 def main():
     st.set_page_config(page_title="Deep Research AI", page_icon="🔬", layout="wide")
@@ -213,7 +218,7 @@ def main():
         config.USE_SNIPPETS_ONLY_MODE = snippets_only
         config.MAX_RESEARCH_LOOPS = max_loops
         
-        asyncio.run(run_research_graph(st.session_state.current_topic, config, language))
+        run_async(run_research_graph(st.session_state.current_topic, config, language))
         st.session_state.executing = False
         st.rerun()
 
@@ -242,14 +247,19 @@ def main():
                         "config": st.session_state.app_config
                     }
                 }
-                async for _ in st.session_state.graph.astream(None, conf):
-                    pass
+                try:
+                    async for _ in st.session_state.graph.astream(None, conf):
+                        pass
+                finally:
+                    retriever = st.session_state.get("retriever")
+                    if retriever is not None:
+                        await retriever.aclose()
                 
                 final_v = st.session_state.graph.get_state(conf).values
                 st.session_state.final_report = final_v.get("final_report", "")
                 status.update(label="✅ リサーチ完了！", state="complete", expanded=False)
         
-        asyncio.run(resume())
+        run_async(resume())
         st.session_state.executing = False
         st.rerun()
 
@@ -2,8 +2,10 @@ import asyncio
 import unittest
 import os
 import shutil
+import json
+from unittest.mock import patch
 from pathlib import Path
-from deep_research_project.tools.cache_manager import CacheManager
+from deep_research_project.tools.cache_manager import CacheManager, LRUDict, MemoryCache
 
 class TestCacheManager(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
@@ -36,5 +38,50 @@ class TestCacheManager(unittest.IsolatedAsyncioTestCase):
         await self.cache.set_content_cache(url, content)
         self.assertEqual(await self.cache.get_content_cache(url), content)
 
+    async def test_content_cache_ttl(self):
+        url = "https://example.com/ttl"
+        await self.cache.set_content_cache(url, "Fresh")
+        self.assertEqual(await self.cache.get_content_cache(url, ttl_seconds=60), "Fresh")
+        self.assertIsNone(await self.cache.get_content_cache(url, ttl_seconds=0))
+
+    async def test_cache_files_are_plain_utf8_json(self):
+        url = "https://example.com/日本語"
+        await self.cache.set_content_cache(url, "内容")
+        cache_file = Path(self.test_cache_dir) / "content" / f"{self.cache._get_hash(url)}.json"
+        with open(cache_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["content"], "内容")
+
+        # Files written with orjson are readable by the stdlib fallback
+        with patch("deep_research_project.tools.cache_manager.orjson", None):
+            self.assertEqual(await self.cache.get_content_cache(url), "内容")
+
+    async def test_memory_cache_lru_and_ttl(self):
+        cache = MemoryCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")  # "a" becomes most recently used
+        cache.set("c", "C")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(len(cache), 2)
+
+        expired = MemoryCache(max_entries=2, ttl_seconds=0)
+        expired.set("a", "A")
+        self.assertIsNone(expired.get("a"))
+
+    async def test_lru_dict_evicts_least_recently_used(self):
+        pages = LRUDict(max_entries=2)
+        pages["a"] = "A"
+        pages["b"] = "B"
+        self.assertEqual(pages["a"], "A")  # "a" becomes most recently used
+        pages["c"] = "C"
+        self.assertNotIn("b", pages)
+        self.assertEqual(list(pages), ["a", "c"])
+
+        unbounded = LRUDict()
+        for i in range(5):
+            unbounded[i] = i
+        self.assertEqual(len(unbounded), 5)
+
 if __name__ == "__main__":
     unittest.main()
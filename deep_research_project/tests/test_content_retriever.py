@@ -1,6 +1,9 @@
 import unittest
 import asyncio
+import threading
+import tempfile
 from unittest.mock import MagicMock, AsyncMock, patch
+from bs4 import BeautifulSoup
 from deep_research_project.config.config import Configuration
 from deep_research_project.tools.content_retriever import ContentRetriever
 
@@ -18,6 +21,34 @@ class TestContentRetriever(unittest.IsolatedAsyncioTestCase):
         self.assertIn("World", text)
         self.assertNotIn("alert", text)
 
+    def test_extract_text_stops_after_max_chars(self):
+        retriever = ContentRetriever(self.mock_config)
+        html = "<html><body>" + "".join(f"<p>Paragraph {i}</p>" for i in range(100)) + "</body></html>"
+        full = retriever.extract_text(html)
+        partial = retriever.extract_text(html, max_chars=30)
+        self.assertTrue(full.startswith(partial))
+        self.assertGreaterEqual(len(partial), 30)
+        self.assertNotIn("Paragraph 10", partial)
+
+    def test_extract_text_parses_only_a_prefix_when_capped(self):
+        retriever = ContentRetriever(self.mock_config)
+        html = "<html><body><p>Lead</p>" + "<p>filler</p>" * 10000 + "</body></html>"
+        with patch("deep_research_project.tools.content_retriever.BeautifulSoup", wraps=BeautifulSoup) as soup_cls:
+            text = retriever.extract_text(html, max_chars=10)
+        self.assertTrue(text.startswith("Lead"))
+        self.assertLessEqual(len(soup_cls.call_args.args[0]), 10 * 20)
+
+    def test_extract_text_reparses_whole_page_when_prefix_is_all_head(self):
+        retriever = ContentRetriever(self.mock_config)
+        head_script = "<script>" + "var x = 1;" * 30000 + "</script>"
+        body = "".join(f"<p>Paragraph {i}</p>" for i in range(300))
+        html = f"<html><head>{head_script}</head><body>{body}</body></html>"
+        full = retriever.extract_text(html)
+        capped = retriever.extract_text(html, max_chars=1000)
+        self.assertTrue(capped.startswith("Paragraph 0"))
+        self.assertGreaterEqual(len(capped), 1000)
+        self.assertTrue(full.startswith(capped))
+
     async def test_call_progress_sync(self):
         sync_callback = MagicMock()
         retriever = ContentRetriever(self.mock_config, progress_callback=sync_callback)
@@ -52,7 +83,7 @@ class TestContentRetriever(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(text, "Content")
 
     @patch("socket.getaddrinfo")
-    @patch("deep_research_project.tools.content_retriever.PdfReader")
+    @patch("pypdf.PdfReader")
     @patch("httpx.AsyncClient")
     async def test_retrieve_and_extract_pdf(self, mock_client_class, mock_pdf_reader, mock_getaddrinfo):
         mock_getaddrinfo.return_value = [(None, None, None, None, ("127.0.0.1", 80))]
@@ -76,5 +107,147 @@ class TestContentRetriever(unittest.IsolatedAsyncioTestCase):
         text = await retriever.retrieve_and_extract("http://example.com/test.pdf")
         self.assertIn("PDF Page Content", text)
 
+    @patch("socket.getaddrinfo")
+    @patch("httpx.AsyncClient")
+    async def test_retrieve_reuses_client_per_host(self, mock_client_class, mock_getaddrinfo):
+        mock_getaddrinfo.return_value = [(None, None, None, None, ("127.0.0.1", 80))]
+        self.mock_config.ENABLE_CACHING = False
+
+        mock_response = MagicMock()
+        mock_response.is_redirect = False
+        mock_response.headers = {"Content-Type": "text/plain"}
+        mock_response.text = "Plain"
+        mock_client = AsyncMock()
+        mock_client.send.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        retriever = ContentRetriever(self.mock_config)
+        await retriever.retrieve_and_extract("http://example.com/a")
+        await retriever.retrieve_and_extract("http://example.com/b")
+        await retriever.retrieve_and_extract("http://other.example.com/")
+
+        self.assertEqual(mock_client_class.call_count, 2)
+        self.assertEqual(mock_client.send.await_count, 3)
+
+        await retriever.aclose()
+        self.assertEqual(mock_client.aclose.await_count, 2)
+
+    @patch("socket.getaddrinfo")
+    @patch("httpx.AsyncClient")
+    async def test_client_pool_evicts_and_closes_least_recently_used_host(self, mock_client_class, mock_getaddrinfo):
+        mock_getaddrinfo.return_value = [(None, None, None, None, ("127.0.0.1", 80))]
+        self.mock_config.ENABLE_CACHING = False
+        self.mock_config.MAX_POOLED_HOSTS = 2
+
+        mock_response = MagicMock()
+        mock_response.is_redirect = False
+        mock_response.headers = {"Content-Type": "text/plain"}
+        mock_response.text = "Plain"
+        clients = {}
+
+        def new_client(**kwargs):
+            client = AsyncMock()
+            client.send.return_value = mock_response
+            clients[len(clients)] = client
+            return client
+
+        mock_client_class.side_effect = new_client
+        retriever = ContentRetriever(self.mock_config)
+        for host in ("a", "b", "a", "c"):
+            await retriever.retrieve_and_extract(f"http://{host}.example.com/")
+
+        # "b" was least recently used when "c" arrived
+        self.assertEqual(len(clients), 3)
+        clients[1].aclose.assert_awaited_once()
+        clients[0].aclose.assert_not_awaited()
+        self.assertEqual(list(retriever._clients), ["a.example.com", "c.example.com"])
+
+    def test_client_pool_is_scoped_to_event_loop(self):
+        retriever = ContentRetriever(self.mock_config)
+        with patch("httpx.AsyncClient", side_effect=lambda **kwargs: AsyncMock()):
+            first = asyncio.run(retriever._acquire_client("example.com"))
+            second = asyncio.run(retriever._acquire_client("example.com"))
+        self.assertIsNot(first, second)
+
+    @patch("socket.getaddrinfo")
+    @patch("httpx.AsyncClient")
+    async def test_retrieved_content_is_cached_on_disk(self, mock_client_class, mock_getaddrinfo):
+        mock_getaddrinfo.return_value = [(None, None, None, None, ("127.0.0.1", 80))]
+        self.mock_config.ENABLE_CACHING = True
+        self.mock_config.CONTENT_CACHE_TTL_SECONDS = 3600
+
+        mock_response = MagicMock()
+        mock_response.is_redirect = False
+        mock_response.headers = {"Content-Type": "text/plain"}
+        mock_response.text = "Plain"
+        mock_client = AsyncMock()
+        mock_client.send.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.mock_config.CACHE_DIR = cache_dir
+            first = ContentRetriever(self.mock_config)
+            self.assertEqual(await first.retrieve_and_extract("http://example.com/page"), "Plain")
+            # A fresh retriever (e.g. the next run) is served from disk
+            second = ContentRetriever(self.mock_config)
+            self.assertEqual(await second.retrieve_and_extract("http://example.com/page"), "Plain")
+
+        self.assertEqual(mock_client.send.await_count, 1)
+
+    @patch("socket.getaddrinfo")
+    @patch("httpx.AsyncClient")
+    async def test_expired_cache_is_revalidated_conditionally(self, mock_client_class, mock_getaddrinfo):
+        mock_getaddrinfo.return_value = [(None, None, None, None, ("127.0.0.1", 80))]
+        self.mock_config.ENABLE_CACHING = True
+        self.mock_config.CONTENT_CACHE_TTL_SECONDS = 0  # every entry is already expired
+
+        first_response = MagicMock()
+        first_response.is_redirect = False
+        first_response.headers = {"Content-Type": "text/plain", "ETag": '"v1"'}
+        first_response.text = "Plain"
+        not_modified = MagicMock()
+        not_modified.is_redirect = False
+        not_modified.status_code = 304
+        mock_client = AsyncMock()
+        mock_client.send.side_effect = [first_response, not_modified]
+        mock_client_class.return_value = mock_client
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.mock_config.CACHE_DIR = cache_dir
+            retriever = ContentRetriever(self.mock_config)
+            self.assertEqual(await retriever.retrieve_and_extract("http://example.com/page"), "Plain")
+            self.assertEqual(await retriever.retrieve_and_extract("http://example.com/page"), "Plain")
+
+        revalidation = mock_client.send.await_args_list[1].args[0]
+        self.assertEqual(revalidation.headers["If-None-Match"], '"v1"')
+        not_modified.raise_for_status.assert_not_called()
+
+    @patch("socket.getaddrinfo")
+    @patch("httpx.AsyncClient")
+    async def test_html_extraction_runs_off_event_loop(self, mock_client_class, mock_getaddrinfo):
+        mock_getaddrinfo.return_value = [(None, None, None, None, ("127.0.0.1", 80))]
+        self.mock_config.ENABLE_CACHING = False
+
+        mock_response = MagicMock()
+        mock_response.is_redirect = False
+        mock_response.headers = {"Content-Type": "text/html"}
+        mock_response.text = "<html><body><p>Content</p></body></html>"
+        mock_client = AsyncMock()
+        mock_client.send.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        retriever = ContentRetriever(self.mock_config)
+        parse_threads = []
+        original_extract = retriever.extract_text
+        def recording_extract(html, url="", max_chars=0):
+            parse_threads.append(threading.get_ident())
+            return original_extract(html, url=url, max_chars=max_chars)
+        retriever.extract_text = recording_extract
+
+        text = await retriever.retrieve_and_extract("http://example.com")
+
+        self.assertEqual(text, "Content")
+        self.assertNotEqual(parse_threads, [threading.get_ident()])
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,7 +6,7 @@ from unittest.mock import patch, MagicMock, AsyncMock
 # Modules to be tested
 from deep_research_project.config.config import Configuration
 from deep_research_project.core.research_loop import ResearchLoop
-from deep_research_project.core.utils import split_text_into_chunks, sanitize_query
+from deep_research_project.core.utils import split_text_into_chunks, sanitize_query, run_async, drop_near_duplicates, estimate_tokens
 from deep_research_project.core.state import ResearchState, Source, SearchResult, ResearchPlanModel, Section, KnowledgeGraphModel
 from deep_research_project.tools.llm_client import LLMClient
 
@@ -32,6 +32,7 @@ class TestAsyncResearchLoop(unittest.IsolatedAsyncioTestCase):
         self.mock_config.ENABLE_RELEVANCE_FILTERING = True
         self.mock_config.RELEVANCE_FILTER_MODE = "enabled"
         self.mock_config.MAX_FINAL_REPORT_CONTEXT_CHARS = 100000
+        self.mock_config.ENABLE_STREAMING = False
 
         self.state = ResearchState(research_topic="AI in Healthcare")
 
@@ -52,6 +53,33 @@ class TestAsyncResearchLoop(unittest.IsolatedAsyncioTestCase):
         self.search_patcher.stop()
         self.content_patcher.stop()
 
+    async def test_clients_are_built_on_first_use(self):
+        with patch('deep_research_project.core.research_loop.LLMClient') as llm_cls, \
+             patch('deep_research_project.core.research_loop.ContentRetriever') as retriever_cls:
+            loop = ResearchLoop(self.mock_config, ResearchState("Topic"))
+            llm_cls.assert_not_called()
+
+            self.assertIs(loop.planner.llm_client, loop.llm_client)
+            self.assertIs(loop.reflector.llm_client, loop.llm_client)
+            llm_cls.assert_called_once()
+
+            # Closing a loop that never retrieved anything does not build a retriever
+            await loop.aclose()
+            retriever_cls.assert_not_called()
+
+    async def test_injected_clients_are_shared_and_not_closed(self):
+        llm, search, retriever = MagicMock(), MagicMock(), MagicMock()
+        retriever.aclose = AsyncMock()
+        loop = ResearchLoop(self.mock_config, ResearchState("Topic"),
+                            llm_client=llm, search_client=search, content_retriever=retriever)
+
+        self.assertIs(loop.executor.llm_client, llm)
+        self.assertIs(loop.executor.search_client, search)
+        self.assertIs(loop.executor.content_retriever, retriever)
+
+        await loop.aclose()
+        retriever.aclose.assert_not_awaited()
+
     async def test_generate_research_plan_structured(self):
         # Mock structured output
         mock_plan = ResearchPlanModel(sections=[
@@ -76,6 +104,26 @@ class TestAsyncResearchLoop(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(self.state.search_results, mock_results)
         self.assertTrue(self.state.pending_source_selection)
 
+    async def test_reflection_prefetches_search_for_proposed_query(self):
+        self.mock_config.RELEVANCE_FILTER_MODE = "disabled"
+        results = [SearchResult(title="T", link="http://t.com", snippet="S")]
+        self.loop.reflector.reflect_and_decide = AsyncMock(return_value=("CONTINUE", "next q"))
+        self.loop.executor.search = AsyncMock(return_value=results)
+
+        await self.loop._reflect_on_summary()
+        self.state.current_query = self.state.proposed_query
+        await self.loop._web_search()
+
+        self.loop.executor.search.assert_awaited_once_with("next q", 3)
+        self.assertEqual(self.state.search_results, results)
+
+        # An edited query discards the prefetch and searches for what was approved
+        await self.loop._reflect_on_summary()
+        self.state.current_query = "edited q"
+        await self.loop._web_search()
+        self.assertEqual(self.loop.executor.search.await_args.args, ("edited q", 3))
+        self.assertIsNone(self.loop._prefetched_search)
+
     async def test_summarize_sources_accumulates_data(self):
         self.state.current_query = "Query A"
         selected = [SearchResult(title="S1", link="http://s1.com", snippet="Snippet 1")]
@@ -91,6 +139,71 @@ class TestAsyncResearchLoop(unittest.IsolatedAsyncioTestCase):
         self.assertIn("## Query A", "".join(self.state.accumulated_summary))
         self.assertEqual(len(self.state.sources_gathered), 1)
 
+    async def test_graph_returned_with_summary_is_merged_without_extraction(self):
+        self.mock_config.COMBINE_SUMMARY_AND_KG = True
+        self.state.current_query = "Query A"
+        self.state.research_plan = [{"title": "Sec", "description": "", "status": "researching", "summary": "", "sources": []}]
+        self.state.current_section_index = 0
+        graph = KnowledgeGraphModel(nodes=[{"id": "n1", "label": "N1", "type": "Concept"}], edges=[])
+
+        async def fake_retrieve_and_summarize(*args, on_graph=None, **kwargs):
+            on_graph(graph)
+            return "Summary"
+
+        self.loop.executor.retrieve_and_summarize = AsyncMock(side_effect=fake_retrieve_and_summarize)
+        self.loop.reflector.extract_knowledge_graph_batch = AsyncMock()
+
+        await self.loop._summarize_sources([SearchResult(title="S1", link="http://s1.com", snippet="Snippet 1")])
+        await self.loop._extract_entities_and_relations()
+
+        self.loop.reflector.extract_knowledge_graph_batch.assert_not_awaited()
+        self.assertEqual([n["id"] for n in self.state.knowledge_graph_nodes], ["n1"])
+        self.assertEqual(self.state.knowledge_graph_nodes[0]["properties"]["section"], "Sec")
+
+    async def test_graph_extracted_from_chunk_summaries_during_synthesis(self):
+        self.mock_config.KG_FROM_CHUNK_SUMMARIES = True
+        self.state.current_query = "Query A"
+        self.state.research_plan = [{"title": "Sec", "description": "", "status": "researching", "summary": "", "sources": []}]
+        self.state.current_section_index = 0
+        extraction_started = asyncio.Event()
+
+        async def fake_extract(items, language, nodes, edges):
+            extraction_started.set()
+            nodes.append({"id": "n1"})
+
+        async def fake_retrieve_and_summarize(*args, on_graph=None, on_chunk_summaries=None, **kwargs):
+            self.assertIsNone(on_graph)
+            on_chunk_summaries(["chunk summary 1", "chunk summary 2"])
+            await asyncio.wait_for(extraction_started.wait(), 1)  # extraction overlaps the synthesis
+            return "Summary"
+
+        self.loop.executor.retrieve_and_summarize = AsyncMock(side_effect=fake_retrieve_and_summarize)
+        self.loop.reflector.extract_knowledge_graph_batch = AsyncMock(side_effect=fake_extract)
+
+        await self.loop._summarize_sources([SearchResult(title="S1", link="http://s1.com", snippet="Snippet 1")])
+        await self.loop._extract_entities_and_relations()
+
+        items = self.loop.reflector.extract_knowledge_graph_batch.call_args.args[0]
+        self.assertEqual([(text, title) for text, _sources, title in items],
+                         [("chunk summary 1", "Sec"), ("chunk summary 2", "Sec")])
+        self.loop.reflector.extract_knowledge_graph_batch.assert_awaited_once()
+        self.assertEqual(self.state.knowledge_graph_nodes, [{"id": "n1"}])
+
+    async def test_summarize_sources_dedups_links_across_calls(self):
+        self.state.current_query = "Query A"
+        selected = [SearchResult(title="S1", link="http://s1.com", snippet="Snippet 1")]
+        self.mock_content_retriever.retrieve_and_extract = AsyncMock(return_value="Full content 1")
+        self.mock_llm_client.generate_text = AsyncMock(return_value="Summary")
+
+        await self.loop._summarize_sources(selected)
+        await self.loop._summarize_sources(selected + [SearchResult(title="S2", link="http://s2.com", snippet="Snippet 2")])
+
+        self.assertEqual([s.link for s in self.state.sources_gathered], ["http://s1.com", "http://s2.com"])
+        self.assertEqual(self.state.sources_seen, {"http://s1.com", "http://s2.com"})
+        # Fetched pages persist on the state, so the repeated link was not downloaded again
+        self.assertEqual(set(self.state.fetched_content), {"http://s1.com", "http://s2.com"})
+        self.assertEqual(self.mock_content_retriever.retrieve_and_extract.await_count, 2)
+
     async def test_finalize_summary_with_citations(self):
         self.state.research_plan = [
             {"title": "Sec 1", "summary": "Info 1", "sources": [Source(title="Source 1", link="s1")], "status": "completed"}
@@ -108,12 +221,73 @@ class TestAsyncResearchLoop(unittest.IsolatedAsyncioTestCase):
         prompt = call_args.kwargs['prompt']
         self.assertIn("[1]", prompt)
 
+    async def test_finalize_summary_merges_sources_across_sections(self):
+        self.state.research_plan = [
+            {"title": "Sec 1", "summary": "Info 1", "status": "completed",
+             "sources": [{"title": "A", "link": "a"}, {"title": "B", "link": "b"}]},
+            {"title": "Sec 2", "summary": "Info 2", "status": "completed",
+             "sources": [Source(title="A again", link="a"), {"title": "C", "link": "c"}]},
+        ]
+        self.loop.reporter.finalize_report = AsyncMock(return_value="Report")
+
+        await self.loop._finalize_summary()
+
+        sources = self.loop.reporter.finalize_report.call_args.args[2]
+        self.assertEqual([s["title"] for s in sources], ["A", "B", "C"])
+
+class TestResearchStateReset(unittest.TestCase):
+    def test_reset_section_state_keeps_run_wide_fields(self):
+        state = ResearchState("Topic")
+        state.current_query = "q"
+        state.accumulated_summary.append("A")
+        state.sources_gathered.append(Source(title="T", link="L"))
+        state.sources_seen.add("L")
+        state.fetched_content = {"L": "content"}
+        state.knowledge_graph_nodes.append({"id": "N"})
+
+        state.reset_section_state()
+
+        self.assertIsNone(state.current_query)
+        self.assertEqual(state.accumulated_summary, [])
+        self.assertEqual(state.sources_gathered, [])
+        self.assertEqual(state.sources_seen, set())
+        self.assertEqual(state.fetched_content, {"L": "content"})
+        self.assertEqual(len(state.knowledge_graph_nodes), 1)
+
+class TestRunAsync(unittest.TestCase):
+    def test_run_async_returns_result(self):
+        async def compute():
+            await asyncio.sleep(0)
+            return 42
+        self.assertEqual(run_async(compute()), 42)
+
 class TestSplitTextIntoChunks(unittest.TestCase):
     def test_basic_chunking(self):
         text = "1234567890"
         chunks = split_text_into_chunks(text, 5, 2)
         self.assertEqual(chunks, ["12345", "45678", "7890"])
 
+    def test_chunking_edges(self):
+        self.assertEqual(split_text_into_chunks("12345", 5, 2), ["12345"])
+        self.assertEqual(split_text_into_chunks("123456", 5, 2), ["12345", "456"])
+        self.assertEqual(split_text_into_chunks("12345678", 5, 2), ["12345", "45678"])
+
+class TestDropNearDuplicates(unittest.TestCase):
+    def test_near_duplicates_are_dropped(self):
+        base = " ".join(f"Paragraph {i}: the committee reviewed item {i * 7} and noted growth of {i * 3} percent." for i in range(40))
+        texts = [base, base + " Reprinted with permission.", "A completely different article about marine biology and coral reefs.", base]
+        self.assertEqual(drop_near_duplicates(texts, 3), [0, 2])
+
+    def test_zero_distance_keeps_distinct_texts(self):
+        self.assertEqual(drop_near_duplicates(["alpha beta", "gamma delta", "alpha beta"], 0), [0, 1])
+
+class TestEstimateTokens(unittest.TestCase):
+    def test_ascii_and_other_chars_are_weighted_differently(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcdefgh"), 2)
+        self.assertEqual(estimate_tokens("日本語"), 3)
+        self.assertEqual(estimate_tokens("abcd日本"), 3)
+
 class TestSanitizeQuery(unittest.TestCase):
     def test_sanitize_query_basic(self):
         self.assertEqual(sanitize_query("**bold**"), "bold")
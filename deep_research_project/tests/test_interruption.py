@@ -62,5 +62,25 @@ class TestInterruption(unittest.IsolatedAsyncioTestCase):
         # Final report should still be generated (with whatever was there)
         self.assertIsNotNone(self.state.final_report)
 
+    async def test_interrupt_preempts_inflight_step(self):
+        search_started = asyncio.Event()
+
+        async def slow_search(query, num_results):
+            search_started.set()
+            await asyncio.sleep(10)
+            return []
+
+        self.loop.planner.generate_initial_query = AsyncMock(return_value="query")
+        self.loop.executor.search = slow_search
+        section = {"title": "Sec 1", "description": "Desc 1", "status": "pending", "summary": "", "sources": []}
+
+        task = asyncio.create_task(self.loop._process_section(section))
+        await search_started.wait()
+        self.state.request_interrupt()
+
+        await asyncio.wait_for(task, timeout=1)
+        self.assertTrue(self.state.is_interrupted)
+        self.assertEqual(section['status'], 'completed')
+
 if __name__ == '__main__':
     unittest.main()
@@ -94,6 +94,17 @@ class TestKIDistiller(unittest.IsolatedAsyncioTestCase):
             saved_metadata = json.load(f)
             self.assertEqual(saved_metadata["title"], "Braces JSON")
 
+    async def test_json_cleanup_stops_at_first_object(self):
+        report = "Report content"
+        mock_response = "{\"title\": \"First JSON\", \"summary\": \"Tested\"}\nNote: fields follow {schema}."
+        self.mock_llm.generate_text = AsyncMock(return_value=mock_response)
+
+        ki_path = await self.distiller.distill_research(report, "English")
+
+        with open(os.path.join(ki_path, "metadata.json"), "r", encoding="utf-8") as f:
+            saved_metadata = json.load(f)
+            self.assertEqual(saved_metadata["title"], "First JSON")
+
     async def test_fallback_mechanism(self):
         report = "Report content"
         self.mock_llm.generate_text = AsyncMock(return_value="Invalid JSON content")
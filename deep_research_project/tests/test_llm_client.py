@@ -35,6 +35,64 @@ class TestLLMClientAsync(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(res, "Async response")
         self.client.llm.ainvoke.assert_called_once_with("Hello")
 
+    async def test_generate_text_memory_cache_dedupes_identical_prompts(self):
+        self.mock_config.ENABLE_CACHING = True
+        self.client.cache_manager.enabled = False  # isolate the in-process layer from disk
+        self.client.llm = AsyncMock()
+        self.client.llm.ainvoke.return_value = MagicMock(content="Shared response")
+
+        results = await asyncio.gather(*[self.client.generate_text("Same prompt") for _ in range(3)])
+        again = await self.client.generate_text("Same prompt")
+
+        self.assertEqual(results, ["Shared response"] * 3)
+        self.assertEqual(again, "Shared response")
+        self.client.llm.ainvoke.assert_called_once_with("Same prompt")
+
+    async def test_generate_text_cache_does_not_match_prompts_sharing_a_template(self):
+        from deep_research_project.core.prompts import RELEVANCE_SCORING_PROMPT_EN
+        self.mock_config.ENABLE_CACHING = True
+        self.client.cache_manager.enabled = False
+        self.client.llm = AsyncMock()
+        self.client.llm.ainvoke.side_effect = [MagicMock(content="0.9"), MagicMock(content="0.1")]
+        prompts = [
+            RELEVANCE_SCORING_PROMPT_EN.format(query="solar cell efficiency", title=title, snippet=snippet)
+            for title, snippet in (("Perovskite tandem cells", "Record efficiency for tandem solar cells"),
+                                   ("Best pizza in Naples", "A guide to the city's pizzerias"))
+        ]
+
+        results = [await self.client.generate_text(p) for p in prompts]
+
+        self.assertEqual(results, ["0.9", "0.1"])
+        self.assertEqual(self.client.llm.ainvoke.await_count, 2)
+
+    async def test_generate_text_stream_yields_chunks(self):
+        async def fake_astream(_input):
+            for part in ["Hel", "lo"]:
+                yield MagicMock(content=part)
+
+        self.client.llm = MagicMock()
+        self.client.llm.astream = fake_astream
+
+        chunks = [c async for c in self.client.generate_text_stream("Hello")]
+        self.assertEqual(chunks, ["Hel", "lo"])
+
+    async def test_generate_text_batch_preserves_order_and_dedupes(self):
+        self.client.llm = AsyncMock()
+        self.client.llm.ainvoke.side_effect = lambda prompt: MagicMock(content=f"re: {prompt}")
+
+        res = await self.client.generate_text_batch(["a", "b", "a"])
+
+        self.assertEqual(res, ["re: a", "re: b", "re: a"])
+        self.assertEqual(self.client.llm.ainvoke.call_count, 2)
+
+    def test_cache_key_separates_model_temperature_and_output_kind(self):
+        base = self.client._cache_key("prompt")
+        self.assertEqual(base, self.client._cache_key("prompt"))
+        self.assertNotEqual(base, self.client._cache_key("prompt", temperature=0.3))
+        self.assertNotEqual(base, self.client._cache_key("prompt", response_model=MockModel))
+        self.mock_config.LLM_MODEL = "gpt-4o"
+        self.assertNotEqual(base, self.client._cache_key("prompt"))
+
     async def test_generate_structured_async(self):
         # Mock with_structured_output and its result
         mock_structured_llm = AsyncMock()
@@ -49,6 +107,11 @@ class TestLLMClientAsync(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(res.value, 123)
         self.client.llm.with_structured_output.assert_called_once_with(MockModel)
 
+        # The bound runnable is reused for later calls with the same model
+        await self.client.generate_structured("Give me more JSON", MockModel)
+        self.client.llm.with_structured_output.assert_called_once_with(MockModel)
+        self.assertEqual(mock_structured_llm.ainvoke.await_count, 2)
+
     async def test_placeholder_simulation(self):
         self.mock_config.LLM_PROVIDER = "placeholder_llm"
         client = LLMClient(self.mock_config)
@@ -41,6 +41,28 @@ class TestLLMClientRateLimit(unittest.IsolatedAsyncioTestCase):
             self.assertGreaterEqual(duration, 1.0)
             self.assertLess(duration, 1.5) # Should not be too much more
 
+    async def test_concurrent_llm_calls_are_capped(self):
+        self.mock_config.LLM_RATE_LIMIT_RPM = 60000
+        self.mock_config.MAX_CONCURRENT_LLM_CALLS = 2
+        with patch('langchain_openai.ChatOpenAI'):
+            client = LLMClient(self.mock_config)
+            in_flight = 0
+            peak = 0
+
+            async def slow_ainvoke(prompt):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                return MagicMock(content="response")
+
+            client.llm = AsyncMock()
+            client.llm.ainvoke.side_effect = slow_ainvoke
+
+            await asyncio.gather(*[client.generate_text(f"p{i}") for i in range(5)])
+            self.assertEqual(peak, 2)
+
     async def test_rate_limit_disabled(self):
         self.mock_config.LLM_RATE_LIMIT_RPM = 0
         with patch('langchain_openai.ChatOpenAI'):
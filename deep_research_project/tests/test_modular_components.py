@@ -5,7 +5,7 @@ from deep_research_project.config.config import Configuration
 from deep_research_project.tools.llm_client import LLMClient
 from deep_research_project.tools.search_client import SearchClient
 from deep_research_project.tools.content_retriever import ContentRetriever
-from deep_research_project.core.state import SearchResult, ResearchPlanModel, Section, Source, KnowledgeGraphModel
+from deep_research_project.core.state import SearchResult, ResearchPlanModel, Section, Source, KnowledgeGraphModel, KnowledgeGraphBatchModel, KGNode, SummaryWithGraphModel
 
 # Modules to test
 from deep_research_project.core.planning import ResearchPlanner
@@ -44,6 +44,19 @@ class TestModularComponents(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(plan[0]["title"], "T1")
         self.assertEqual(plan[0]["status"], "pending")
 
+    async def test_planner_plan_carries_first_query(self):
+        planner = ResearchPlanner(self.config, self.mock_llm)
+        mock_model = ResearchPlanModel(
+            sections=[Section(title="T1", description="D1"), Section(title="T2", description="D2")],
+            first_query="**first query**"
+        )
+        self.mock_llm.generate_structured = AsyncMock(return_value=mock_model)
+
+        plan = await planner.generate_plan("Topic", "English")
+
+        self.assertEqual(plan[0]["initial_query"], "first query")
+        self.assertNotIn("initial_query", plan[1])
+
     async def test_planner_generate_plan_fallback(self):
         planner = ResearchPlanner(self.config, self.mock_llm)
         self.mock_llm.generate_structured = AsyncMock(side_effect=Exception("Failed"))
@@ -61,6 +74,56 @@ class TestModularComponents(unittest.IsolatedAsyncioTestCase):
         results = await executor.search("query", 5)
         self.assertEqual(results, mock_results)
 
+    async def test_executor_search_many_merges_by_link(self):
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        by_query = {
+            "q1": [SearchResult(title="A", link="a", snippet="short"), SearchResult(title="B", link="b", snippet="b")],
+            "q2": [SearchResult(title="A", link="a", snippet="a much longer snippet"), SearchResult(title="C", link="c", snippet="c")],
+        }
+
+        async def fake_search(query, num_results):
+            if query == "q3":
+                raise RuntimeError("search down")
+            return by_query[query]
+
+        self.mock_search.search = AsyncMock(side_effect=fake_search)
+
+        results = await executor.search_many(["q1", "q2", "q3"], 5)
+
+        self.assertEqual([r.link for r in results], ["a", "b", "c"])
+        self.assertEqual(results[0].snippet, "a much longer snippet")
+
+    async def test_executor_search_many_caps_concurrent_searches(self):
+        self.config.MAX_CONCURRENT_SEARCHES = 2
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        in_flight = peak = 0
+
+        async def fake_search(query, num_results):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [SearchResult(title=query, link=query, snippet="s")]
+
+        self.mock_search.search = AsyncMock(side_effect=fake_search)
+
+        results = await executor.search_many(["q1", "q2", "q3", "q4", "q5"], 5)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(peak, 2)
+
+    async def test_executor_search_drops_duplicate_links(self):
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        self.mock_search.search = AsyncMock(return_value=[
+            SearchResult(title="R1", link="L1", snippet="S1"),
+            SearchResult(title="R1 again", link="L1", snippet="S1b"),
+            SearchResult(title="R2", link="L2", snippet="S2"),
+        ])
+
+        results = await executor.search("query", 5)
+        self.assertEqual([r.title for r in results], ["R1", "R2"])
+
     async def test_executor_retrieve_and_summarize_parallel(self):
         executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
         results = [SearchResult(title="R1", link="L1", snippet="S1")]
@@ -74,6 +137,223 @@ class TestModularComponents(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(summary, "Final Combined Summary")
         self.assertIn("L1", fetched)
 
+    async def test_executor_fetches_urls_concurrently(self):
+        self.config.MAX_CONCURRENT_RETRIEVALS = 10
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+
+        async def slow_fetch(url):
+            await asyncio.sleep(0.2)
+            return f"Content of {url}"
+        self.mock_retriever.retrieve_and_extract = AsyncMock(side_effect=slow_fetch)
+        self.mock_llm.generate_text = AsyncMock(return_value="Summary")
+        results = [SearchResult(title=f"T{i}", link=f"http://u{i}", snippet="s") for i in range(5)]
+
+        start = asyncio.get_running_loop().time()
+        fetched = {}
+        await executor.retrieve_and_summarize(results, "query", "English", fetched)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        self.assertEqual(len(fetched), 5)
+        self.assertLess(elapsed, 0.6)
+
+    async def test_executor_retrieval_failure_falls_back_to_snippet(self):
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        results = [SearchResult(title="R1", link="L1", snippet="S1"),
+                   SearchResult(title="R1 dup", link="L1", snippet="S1"),
+                   SearchResult(title="R2", link="L2", snippet="S2")]
+        fetched = {}
+
+        async def retrieve(url):
+            if url == "L2":
+                raise RuntimeError("connection reset")
+            return "Extracted content from L1"
+
+        self.mock_retriever.retrieve_and_extract = AsyncMock(side_effect=retrieve)
+        self.mock_llm.generate_text = AsyncMock(return_value="Summary")
+
+        await executor.retrieve_and_summarize(results, "query", "English", fetched)
+
+        self.assertEqual(fetched, {"L1": "Extracted content from L1", "L2": "S2"})
+        self.assertEqual(self.mock_retriever.retrieve_and_extract.await_count, 2)
+        self.assertEqual(self.mock_llm.generate_text.await_count, 3)  # one chunk per URL + synthesis
+
+    async def test_executor_tiny_chunks_skip_llm(self):
+        self.config.MIN_CHUNK_SUMMARIZE_CHARS = 20
+        self.config.SUMMARIZATION_CHUNK_SIZE_CHARS = 1000
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        self.mock_llm.generate_text = AsyncMock(side_effect=["Summary long", "Final"])
+        results = [
+            SearchResult(title="Short", link="http://short", snippet="s"),
+            SearchResult(title="Long", link="http://long", snippet="s"),
+        ]
+        fetched = {"http://short": "  tiny text  ", "http://long": "x" * 50}
+
+        result = await executor.retrieve_and_summarize(results, "query", "English", fetched)
+
+        self.assertEqual(result, "Final")
+        self.assertEqual(self.mock_llm.generate_text.await_count, 2)
+        final_prompt = self.mock_llm.generate_text.call_args.kwargs["prompt"]
+        self.assertIn("tiny text", final_prompt)
+        self.assertIn("Summary long", final_prompt)
+
+    async def test_executor_batches_chunk_summaries(self):
+        self.config.CHUNK_SUMMARY_BATCH_SIZE = 2
+        self.config.SUMMARIZATION_CHUNK_SIZE_CHARS = 1000
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        results = [SearchResult(title=t, link=t, snippet="s") for t in ("A", "B", "C")]
+        fetched = {"A": "alpha text", "B": "beta text", "C": "gamma text"}
+
+        async def fake_generate(prompt, **kwargs):
+            if "SEGMENT 2" in prompt:
+                return '<SUMMARY id=1>sum alpha</SUMMARY>\n<SUMMARY id="2">sum beta</SUMMARY>'
+            if "SEGMENT 1" in prompt:
+                return "untagged reply"  # forces the per-chunk fallback
+            if "--- SEGMENT START ---" in prompt:
+                return "sum gamma"
+            return prompt  # final synthesis echoes its input
+
+        self.mock_llm.generate_text = AsyncMock(side_effect=fake_generate)
+
+        result = await executor.retrieve_and_summarize(results, "query", "English", fetched)
+
+        for summary in ("sum alpha", "sum beta", "sum gamma"):
+            self.assertIn(summary, result)
+        # Two batch calls, one fallback call for the untagged batch, one synthesis
+        self.assertEqual(self.mock_llm.generate_text.await_count, 4)
+
+    async def test_executor_packs_chunk_batches_by_token_budget(self):
+        self.config.CHUNK_SUMMARY_BATCH_MAX_TOKENS = 10
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        chunks_info = [("a" * 16, "u"), ("b" * 16, "u"), ("c" * 40, "u"), ("d" * 8, "u"), ("e" * 8, "u")]
+
+        with patch("deep_research_project.core.execution.estimate_tokens", side_effect=lambda t: len(t) // 4):
+            batches = executor._pack_chunk_batches([0, 1, 2, 3, 4], chunks_info, batch_size=3)
+
+        # 4 + 4 tokens fit; the oversized chunk stands alone; the batch size still caps the count
+        self.assertEqual(batches, [[0, 1], [2], [3, 4]])
+        self.config.CHUNK_SUMMARY_BATCH_MAX_TOKENS = 0
+        self.assertEqual(executor._pack_chunk_batches([0, 1, 2, 3, 4], chunks_info, 2), [[0, 1], [2, 3], [4]])
+
+    async def test_executor_skips_near_duplicate_chunks(self):
+        self.config.CHUNK_DEDUP_MAX_DISTANCE = 3
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        results = [SearchResult(title=t, link=t, snippet="s") for t in ("A", "B")]
+        self.mock_llm.generate_text = AsyncMock(return_value="summary")
+
+        await executor.retrieve_and_summarize(results, "query", "English", {"A": "mirrored text", "B": "mirrored text"})
+
+        chunk_prompts = [c.kwargs["prompt"] for c in self.mock_llm.generate_text.call_args_list
+                         if "--- SEGMENT START ---" in c.kwargs["prompt"]]
+        self.assertEqual(len(chunk_prompts), 1)
+
+    async def test_executor_chunk_calls_share_system_prompt(self):
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        results = [SearchResult(title=t, link=t, snippet="s") for t in ("A", "B")]
+        self.mock_llm.generate_text = AsyncMock(return_value="summary")
+
+        await executor.retrieve_and_summarize(results, "query", "English", {"A": "alpha text", "B": "beta text"})
+
+        chunk_calls = [c.kwargs for c in self.mock_llm.generate_text.call_args_list
+                       if "--- SEGMENT START ---" in c.kwargs["prompt"]]
+        self.assertEqual(len(chunk_calls), 2)
+        self.assertEqual(chunk_calls[0]["system_prompt"], chunk_calls[1]["system_prompt"])
+        self.assertIn("query", chunk_calls[0]["system_prompt"])
+        self.assertNotIn("alpha text", chunk_calls[0]["system_prompt"])
+
+    async def test_executor_synthesizes_summary_and_graph_in_one_call(self):
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        self.config.MIN_CHUNK_SUMMARIZE_CHARS = 1000  # chunks stand in as their own summaries
+        self.config.ENABLE_STREAMING = True  # the combined call takes precedence over streaming
+        results = [SearchResult(title="A", link="http://a", snippet="s")]
+        combined = SummaryWithGraphModel(
+            summary="combined summary",
+            nodes=[KGNode(id="n1", label="N1", type="Concept")], edges=[]
+        )
+        self.mock_llm.generate_structured = AsyncMock(return_value=combined)
+        self.mock_llm.generate_text = AsyncMock(return_value="plain summary")
+        graphs = []
+
+        result = await executor.retrieve_and_summarize(
+            results, "query", "English", {"http://a": "alpha"}, on_graph=graphs.append
+        )
+
+        self.assertEqual(result, "combined summary")
+        self.assertEqual([n.id for n in graphs[0].nodes], ["n1"])
+        self.assertIn("http://a", self.mock_llm.generate_structured.call_args.kwargs["prompt"])
+        self.mock_llm.generate_text.assert_not_awaited()
+
+        # A failed combined call falls back to the plain synthesis without a graph
+        self.config.ENABLE_STREAMING = False
+        self.mock_llm.generate_structured = AsyncMock(side_effect=ValueError("bad json"))
+        graphs.clear()
+        result = await executor.retrieve_and_summarize(
+            results, "query", "English", {"http://a": "alpha"}, on_graph=graphs.append
+        )
+        self.assertEqual(result, "plain summary")
+        self.assertEqual(graphs, [])
+
+    async def test_executor_skips_sources_beyond_token_budget(self):
+        self.config.MAX_SUMMARY_INPUT_TOKENS = 100
+        self.config.SUMMARIZATION_CHUNK_SIZE_CHARS = 10000
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        self.mock_llm.generate_text = AsyncMock(side_effect=lambda prompt, **kwargs: prompt)
+        results = [SearchResult(title=t, link=t, snippet="s") for t in ("best", "huge", "small")]
+        fetched = {"best": "best " * 50, "huge": "huge " * 500, "small": "small " * 10}
+
+        await executor.retrieve_and_summarize(results, "query", "English", fetched)
+
+        summarized = " ".join(c.kwargs["prompt"] for c in self.mock_llm.generate_text.call_args_list)
+        self.assertIn("best", summarized)
+        self.assertIn("small", summarized)
+        self.assertNotIn("huge", summarized)
+
+    async def test_executor_tree_reduces_many_chunk_summaries(self):
+        self.config.COMBINE_GROUP_SIZE = 2
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        results = [SearchResult(title=f"R{i}", link=f"L{i}", snippet=f"S{i}") for i in range(5)]
+        self.mock_retriever.retrieve_and_extract = AsyncMock(side_effect=lambda url: f"Content of {url}")
+        self.mock_llm.generate_text = AsyncMock(return_value="Summary")
+
+        summary = await executor.retrieve_and_summarize(results, "query", "English", {})
+
+        self.assertEqual(summary, "Summary")
+        # 5 chunk summaries -> 3 (2 group calls + passthrough) -> 2 (1 group call + passthrough) -> final synthesis
+        self.assertEqual(self.mock_llm.generate_text.await_count, 5 + 2 + 1 + 1)
+        final_prompt = self.mock_llm.generate_text.await_args_list[-1].kwargs["prompt"]
+        self.assertEqual(final_prompt.count("---\n\nSummary"), 1)
+
+    async def test_executor_streams_synthesis_with_partials(self):
+        self.config.ENABLE_STREAMING = True
+        self.config.STREAM_FLUSH_CHARS = 4
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        results = [SearchResult(title="R1", link="L1", snippet="S1")]
+
+        async def fake_stream(prompt, temperature=None):
+            for part in ["Final ", "Combined ", "Summary"]:
+                yield part
+
+        self.mock_retriever.retrieve_and_extract = AsyncMock(return_value="Extracted content from L1")
+        self.mock_llm.generate_text = AsyncMock(return_value="Summary of chunk")
+        self.mock_llm.generate_text_stream = fake_stream
+        partials = []
+
+        summary = await executor.retrieve_and_summarize(results, "query", "English", {}, on_partial=partials.append)
+
+        self.assertEqual(summary, "Final Combined Summary")
+        self.assertEqual(partials, ["Final ", "Final Combined ", "Final Combined Summary"])
+        self.mock_llm.generate_text.assert_awaited_once()  # only the chunk summary; synthesis was streamed
+
+    async def test_executor_batch_scoring_falls_back_to_batched_prompts(self):
+        executor = ResearchExecutor(self.config, self.mock_llm, self.mock_search, self.mock_retriever)
+        results = [SearchResult(title="R1", link="L1", snippet="S1"), SearchResult(title="R2", link="L2", snippet="S2")]
+        self.mock_llm.generate_structured = AsyncMock(side_effect=Exception("no structured output"))
+        self.mock_llm.generate_text_batch = AsyncMock(return_value=["0.9", "not a score"])
+
+        scores = await executor.score_relevance_batch("query", results, "English")
+
+        self.assertEqual(scores, [0.9, 0.5])
+        self.assertEqual(len(self.mock_llm.generate_text_batch.await_args.args[0]), 2)
+
     # --- ResearchReflector Tests ---
     async def test_reflector_merge_knowledge_graph(self):
         reflector = ResearchReflector(self.config, self.mock_llm)
@@ -109,6 +389,60 @@ class TestModularComponents(unittest.IsolatedAsyncioTestCase):
         # Check Edge addition
         self.assertEqual(len(existing_edges), 1)
 
+    async def test_reflector_concurrent_merges_are_serialized(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        existing_nodes, existing_edges = [], []
+        new_kg = KnowledgeGraphModel(
+            nodes=[{"id": "Node1", "label": "L", "type": "Concept", "properties": {}, "source_urls": []}],
+            edges=[]
+        )
+        self.mock_llm.generate_structured = AsyncMock(return_value=new_kg)
+
+        await asyncio.gather(*[
+            reflector.extract_knowledge_graph("Some text contents for extraction", [], "Sec1", "English",
+                                              existing_nodes, existing_edges)
+            for _ in range(5)
+        ])
+
+        self.assertEqual(len(existing_nodes), 1)
+        self.assertEqual(existing_nodes[0]["properties"]["mention_count"], "5")
+
+    async def test_reflector_batch_extraction_uses_one_call(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        existing_nodes, existing_edges = [], []
+        graphs = [
+            KnowledgeGraphModel(nodes=[{"id": f"N{i}", "label": "L", "type": "Concept", "properties": {}, "source_urls": []}], edges=[])
+            for i in range(3)
+        ]
+        self.mock_llm.generate_structured = AsyncMock(return_value=KnowledgeGraphBatchModel(graphs=graphs))
+        items = [(f"Summary text number {i} for extraction", [Source(title="T", link=f"http://s{i}")], f"Sec{i}")
+                 for i in range(3)]
+
+        await reflector.extract_knowledge_graph_batch(items, "English", existing_nodes, existing_edges)
+
+        self.mock_llm.generate_structured.assert_awaited_once()
+        prompt = self.mock_llm.generate_structured.call_args.kwargs["prompt"]
+        self.assertIn("--- TEXT 3 START (section: Sec2) ---", prompt)
+        self.assertIn("- http://s1", prompt)
+        self.assertEqual([n["id"] for n in existing_nodes], ["N0", "N1", "N2"])
+
+    async def test_reflector_batch_extraction_falls_back_per_text(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        existing_nodes, existing_edges = [], []
+        single = KnowledgeGraphModel(nodes=[{"id": "N", "label": "L", "type": "Concept", "properties": {}, "source_urls": []}], edges=[])
+
+        async def structured(prompt, response_model):
+            if response_model is KnowledgeGraphBatchModel:
+                raise ValueError("bad batch")
+            return single
+        self.mock_llm.generate_structured = AsyncMock(side_effect=structured)
+        items = [(f"Summary text number {i} for extraction", [], "Sec") for i in range(2)]
+
+        await reflector.extract_knowledge_graph_batch(items, "English", existing_nodes, existing_edges)
+
+        self.assertEqual(self.mock_llm.generate_structured.await_count, 3)
+        self.assertEqual(existing_nodes[0]["properties"]["mention_count"], "2")
+
     async def test_reflector_reflect_and_decide_parsing(self):
         reflector = ResearchReflector(self.config, self.mock_llm)
         self.mock_llm.generate_text = AsyncMock(side_effect=["EVALUATION: CONTINUE\nQUERY: Next specific query"])
@@ -118,6 +452,76 @@ class TestModularComponents(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(eval_res, "CONTINUE")
         self.assertEqual(next_q, "Next specific query")
 
+    async def test_reflector_parsing_tolerates_markdown_labels(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        self.mock_llm.generate_text = AsyncMock(return_value="Analysis...\n**Evaluation:** continue\n**QUERY:** deeper query")
+
+        eval_res, next_q = await reflector.reflect_and_decide("Topic", "Sec1", "Desc1", "Summary", "English")
+        self.assertEqual(eval_res, "CONTINUE")
+        self.assertEqual(next_q, "deeper query")
+
+    async def test_reflector_parsing_bold_none_query_concludes(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        self.mock_llm.generate_text = AsyncMock(return_value="EVALUATION: **CONCLUDE**\r\nQUERY: **None**\r\n")
+
+        eval_res, next_q = await reflector.reflect_and_decide("Topic", "Sec1", "Desc1", "Summary", "English")
+        self.assertEqual(eval_res, "CONCLUDE")
+        self.assertIsNone(next_q)
+
+    async def test_reflector_parsing_uses_last_label_in_any_order(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        self.mock_llm.generate_text = AsyncMock(
+            return_value="QUERY: first query\nEVALUATION: CONCLUDE\nQUERY: second query\nEVALUATION: CONTINUE"
+        )
+
+        eval_res, next_q = await reflector.reflect_and_decide("Topic", "Sec1", "Desc1", "Summary", "English")
+        self.assertEqual(eval_res, "CONTINUE")
+        self.assertEqual(next_q, "second query")
+
+    async def test_reflector_parsing_repeated_none_query_keeps_earlier_query(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        self.mock_llm.generate_text = AsyncMock(
+            return_value="EVALUATION: CONTINUE\nQUERY: draft query\nQUERY: None"
+        )
+
+        eval_res, next_q = await reflector.reflect_and_decide("Topic", "Sec1", "Desc1", "Summary", "English")
+        self.assertEqual(eval_res, "CONTINUE")
+        self.assertEqual(next_q, "draft query")
+
+    async def test_reflector_parsing_matches_indented_and_mid_line_labels(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        self.mock_llm.generate_text = AsyncMock(
+            return_value="Decision -> Evaluation: continue\n    1. Next QUERY: indented query"
+        )
+
+        eval_res, next_q = await reflector.reflect_and_decide("Topic", "Sec1", "Desc1", "Summary", "English")
+        self.assertEqual(eval_res, "CONTINUE")
+        self.assertEqual(next_q, "indented query")
+
+    async def test_reflector_returns_alternative_queries_when_allowed(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        self.mock_llm.generate_text = AsyncMock(
+            return_value="EVALUATION: CONTINUE\nQUERY: first angle\nQUERY: other angle\nQUERY: first angle\nQUERY: main query"
+        )
+
+        result = await reflector.reflect("Topic", "Sec1", "Desc1", "Summary", "English", max_queries=2)
+
+        self.assertEqual(result["query"], "main query")
+        self.assertEqual(result["queries"], ["main query", "first angle"])
+        self.assertIn("up to 1 alternative", self.mock_llm.generate_text.call_args.kwargs["prompt"])
+
+    async def test_reflector_instructions_are_a_shared_system_prompt(self):
+        reflector = ResearchReflector(self.config, self.mock_llm)
+        self.mock_llm.generate_text = AsyncMock(return_value="EVALUATION: CONCLUDE\nQUERY: None")
+
+        await reflector.reflect_and_decide("Topic", "Sec1", "Desc1", "Summary A", "English")
+        await reflector.reflect_and_decide("Topic", "Sec2", "Desc2", "Summary B", "English")
+
+        first, second = (c.kwargs for c in self.mock_llm.generate_text.call_args_list)
+        self.assertEqual(first["system_prompt"], second["system_prompt"])
+        self.assertNotIn("Summary A", first["system_prompt"])
+        self.assertIn("Summary A", first["prompt"])
+
     # --- ResearchReporter Tests ---
     async def test_reporter_finalize_report_citations(self):
         reporter = ResearchReporter(self.mock_llm)
@@ -43,6 +43,17 @@ class TestResearchPlanner(unittest.IsolatedAsyncioTestCase):
         # Should be sanitized (no bold, only first line)
         self.assertEqual(query, "Bold Query")
 
+    async def test_initial_query_guidelines_are_a_shared_system_prompt(self):
+        self.mock_llm.generate_text = AsyncMock(return_value="query")
+
+        await self.planner.generate_initial_query("Topic", "Section A", "Desc A", "Japanese")
+        await self.planner.generate_initial_query("Topic", "Section B", "Desc B", "Japanese")
+
+        first, second = (c.kwargs for c in self.mock_llm.generate_text.call_args_list)
+        self.assertEqual(first["system_prompt"], second["system_prompt"])
+        self.assertNotIn("Section A", first["system_prompt"])
+        self.assertIn("Section A", first["prompt"])
+
     async def test_regenerate_query_sanitization(self):
         self.mock_llm.generate_text = AsyncMock(return_value="`Code Query`\nMore lines")
 
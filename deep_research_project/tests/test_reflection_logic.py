@@ -134,5 +134,34 @@ class TestReflectionLogic(unittest.TestCase):
         self.assertEqual(existing_nodes[0]["properties"]["p"], "v")
         self.assertEqual(existing_edges[0]["properties"]["ep"], "ev")
 
+    def test_repeated_merges_index_only_new_entries(self):
+        existing_nodes = []
+        existing_edges = []
+        kg = KnowledgeGraphModel(
+            nodes=[KGNode(id="A", label="A", type="T", properties={}, source_urls=["u1"])],
+            edges=[KGEdge(source="A", target="B", label="rel", properties={}, source_urls=["u1"])]
+        )
+        self.reflector._merge_knowledge_graph(kg, existing_nodes, existing_edges)
+        self.reflector._merge_knowledge_graph(kg, existing_nodes, existing_edges)
+        self.assertEqual(len(existing_nodes), 1)
+        self.assertEqual(len(existing_edges), 1)
+        self.assertEqual(existing_nodes[0]["properties"]["mention_count"], "2")
+
+        # Entries appended by the caller between merges are still deduplicated
+        existing_nodes.append({"id": "C", "label": "C", "type": "T", "properties": {}, "source_urls": []})
+        kg_c = KnowledgeGraphModel(
+            nodes=[KGNode(id="C", label="C", type="T", properties={}, source_urls=["u2"])],
+            edges=[]
+        )
+        self.reflector._merge_knowledge_graph(kg_c, existing_nodes, existing_edges)
+        self.assertEqual(len(existing_nodes), 2)
+        self.assertEqual(existing_nodes[1]["source_urls"], ["u2"])
+
+        # A fresh list is indexed from scratch
+        other_nodes = []
+        self.reflector._merge_knowledge_graph(kg, other_nodes, [])
+        self.assertEqual(len(other_nodes), 1)
+        self.assertEqual(other_nodes[0]["properties"]["mention_count"], "1")
+
 if __name__ == "__main__":
     unittest.main()
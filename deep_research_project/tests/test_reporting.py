@@ -11,6 +11,8 @@ class TestResearchReporter(unittest.IsolatedAsyncioTestCase):
         self.mock_llm_client.config = MagicMock()
         # Set a small limit for truncation tests
         self.mock_llm_client.config.MAX_FINAL_REPORT_CONTEXT_CHARS = 100
+        self.mock_llm_client.config.MIN_TOKENS_FOR_SYNTHESIS = 0
+        self.mock_llm_client.config.FINAL_REPORT_MAX_TOKENS = 0
         self.reporter = ResearchReporter(self.mock_llm_client)
 
     async def test_finalize_report_english_happy_path(self):
@@ -144,5 +146,63 @@ class TestResearchReporter(unittest.IsolatedAsyncioTestCase):
         # full_context should be empty string
         self.assertIn("--- CONTEXT START ---\n\n--- CONTEXT END ---", prompt)
 
+    async def test_finalize_report_streams_when_on_partial_given(self):
+        self.mock_llm_client.config.STREAM_FLUSH_CHARS = 5
+
+        async def fake_stream(prompt, **kwargs):
+            for piece in ("Streamed ", "report ", "body."):
+                yield piece
+
+        self.mock_llm_client.generate_text_stream = fake_stream
+        self.mock_llm_client.generate_text = AsyncMock()
+        self.mock_llm_client.generate_structured = AsyncMock(return_value=VisualSummaryModel(nodes=[], edges=[]))
+        partials = []
+
+        report = await self.reporter.finalize_report("Topic", ["Finding"], [], "English", on_partial=partials.append)
+
+        self.assertIn("Streamed report body.", report)
+        self.assertEqual(partials, ["Streamed ", "Streamed report ", "Streamed report body."])
+        self.mock_llm_client.generate_text.assert_not_awaited()
+
+    async def test_finalize_report_stops_stream_at_token_budget(self):
+        self.mock_llm_client.config.FINAL_REPORT_MAX_TOKENS = 3
+        closed = []
+
+        async def fake_stream(prompt, **kwargs):
+            try:
+                for piece in ("one ", "two ", "three ", "four ", "five "):
+                    yield piece
+            finally:
+                closed.append(True)
+
+        self.mock_llm_client.generate_text_stream = fake_stream
+        self.mock_llm_client.generate_text = AsyncMock()
+        self.mock_llm_client.generate_structured = AsyncMock(return_value=VisualSummaryModel(nodes=[], edges=[]))
+
+        with patch("deep_research_project.core.reporting.estimate_tokens", return_value=1):
+            report = await self.reporter.finalize_report("Topic", ["Finding"], [], "English")
+
+        self.assertTrue(report.startswith("one two three"))
+        self.assertNotIn("four", report)
+        self.assertEqual(closed, [True])
+        self.mock_llm_client.generate_text.assert_not_awaited()
+
+    async def test_finalize_report_skips_synthesis_for_single_short_section(self):
+        self.mock_llm_client.config.MIN_TOKENS_FOR_SYNTHESIS = 500
+        self.mock_llm_client.generate_text = AsyncMock()
+        self.mock_llm_client.generate_structured = AsyncMock(return_value=VisualSummaryModel(nodes=[], edges=[]))
+
+        report = await self.reporter.finalize_report(
+            "Topic", ["  Short finding [1].  "], [{"title": "S", "link": "http://s"}], "English")
+
+        self.assertTrue(report.startswith("# Topic\n\nShort finding [1]."))
+        self.assertIn("[1] S (http://s)", report)
+        self.mock_llm_client.generate_text.assert_not_awaited()
+
+        # Several sections still need the LLM to merge them
+        self.mock_llm_client.generate_text = AsyncMock(return_value="Merged report")
+        report = await self.reporter.finalize_report("Topic", ["A", "B"], [], "English")
+        self.assertIn("Merged report", report)
+
 if __name__ == "__main__":
     unittest.main()
@@ -56,7 +56,7 @@ class TestResearchLoopParallel(unittest.IsolatedAsyncioTestCase):
         # Reset and try with 4 chunks
         call_count = 0
         selected = [
-            SearchResult(title="T1", link="L1", snippet="1234567890123456789012345678901234567890") # 4 chunks
+            SearchResult(title="T2", link="L2", snippet="1234567890123456789012345678901234567890") # 4 chunks (new link; L1 is already fetched)
         ]
         start_time = asyncio.get_event_loop().time()
         await self.loop._summarize_sources(selected)
@@ -95,5 +95,181 @@ class TestResearchLoopParallel(unittest.IsolatedAsyncioTestCase):
         self.assertGreaterEqual(duration, 0.5)
         self.assertLess(duration, 0.8)
 
+    async def test_failed_section_does_not_abort_others(self):
+        self.config.INTERACTIVE_MODE = False
+        self.loop.interactive_mode = False
+        self.state.research_plan = [
+            {"title": "Good", "description": "", "status": "pending", "summary": "", "sources": []},
+            {"title": "Bad", "description": "", "status": "pending", "summary": "", "sources": []},
+        ]
+
+        original = self.loop._process_section
+        async def flaky_process_section(section, callback_override=None):
+            if section['title'] == "Bad":
+                raise RuntimeError("boom")
+            return await original(section, callback_override)
+
+        self.loop._process_section = flaky_process_section
+        self.loop.executor.search = AsyncMock(return_value=[])
+        self.loop._finalize_summary = AsyncMock()
+
+        await self.loop.run_loop()
+
+        self.assertEqual(self.state.research_plan[0]['status'], 'completed')
+        self.assertEqual(self.state.research_plan[1]['status'], 'pending')
+        self.loop._finalize_summary.assert_awaited_once()
+
+    async def test_progress_callback_does_not_block_section(self):
+        self.config.MAX_RESEARCH_LOOPS = 2
+        events = []
+
+        async def mock_search(query, num_results):
+            events.append(f"search:{query}")
+            return [SearchResult(title="T", link=f"L-{query}", snippet="S")]
+
+        async def slow_callback(msg):
+            if "Continuing with new query" in msg:
+                events.append("callback:start")
+                await asyncio.sleep(0.05)
+                events.append("callback:end")
+
+        self.loop.planner.generate_initial_query = AsyncMock(return_value="q1")
+        self.loop.executor.search = mock_search
+        self.loop.executor.filter_by_relevance = AsyncMock(side_effect=lambda q, results, lang: results)
+        self.loop.executor.retrieve_and_summarize = AsyncMock(return_value="Summary")
+        self.loop.reflector.reflect = AsyncMock(side_effect=[
+            {"evaluation": "CONTINUE", "query": "q2"},
+            {"evaluation": "CONCLUDE", "query": None},
+        ])
+        section = {"title": "Sec", "description": "", "status": "pending", "summary": "", "sources": []}
+
+        await self.loop._process_section(section, callback_override=slow_callback)
+
+        # Progress is delivered in the background: the section finished without waiting on the slow callback
+        self.assertEqual(section['status'], 'completed')
+        self.assertNotIn("callback:end", events)
+
+        await self.loop._drain_progress()
+        self.assertEqual(events[0], "search:q1")
+        self.assertLess(events.index("search:q2"), events.index("callback:end"))
+        self.assertEqual(events.count("callback:end"), 1)
+
+    async def test_initial_queries_generated_before_sections(self):
+        self.loop.interactive_mode = True
+        self.state.plan_approved = True
+        self.state.research_plan = [
+            {"title": "A", "description": "", "status": "pending", "summary": "", "sources": []},
+            {"title": "B", "description": "", "status": "pending", "summary": "", "sources": []},
+        ]
+        events = []
+
+        async def mock_initial_query(topic, section_title, **kwargs):
+            events.append(f"query:{section_title}")
+            return f"q-{section_title}"
+
+        async def mock_search(query, num_results):
+            await asyncio.sleep(0.05)
+            events.append(f"search:{query}")
+            return []
+
+        self.loop.planner.generate_initial_query = AsyncMock(side_effect=mock_initial_query)
+        self.loop.executor.search = mock_search
+        self.loop.executor.filter_by_relevance = AsyncMock(return_value=[])
+        self.loop._finalize_summary = AsyncMock()
+
+        await self.loop.run_loop()
+
+        # All initial queries are generated up front, once each, and consumed by the sections
+        self.assertEqual(events, ["query:A", "query:B", "search:q-A", "search:q-B"])
+        self.assertEqual(self.loop.planner.generate_initial_query.await_count, 2)
+        self.assertEqual([s['initial_query'] for s in self.state.research_plan], ["q-A", "q-B"])
+        self.assertTrue(all(s['status'] == 'completed' for s in self.state.research_plan))
+
+    async def test_section_uses_precomputed_initial_query(self):
+        self.loop.planner.generate_initial_query = AsyncMock(return_value="generated")
+        self.loop.executor.search = AsyncMock(return_value=[])
+        self.loop.executor.filter_by_relevance = AsyncMock(return_value=[])
+        section = {"title": "Sec", "description": "", "status": "pending", "summary": "", "sources": [],
+                   "initial_query": "from plan"}
+
+        await self.loop._process_section(section)
+
+        self.loop.planner.generate_initial_query.assert_not_awaited()
+        self.loop.executor.search.assert_awaited_once_with("from plan", self.config.MAX_SEARCH_RESULTS_PER_QUERY)
+
+    async def test_section_sources_dedup_across_loops(self):
+        self.config.MAX_RESEARCH_LOOPS = 2
+        hit = SearchResult(title="A", link="http://a", snippet="a")
+        self.loop.executor.search = AsyncMock(side_effect=[
+            [hit], [hit, SearchResult(title="B", link="http://b", snippet="b")]
+        ])
+        self.loop.executor.filter_by_relevance = AsyncMock(side_effect=lambda q, results, lang: results)
+        self.loop.executor.retrieve_and_summarize = AsyncMock(side_effect=["summary a", "summary b"])
+        self.loop.reflector.reflect = AsyncMock(return_value={"evaluation": "CONTINUE", "query": "next"})
+        section = {"title": "Sec", "description": "", "status": "pending", "summary": "", "sources": [],
+                   "initial_query": "q"}
+
+        await self.loop._process_section(section)
+
+        self.assertEqual([s["link"] for s in section["sources"]], ["http://a", "http://b"])
+        # Only the first loop reflects; the final loop's verdict could not change anything
+        self.loop.reflector.reflect.assert_awaited_once()
+        # The second loop only scores and summarizes the page it has not seen yet
+        second_batch = self.loop.executor.retrieve_and_summarize.call_args_list[1].args[0]
+        self.assertEqual([r.link for r in second_batch], ["http://b"])
+
+    async def test_stalled_loop_concludes_without_reflection(self):
+        self.config.MAX_RESEARCH_LOOPS = 3
+        self.loop.executor.search = AsyncMock(side_effect=[
+            [SearchResult(title="A", link="http://a", snippet="a")],
+            [SearchResult(title="B", link="http://b", snippet="b")],
+        ])
+        self.loop.executor.filter_by_relevance = AsyncMock(side_effect=lambda q, results, lang: results)
+        self.loop.executor.retrieve_and_summarize = AsyncMock(side_effect=[
+            "summary a", "Could not retrieve any content to summarize."
+        ])
+        self.loop.reflector.reflect = AsyncMock(return_value={"evaluation": "CONTINUE", "query": "next"})
+        section = {"title": "Sec", "description": "", "status": "pending", "summary": "", "sources": [],
+                   "initial_query": "q"}
+
+        await self.loop._process_section(section)
+
+        # The second loop found nothing, so it neither reflects nor searches a third time
+        self.loop.reflector.reflect.assert_awaited_once()
+        self.assertEqual(self.loop.executor.search.await_count, 2)
+        self.assertEqual(section["summary"], "summary a")
+        self.assertEqual([s["link"] for s in section["sources"]], ["http://a"])
+
+    async def test_progress_messages_keep_order_and_drain(self):
+        received = []
+
+        async def slow_callback(msg):
+            await asyncio.sleep(0.01)
+            received.append(msg)
+
+        for i in range(5):
+            self.loop._emit(slow_callback, f"m{i}")
+        self.assertEqual(received, [])
+
+        await self.loop._drain_progress()
+        self.assertEqual(received, [f"m{i}" for i in range(5)])
+        self.assertIsNone(self.loop._progress_worker)
+
+    async def test_failed_finalization_stops_progress_worker(self):
+        self.loop.progress_callback = AsyncMock()
+        self.loop.interactive_mode = False
+        self.state.research_plan = [{"title": "Sec", "description": "", "status": "completed",
+                                     "summary": "s", "sources": []}]
+
+        async def failing_finalize():
+            self.loop._emit(self.loop.progress_callback, "queued during finalization")
+            raise RuntimeError("report failed")
+
+        self.loop._finalize_summary = failing_finalize
+        with self.assertRaises(RuntimeError):
+            await self.loop.run_loop()
+
+        self.assertIsNone(self.loop._progress_worker)
+
 if __name__ == '__main__':
     unittest.main()
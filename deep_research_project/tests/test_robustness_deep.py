@@ -51,6 +51,20 @@ class TestRobustnessDeep(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(result.edges), 0)
         print("Test Robust Extract (Total Garbage): Success")
 
+    def test_robust_extract_ignores_braces_in_surrounding_prose(self):
+        text = (
+            'Here is the graph {as requested}:\n'
+            '{"nodes": [{"id": "n1", "label": "A", "type": "Concept"}], "edges": []}\n'
+            'Note: ids like {n1} are unique.'
+        )
+        result = self.client._robust_json_extract(text, KnowledgeGraphModel)
+        self.assertEqual([n.id for n in result.nodes], ["n1"])
+
+    def test_robust_extract_whole_json_response(self):
+        text = '  {"nodes": [{"id": "n1", "label": "A", "type": "Concept"}], "edges": []}\n'
+        result = self.client._robust_json_extract(text, KnowledgeGraphModel)
+        self.assertEqual([n.id for n in result.nodes], ["n1"])
+
     def test_state_source_consistency(self):
         # Verify that Source objects (Pydantic) work well inside TypedDict structures in state
         from deep_research_project.core.state import ResearchState, Source
@@ -1,5 +1,6 @@
 import unittest
 import asyncio
+import tempfile
 from unittest.mock import patch, MagicMock
 
 from deep_research_project.config.config import Configuration
@@ -22,7 +23,7 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
     async def test_init_duckduckgo_success(self):
         self.mock_config.SEARCH_API = "duckduckgo"
-        with patch('deep_research_project.tools.search_client.DuckDuckGoSearchAPIWrapper') as MockDDG:
+        with patch('langchain_community.utilities.duckduckgo_search.DuckDuckGoSearchAPIWrapper') as MockDDG:
             client = SearchClient(self.mock_config)
             MockDDG.assert_called_once()
             # Verify that search_tool is set
@@ -30,14 +31,14 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
     async def test_init_duckduckgo_failure(self):
         self.mock_config.SEARCH_API = "duckduckgo"
-        with patch('deep_research_project.tools.search_client.DuckDuckGoSearchAPIWrapper', side_effect=Exception("DDG Error")):
+        with patch('langchain_community.utilities.duckduckgo_search.DuckDuckGoSearchAPIWrapper', side_effect=Exception("DDG Error")):
             with self.assertRaises(ValueError) as context:
                 SearchClient(self.mock_config)
             self.assertIn("Failed to initialize DuckDuckGo client", str(context.exception))
 
     async def test_init_searxng_success(self):
         self.mock_config.SEARCH_API = "searxng"
-        with patch('deep_research_project.tools.search_client.SearxSearchWrapper') as MockSearx:
+        with patch('langchain_community.utilities.SearxSearchWrapper') as MockSearx:
             client = SearchClient(self.mock_config)
             MockSearx.assert_called_once()
             _, kwargs = MockSearx.call_args
@@ -46,7 +47,7 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
     async def test_init_searxng_failure(self):
         self.mock_config.SEARCH_API = "searxng"
-        with patch('deep_research_project.tools.search_client.SearxSearchWrapper', side_effect=Exception("Searx Error")):
+        with patch('langchain_community.utilities.SearxSearchWrapper', side_effect=Exception("Searx Error")):
             with self.assertRaises(ValueError) as context:
                 SearchClient(self.mock_config)
             self.assertIn("Failed to initialize Searxng client", str(context.exception))
@@ -59,7 +60,7 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
     async def test_search_duckduckgo(self):
         self.mock_config.SEARCH_API = "duckduckgo"
-        with patch('deep_research_project.tools.search_client.DuckDuckGoSearchAPIWrapper') as MockDDG:
+        with patch('langchain_community.utilities.duckduckgo_search.DuckDuckGoSearchAPIWrapper') as MockDDG:
             mock_tool = MockDDG.return_value
             mock_tool.results.return_value = [
                 {"title": "Test Title", "link": "http://test.com", "snippet": "Test Snippet"}
@@ -76,7 +77,7 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
     async def test_search_searxng(self):
         self.mock_config.SEARCH_API = "searxng"
-        with patch('deep_research_project.tools.search_client.SearxSearchWrapper') as MockSearx:
+        with patch('langchain_community.utilities.SearxSearchWrapper') as MockSearx:
             mock_tool = MockSearx.return_value
             mock_tool.results.return_value = [
                 {"title": "Searx Title", "link": "http://searx.com", "snippet": "Searx Snippet"}
@@ -91,7 +92,7 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
     async def test_search_searxng_fallback(self):
         self.mock_config.SEARCH_API = "searxng"
-        with patch('deep_research_project.tools.search_client.SearxSearchWrapper') as MockSearx:
+        with patch('langchain_community.utilities.SearxSearchWrapper') as MockSearx:
             mock_tool = MockSearx.return_value
 
             # Simulate TypeError on first call, success on second
@@ -122,7 +123,7 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
     async def test_search_error_handling(self):
         self.mock_config.SEARCH_API = "duckduckgo"
-        with patch('deep_research_project.tools.search_client.DuckDuckGoSearchAPIWrapper') as MockDDG:
+        with patch('langchain_community.utilities.duckduckgo_search.DuckDuckGoSearchAPIWrapper') as MockDDG:
             mock_tool = MockDDG.return_value
             mock_tool.results.side_effect = Exception("Search failed")
 
@@ -131,5 +132,22 @@ class TestSearchClient(unittest.IsolatedAsyncioTestCase):
 
             self.assertEqual(results, [])
 
+    async def test_search_results_cached_on_disk(self):
+        self.mock_config.SEARCH_API = "duckduckgo"
+        self.mock_config.SEARCH_CACHE_TTL_SECONDS = 60
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch('langchain_community.utilities.duckduckgo_search.DuckDuckGoSearchAPIWrapper') as MockDDG:
+            self.mock_config.CACHE_DIR = cache_dir
+            mock_tool = MockDDG.return_value
+            mock_tool.results.return_value = [
+                {"title": "Test Title", "link": "http://test.com", "snippet": "Test Snippet"}
+            ]
+
+            await SearchClient(self.mock_config).search("cached query", num_results=2)
+            results = await SearchClient(self.mock_config).search("cached query", num_results=2)
+
+            self.assertEqual(results[0].link, "http://test.com")
+            mock_tool.results.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,11 +4,74 @@ import hashlib
 import aiofiles
 import logging
 import time
+from collections import OrderedDict
 from typing import Optional, Any
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json writes the same files
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any, default=None) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(obj, ensure_ascii=False, default=default).encode("utf-8")
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class MemoryCache:
+    """Small in-process LRU cache with a per-entry TTL, used as an L1 in front of the disk cache."""
+    def __init__(self, max_entries: int = 100, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class LRUDict(OrderedDict):
+    """Dict holding at most `max_entries` items; reads refresh an entry and the least recently used is evicted (0 = unbounded)."""
+    def __init__(self, max_entries: int = 0):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if self.max_entries > 0:
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+
 class CacheManager:
     def __init__(self, cache_dir: str = ".cache", enabled: bool = True):
         self.cache_dir = Path(cache_dir)
@@ -17,6 +80,7 @@ class CacheManager:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
             (self.cache_dir / "llm").mkdir(exist_ok=True)
             (self.cache_dir / "content").mkdir(exist_ok=True)
+            (self.cache_dir / "search").mkdir(exist_ok=True)
 
     def _get_hash(self, key: str) -> str:
         return hashlib.md5(key.encode("utf-8")).hexdigest()
@@ -28,8 +92,8 @@ class CacheManager:
         cache_file = self.cache_dir / "llm" / f"{self._get_hash(prompt)}.json"
         if cache_file.exists():
             try:
-                async with aiofiles.open(cache_file, mode="r", encoding="utf-8") as f:
-                    data = json.loads(await f.read())
+                async with aiofiles.open(cache_file, mode="rb") as f:
+                    data = _loads(await f.read())
                     timestamp = data.get("timestamp", 0)
                     # 12 hours TTL = 43200 seconds
                     if time.time() - timestamp < 43200:
@@ -46,36 +110,80 @@ class CacheManager:
         
         cache_file = self.cache_dir / "llm" / f"{self._get_hash(prompt)}.json"
         try:
-            async with aiofiles.open(cache_file, mode="w", encoding="utf-8") as f:
-                await f.write(json.dumps({
+            async with aiofiles.open(cache_file, mode="wb") as f:
+                await f.write(_dumps({
                     "prompt": prompt, 
                     "response": response,
                     "timestamp": time.time()
-                }, ensure_ascii=False))
+                }))
         except Exception as e:
             logger.warning(f"Failed to write LLM cache: {e}")
 
-    async def get_content_cache(self, url: str) -> Optional[str]:
+    async def get_content_cache(self, url: str, ttl_seconds: Optional[float] = None) -> Optional[str]:
+        entry = await self.get_content_cache_entry(url)
+        if entry is None:
+            return None
+        if ttl_seconds is not None and time.time() - entry.get("timestamp", 0) >= ttl_seconds:
+            logger.debug("Content cache expired.")
+            return None
+        return entry.get("content")
+
+    async def get_content_cache_entry(self, url: str) -> Optional[dict]:
+        """Returns the stored entry (content, timestamp, HTTP validators) regardless of age."""
         if not self.enabled:
             return None
         
         cache_file = self.cache_dir / "content" / f"{self._get_hash(url)}.json"
         if cache_file.exists():
             try:
-                async with aiofiles.open(cache_file, mode="r", encoding="utf-8") as f:
-                    data = json.loads(await f.read())
-                    return data.get("content")
+                async with aiofiles.open(cache_file, mode="rb") as f:
+                    return _loads(await f.read())
             except Exception as e:
                 logger.warning(f"Failed to read content cache: {e}")
         return None
 
-    async def set_content_cache(self, url: str, content: str):
+    async def set_content_cache(self, url: str, content: str, validators: Optional[dict] = None):
+        """Stores extracted content; validators (etag/last_modified) allow conditional revalidation once it expires."""
         if not self.enabled:
             return
         
         cache_file = self.cache_dir / "content" / f"{self._get_hash(url)}.json"
         try:
-            async with aiofiles.open(cache_file, mode="w", encoding="utf-8") as f:
-                await f.write(json.dumps({"url": url, "content": content}, ensure_ascii=False))
+            async with aiofiles.open(cache_file, mode="wb") as f:
+                await f.write(_dumps({
+                    "url": url, "content": content, "validators": validators or {}, "timestamp": time.time()
+                }))
         except Exception as e:
             logger.warning(f"Failed to write content cache: {e}")
+
+    async def get_search_cache(self, key: str, ttl_seconds: float) -> Optional[list]:
+        if not self.enabled:
+            return None
+
+        cache_file = self.cache_dir / "search" / f"{self._get_hash(key)}.json"
+        if cache_file.exists():
+            try:
+                async with aiofiles.open(cache_file, mode="rb") as f:
+                    data = _loads(await f.read())
+                    if time.time() - data.get("timestamp", 0) < ttl_seconds:
+                        return data.get("results")
+                    else:
+                        logger.debug("Search cache expired.")
+            except Exception as e:
+                logger.warning(f"Failed to read search cache: {e}")
+        return None
+
+    async def set_search_cache(self, key: str, results: list):
+        if not self.enabled:
+            return
+
+        cache_file = self.cache_dir / "search" / f"{self._get_hash(key)}.json"
+        try:
+            async with aiofiles.open(cache_file, mode="wb") as f:
+                await f.write(_dumps({
+                    "key": key,
+                    "results": results,
+                    "timestamp": time.time()
+                }))
+        except Exception as e:
+            logger.warning(f"Failed to write search cache: {e}")
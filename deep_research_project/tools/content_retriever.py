@@ -3,16 +3,20 @@ import ipaddress
 import logging
 import io
 import asyncio
+import time
 import httpx
 from bs4 import BeautifulSoup
-from pypdf import PdfReader
 from urllib.parse import urlparse, urljoin
 from deep_research_project.config.config import Configuration
-from typing import Optional, Callable
+from collections import OrderedDict
+from typing import Optional, Callable, Dict, Set, Tuple
 from deep_research_project.tools.cache_manager import CacheManager
 
 logger = logging.getLogger(__name__)
 
+# Raw HTML chars kept per wanted text char when extraction is capped; the rest is markup headroom
+_HTML_MARKUP_HEADROOM = 20
+
 class ContentRetriever:
     def __init__(self, config: Configuration, user_agent=None, progress_callback: Optional[Callable[[str], None]] = None):
         self.config = config
@@ -22,33 +26,115 @@ class ContentRetriever:
         cache_dir = getattr(self.config, "CACHE_DIR", ".cache")
         enable_caching = getattr(self.config, "ENABLE_CACHING", True)
         self.cache_manager = CacheManager(cache_dir=cache_dir, enabled=enable_caching)
+        # Keep-alive clients per hostname, least recently used first; bounded by MAX_POOLED_HOSTS
+        self._clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict()
+        self._clients_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_use: Dict[httpx.AsyncClient, int] = {}
+        self._retired: Set[httpx.AsyncClient] = set()  # evicted while in use; closed on release
 
-    def extract_text(self, html_content: str, url: str = "") -> str:
-        """Extracts and cleans text content from HTML using BeautifulSoup."""
-        if not html_content:
-            return ""
+    async def _acquire_client(self, hostname: str) -> httpx.AsyncClient:
+        """
+        Returns a keep-alive client for the hostname, created on first use.
+        Pools are per hostname: requests are pinned to the resolved IP, so a pooled TLS
+        connection must never be reused for a different SNI name on the same address.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._clients_loop:
+            # Connections belong to the loop that opened them; a new loop (e.g. another run_async) starts a new pool
+            self._clients, self._in_use, self._retired = OrderedDict(), {}, set()
+            self._clients_loop = loop
+
+        client = self._clients.get(hostname)
+        if client is not None:
+            self._clients.move_to_end(hostname)
+        else:
+            client = httpx.AsyncClient(
+                headers=self.headers, follow_redirects=False,
+                limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60)
+            )
+            self._clients[hostname] = client
+            max_hosts = max(1, getattr(self.config, "MAX_POOLED_HOSTS", 32))
+            while len(self._clients) > max_hosts:
+                _host, evicted = self._clients.popitem(last=False)
+                if evicted in self._in_use:
+                    self._retired.add(evicted)
+                else:
+                    await self._close_client(evicted)
+        self._in_use[client] = self._in_use.get(client, 0) + 1
+        return client
+
+    async def _release_client(self, client: httpx.AsyncClient):
+        remaining = self._in_use.get(client, 0) - 1
+        if remaining > 0:
+            self._in_use[client] = remaining
+            return
+        self._in_use.pop(client, None)
+        if client in self._retired:
+            self._retired.discard(client)
+            await self._close_client(client)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient):
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
-            # Remove scripts, styles, and common boilerplate containers
-            for element in soup(["script", "style", "header", "footer", "nav", "aside", "form", "iframe", "noscript"]):
-                element.decompose()
-
-            # Extract text with linebreaks to preserve some structure
-            text = soup.get_text(separator='\n', strip=True)
-            
-            # Clean up excessive newlines/spaces
-            cleaned_lines = []
-            for line in text.splitlines():
+            await client.aclose()
+        except Exception as e:
+            logger.debug("Error closing HTTP client: %s", e)
+
+    async def aclose(self):
+        """Closes all pooled connections; the retriever can still be used afterwards with fresh clients."""
+        clients = [*self._clients.values(), *self._retired]
+        self._clients, self._in_use, self._retired = OrderedDict(), {}, set()
+        if self._clients_loop is not asyncio.get_running_loop():
+            # Opened on another (finished) loop; they cannot be awaited from here
+            self._clients_loop = None
+            return
+        for client in clients:
+            await self._close_client(client)
+
+    @staticmethod
+    def _parse_text(html_content: str, max_chars: int) -> str:
+        soup = BeautifulSoup(html_content, "html.parser")
+        # Remove scripts, styles, and common boilerplate containers
+        for element in soup(["script", "style", "header", "footer", "nav", "aside", "form", "iframe", "noscript"]):
+            element.decompose()
+
+        # Walk the text nodes line by line (same lines as get_text(separator='\n', strip=True))
+        # and clean up excessive newlines/spaces
+        cleaned_lines = []
+        collected = 0
+        for string in soup.stripped_strings:
+            for line in string.splitlines():
                 line = line.strip()
                 if line:
                     # Replace multiple spaces with single space
                     line = " ".join(line.split())
                     cleaned_lines.append(line)
+                    collected += len(line) + 2
+            if max_chars > 0 and collected >= max_chars:
+                break
+
+        return "\n\n".join(cleaned_lines)
 
-            text = "\n\n".join(cleaned_lines)
+    def extract_text(self, html_content: str, url: str = "", max_chars: int = 0) -> str:
+        """
+        Extracts and cleans text content from HTML using BeautifulSoup.
+        With max_chars > 0, line cleanup stops once that much text is collected (the caller truncates),
+        and only the first max_chars * _HTML_MARKUP_HEADROOM chars of HTML are parsed unless that
+        prefix yields less than max_chars of text (e.g. a heavy inline <head>), when the whole page is.
+        """
+        if not html_content:
+            return ""
+        try:
+            limit = max_chars * _HTML_MARKUP_HEADROOM
+            if max_chars > 0 and len(html_content) > limit:
+                text = self._parse_text(html_content[:limit], max_chars)
+                if len(text) < max_chars:
+                    text = self._parse_text(html_content, max_chars)
+            else:
+                text = self._parse_text(html_content, max_chars)
 
             if not text and url:
-                logger.info(f"No text extracted from {url} after parsing.")
+                logger.info("No text extracted from %s after parsing.", url)
             return text
         except Exception as e:
             logger.error(f"Error parsing HTML and extracting text (URL: {url if url else 'N/A'}): {e}")
@@ -107,104 +193,143 @@ class ContentRetriever:
         return resolved_ips[0]
 
     async def retrieve_and_extract(self, url: str, timeout: Optional[int] = None) -> str:
-        """Asynchronously fetches content from a URL and extracts clean text with caching."""
-        if getattr(self.config, "ENABLE_CACHING", True):
-            cached = await self.cache_manager.get_content_cache(url)
-            if cached:
-                logger.info(f"Content for {url} retrieved from cache.")
-                return cached
-
-        logger.info(f"Attempting to retrieve and extract content from: {url}")
+        """
+        Asynchronously fetches content from a URL and extracts clean text with caching.
+        An expired cache entry is revalidated with a conditional GET; a 304 reuses it without re-parsing.
+        """
+        caching = getattr(self.config, "ENABLE_CACHING", True)
+        entry = await self.cache_manager.get_content_cache_entry(url) if caching else None
+        validators = {}
+        if entry and entry.get("content"):
+            ttl = getattr(self.config, "CONTENT_CACHE_TTL_SECONDS", 86400)
+            if time.time() - entry.get("timestamp", 0) < ttl:
+                logger.info("Content for %s retrieved from cache.", url)
+                return entry["content"]
+            validators = entry.get("validators") or {}
+
+        result, new_validators = await self._fetch_and_extract(url, timeout, validators)
+        if result is None:
+            # Not modified: keep the stored text and restart its TTL
+            logger.info("Content for %s not modified; reusing cached text.", url)
+            result, new_validators = entry["content"], validators
+        if caching and result:
+            await self.cache_manager.set_content_cache(url, result, new_validators)
+        return result
+
+    async def _fetch_and_extract(self, url: str, timeout: Optional[int] = None,
+                                 validators: Optional[dict] = None) -> Tuple[Optional[str], dict]:
+        """
+        Fetches and extracts the URL, returning (text, validators) where validators holds the response's
+        ETag/Last-Modified. Text is None when the server answers 304 to the conditional headers in `validators`.
+        """
+        logger.info("Attempting to retrieve and extract content from: %s", url)
         request_timeout = timeout or getattr(self.config, "RETRIEVAL_TIMEOUT", 15)
+        validators = validators or {}
 
         try:
-            # We use follow_redirects=False to manually validate each redirect for security
-            async with httpx.AsyncClient(headers=self.headers, follow_redirects=False, timeout=request_timeout) as client:
-                current_url = url
-                response = None
-                max_redirects = 10
-
-                for _ in range(max_redirects):
-                    # Resolve and validate the URL before fetching
-                    try:
-                        resolved_ip = await self._resolve_and_validate_url(current_url)
-                    except ValueError as ve:
-                        logger.warning(f"URL validation failed for {current_url}: {ve}")
-                        return ""
-
-                    parsed_url = urlparse(current_url)
-                    # Construct pinned URL using IP
-                    # Handle both http and https, and preserve port if present
-                    port_str = f":{parsed_url.port}" if parsed_url.port else ""
-
-                    # Handle IPv6 brackets in URL
-                    ip_for_url = resolved_ip
-                    if ":" in resolved_ip and not resolved_ip.startswith("["):
-                        ip_for_url = f"[{resolved_ip}]"
-
-                    pinned_url = f"{parsed_url.scheme}://{ip_for_url}{port_str}{parsed_url.path}"
-                    if parsed_url.query:
-                        pinned_url += f"?{parsed_url.query}"
-                    if parsed_url.fragment:
-                        pinned_url += f"#{parsed_url.fragment}"
-
-                    request_headers = self.headers.copy()
-                    # Host header should include the port if it's non-standard
-                    request_headers["Host"] = parsed_url.netloc
-
-                    req = httpx.Request("GET", pinned_url, headers=request_headers)
-                    if parsed_url.scheme == "https":
-                        req.extensions["sni_hostname"] = parsed_url.hostname.encode()
-
+            # Redirects are followed manually (clients use follow_redirects=False) so each hop is validated
+            current_url = url
+            response = None
+            max_redirects = 10
+
+            for _ in range(max_redirects):
+                # Resolve and validate the URL before fetching
+                try:
+                    resolved_ip = await self._resolve_and_validate_url(current_url)
+                except ValueError as ve:
+                    logger.warning(f"URL validation failed for {current_url}: {ve}")
+                    return "", {}
+
+                parsed_url = urlparse(current_url)
+                # Construct pinned URL using IP
+                # Handle both http and https, and preserve port if present
+                port_str = f":{parsed_url.port}" if parsed_url.port else ""
+
+                # Handle IPv6 brackets in URL
+                ip_for_url = resolved_ip
+                if ":" in resolved_ip and not resolved_ip.startswith("["):
+                    ip_for_url = f"[{resolved_ip}]"
+
+                pinned_url = f"{parsed_url.scheme}://{ip_for_url}{port_str}{parsed_url.path}"
+                if parsed_url.query:
+                    pinned_url += f"?{parsed_url.query}"
+                if parsed_url.fragment:
+                    pinned_url += f"#{parsed_url.fragment}"
+
+                request_headers = self.headers.copy()
+                # Host header should include the port if it's non-standard
+                request_headers["Host"] = parsed_url.netloc
+                if validators.get("etag"):
+                    request_headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    request_headers["If-Modified-Since"] = validators["last_modified"]
+
+                req = httpx.Request("GET", pinned_url, headers=request_headers)
+                req.extensions["timeout"] = httpx.Timeout(request_timeout).as_dict()
+                if parsed_url.scheme == "https":
+                    req.extensions["sni_hostname"] = parsed_url.hostname.encode()
+
+                client = await self._acquire_client(parsed_url.hostname)
+                try:
                     response = await client.send(req)
+                finally:
+                    await self._release_client(client)
 
-                    # Check for redirects
-                    if response.is_redirect:
-                        location = response.headers.get("Location")
-                        if not location:
-                            break
-
-                        # Handle relative redirects
-                        current_url = urljoin(current_url, location)
-                        continue
-                    else:
+                # Check for redirects
+                if response.is_redirect:
+                    location = response.headers.get("Location")
+                    if not location:
                         break
-                else:
-                    logger.warning(f"Max redirects exceeded for {url}")
-                    return ""
-
-                if response is None:
-                     return ""
-
-                response.raise_for_status()
 
-                content_type = response.headers.get("Content-Type", "").lower()
-
-                # PDF Processing
-                if (getattr(self.config, "PROCESS_PDF_FILES", True) and ("application/pdf" in content_type or current_url.lower().endswith(".pdf"))):
-                    return await self._process_pdf(response.content, current_url)
-
-                # HTML Processing
-                elif "text/html" in content_type:
-                    text_content = self.extract_text(response.text, url=current_url)
-                    if text_content:
-                        await self._call_progress(f"Successfully extracted {len(text_content)} chars from HTML: {current_url}")
-                    return self._apply_truncation(text_content, current_url)
-
-                # Fallback for plain text
-                elif "text/" in content_type:
-                    return self._apply_truncation(response.text.strip(), current_url)
-
-                    logger.warning(f"Unsupported content type '{content_type}' for {current_url}.")
-                    return ""
-
-                if getattr(self.config, "ENABLE_CACHING", True) and result:
-                    await self.cache_manager.set_content_cache(url, result)
-                return result
+                    # Handle relative redirects
+                    current_url = urljoin(current_url, location)
+                    continue
+                else:
+                    break
+            else:
+                logger.warning(f"Max redirects exceeded for {url}")
+                return "", {}
+
+            if response is None:
+                 return "", {}
+
+            if validators and response.status_code == 304:
+                return None, validators
+
+            response.raise_for_status()
+            new_validators = {
+                key: value for key, value in (
+                    ("etag", response.headers.get("ETag")), ("last_modified", response.headers.get("Last-Modified"))
+                ) if isinstance(value, str) and value
+            }
+
+            content_type = response.headers.get("Content-Type", "").lower()
+
+            # PDF Processing
+            if (getattr(self.config, "PROCESS_PDF_FILES", True) and ("application/pdf" in content_type or current_url.lower().endswith(".pdf"))):
+                return await self._process_pdf(response.content, current_url), new_validators
+
+            # HTML Processing
+            elif "text/html" in content_type:
+                # HTML parsing is CPU-bound; keep it off the event loop so concurrent fetches overlap
+                text_content = await asyncio.to_thread(
+                    self.extract_text, response.text, url=current_url,
+                    max_chars=getattr(self.config, "MAX_TEXT_LENGTH_PER_SOURCE_CHARS", 0)
+                )
+                if text_content:
+                    await self._call_progress(f"Successfully extracted {len(text_content)} chars from HTML: {current_url}")
+                return self._apply_truncation(text_content, current_url), new_validators
+
+            # Fallback for plain text
+            elif "text/" in content_type:
+                return self._apply_truncation(response.text.strip(), current_url), new_validators
+
+            logger.warning(f"Unsupported content type '{content_type}' for {current_url}.")
+            return "", {}
 
         except Exception as e:
             logger.error(f"Error retrieving {url}: {e}")
-            return ""
+            return "", {}
 
     async def _process_pdf(self, pdf_bytes: bytes, url: str) -> str:
         await self._call_progress(f"PDF detected. Processing: {url}")
@@ -215,12 +340,21 @@ class ContentRetriever:
 
     def _sync_process_pdf(self, pdf_bytes: bytes, url: str) -> str:
         try:
+            # Imported here so pypdf is only loaded once a PDF is actually retrieved
+            from pypdf import PdfReader
             with io.BytesIO(pdf_bytes) as f:
                 reader = PdfReader(f)
+                limit = getattr(self.config, "MAX_TEXT_LENGTH_PER_SOURCE_CHARS", 0)
                 pages = []
+                collected = 0
                 for page in reader.pages:
                     t = page.extract_text()
-                    if t: pages.append(t)
+                    if t:
+                        pages.append(t)
+                        collected += len(t) + 2
+                    # Later pages would be truncated away; skip extracting them
+                    if limit > 0 and collected >= limit:
+                        break
                 text = "\n\n".join(pages)
                 return self._apply_truncation(text, url)
         except Exception as e:
@@ -230,6 +364,6 @@ class ContentRetriever:
     def _apply_truncation(self, text: str, url: str) -> str:
         limit = getattr(self.config, "MAX_TEXT_LENGTH_PER_SOURCE_CHARS", 0)
         if limit > 0 and len(text) > limit:
-            logger.info(f"Truncating content from {url} to {limit} chars.")
+            logger.info("Truncating content from %s to %s chars.", url, limit)
             return text[:limit]
         return text
@@ -1,12 +1,12 @@
 from deep_research_project.config.config import Configuration
 import logging
-from typing import Type, TypeVar, Any, Optional
+from typing import Type, TypeVar, Any, Optional, Dict, List, AsyncIterator
 import asyncio
-import json
-import re
+import hashlib
 from pydantic import BaseModel, ValidationError
 from langchain_core.messages import SystemMessage, HumanMessage
-from deep_research_project.tools.cache_manager import CacheManager
+from deep_research_project.tools.cache_manager import CacheManager, MemoryCache, _dumps
+from deep_research_project.core.utils import iter_json_values
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +21,21 @@ class LLMClient:
         self.config = config
         self.llm = None
         self._rate_limit_lock = asyncio.Lock()
+        # Caps in-flight provider requests across every call site sharing this client
+        self._llm_semaphore = asyncio.Semaphore(getattr(self.config, "MAX_CONCURRENT_LLM_CALLS", 8))
         self._last_request_time = 0.0
         cache_dir = getattr(self.config, "CACHE_DIR", ".cache")
         enable_caching = getattr(self.config, "ENABLE_CACHING", True)
         self.cache_manager = CacheManager(cache_dir=cache_dir, enabled=enable_caching)
+        # L1 in front of the disk cache, plus in-flight requests so identical concurrent prompts share one call
+        self.memory_cache = MemoryCache(
+            max_entries=getattr(self.config, "LLM_MEMORY_CACHE_MAX_ENTRIES", 100),
+            ttl_seconds=getattr(self.config, "LLM_MEMORY_CACHE_TTL_SECONDS", 60.0)
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Per response model: structured-output runnables (keyed with the llm they wrap) and fallback parsers
+        self._structured_llms: Dict[type, tuple] = {}
+        self._output_parsers: Dict[type, tuple] = {}
 
         if self.config.LLM_PROVIDER == "openai":
             try:
@@ -131,7 +142,7 @@ class LLMClient:
             elapsed = current_time - self._last_request_time
             if elapsed < limit_interval:
                 wait_time = limit_interval - elapsed
-                logger.debug(f"Rate limit shielding: Sleeping for {wait_time:.3f}s (RPM: {rpm})")
+                logger.debug("Rate limit shielding: Sleeping for %.3fs (RPM: %s)", wait_time, rpm)
                 await asyncio.sleep(wait_time)
             self._last_request_time = asyncio.get_event_loop().time()
 
@@ -142,9 +153,10 @@ class LLMClient:
         
         for attempt in range(max_retries + 1):
             try:
-                # Always wait for the rate limit shield before the call
-                await self._wait_for_rate_limit()
-                return await func(*args, **kwargs)
+                async with self._llm_semaphore:
+                    # Always wait for the rate limit shield before the call
+                    await self._wait_for_rate_limit()
+                    return await func(*args, **kwargs)
             except Exception as e:
                 error_str = str(e).lower()
                 is_rate_limit = "rate limit" in error_str or "429" in error_str
@@ -176,6 +188,30 @@ class LLMClient:
 
         return any(pattern in model_name_lower for pattern in patterns)
 
+    def _cache_key(self, prompt: str, system_prompt: Optional[str] = None, temperature: Optional[float] = None,
+                   response_model: Optional[Type[BaseModel]] = None) -> str:
+        """
+        Deterministic cache key covering everything that changes the completion, not just the prompt,
+        so switching model/temperature or asking for structured vs. plain output never returns a stale entry.
+        """
+        if temperature is None:
+            temperature = getattr(self.config, "LLM_TEMPERATURE", None)
+        # Field order is fixed here, so the encoding is deterministic without sorting keys.
+        # Prompts can be 100k+ chars; orjson (when installed) encodes them several times faster than json.
+        return _dumps({
+            "provider": self.config.LLM_PROVIDER,
+            "model": self.config.LLM_MODEL,
+            "temperature": temperature,
+            "response_model": response_model.__name__ if response_model else None,
+            "system": system_prompt,
+            "prompt": prompt,
+        }, default=str).decode("utf-8")
+
+    @staticmethod
+    def _memory_cache_key(cache_key: str) -> str:
+        """Short digest of a _cache_key result for the in-process caches."""
+        return hashlib.blake2b(cache_key.encode("utf-8"), digest_size=16).hexdigest()
+
     async def generate_text(self, prompt: str, system_prompt: Optional[str] = None, temperature: Optional[float] = None) -> str:
         """Asynchronously generates text from a prompt with retry logic and caching."""
         if self._is_fixed_temperature_model(self.config.LLM_MODEL):
@@ -183,9 +219,51 @@ class LLMClient:
                 logger.info(f"Overriding provided temperature {temperature} to 1.0 for GPT-5 model.")
             temperature = 1.0
 
-        cache_key = prompt
-        if system_prompt:
-            cache_key = f"SYSTEM: {system_prompt}\nUSER: {prompt}"
+        # Built once per call and shared by the memory, in-flight and disk caches
+        cache_key = self._cache_key(prompt, system_prompt, temperature)
+        if not getattr(self.config, "ENABLE_CACHING", True):
+            return await self._generate_text_uncached(prompt, system_prompt, temperature, cache_key)
+
+        mem_key = self._memory_cache_key(cache_key)
+        cached = self.memory_cache.get(mem_key)
+        if cached is not None:
+            logger.debug("LLM result retrieved from memory cache.")
+            return cached
+
+        task = self._inflight.get(mem_key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_text_uncached(prompt, system_prompt, temperature, cache_key))
+            self._inflight[mem_key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(mem_key, None))
+        else:
+            logger.debug("Joining in-flight LLM request for identical prompt.")
+
+        # Shield so one cancelled caller does not cancel the call others are waiting on
+        result = await asyncio.shield(task)
+        if result:
+            self.memory_cache.set(mem_key, result)
+        return result
+
+    async def generate_text_batch(self, prompts: List[str], temperature: Optional[float] = None) -> List[str]:
+        """
+        Generates text for several prompts in one call, returning results in prompt order.
+        Duplicate prompts are sent once, and a failed prompt yields an empty string instead of failing the batch.
+        """
+        unique_prompts = list(dict.fromkeys(prompts))
+        outcomes = await asyncio.gather(
+            *[self.generate_text(p, temperature=temperature) for p in unique_prompts], return_exceptions=True
+        )
+        by_prompt = {}
+        for p, outcome in zip(unique_prompts, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Batched LLM call failed: {outcome}")
+                outcome = ""
+            by_prompt[p] = outcome
+        return [by_prompt[p] for p in prompts]
+
+    async def _generate_text_uncached(self, prompt: str, system_prompt: Optional[str], temperature: Optional[float],
+                                      cache_key: str) -> str:
+        """Disk-cache lookup and provider call behind generate_text's in-process cache."""
 
         if getattr(self.config, "ENABLE_CACHING", True):
             cached = await self.cache_manager.get_llm_cache(cache_key)
@@ -197,45 +275,9 @@ class LLMClient:
             result = self._simulate_placeholder(prompt, system_prompt=system_prompt)
         else:
             async def _call():
-                llm_to_call = self.llm
-                if temperature is not None and hasattr(self.llm, "bind"):
-                    if self.config.LLM_PROVIDER == "ollama":
-                        llm_to_call = self.llm.bind(options={"temperature": temperature})
-                    else:
-                        llm_to_call = self.llm.bind(temperature=temperature)
-                
-                if system_prompt:
-                    messages = [
-                        SystemMessage(content=system_prompt),
-                        HumanMessage(content=prompt)
-                    ]
-                    response = await llm_to_call.ainvoke(messages)
-                else:
-                    response = await llm_to_call.ainvoke(prompt)
-                
-                # Robustly extract content and handle potential list returns (e.g., from Gemini)
-                content = None
-                if hasattr(response, 'content'):
-                    content = response.content
-                else:
-                    content = response
-                
-                if isinstance(content, list):
-                    # Robustly handle list of strings or list of dictionaries (Common in some LLM providers like Gemini)
-                    parts = []
-                    for item in content:
-                        if isinstance(item, dict):
-                            # Try to extract common text fields
-                            parts.append(str(item.get('text', item.get('content', str(item)))))
-                        else:
-                            parts.append(str(item))
-                    return "\n".join(parts)
-                elif isinstance(content, dict):
-                    # Handle single dictionary response
-                    return str(content.get('text', content.get('content', str(content))))
-                elif content is None:
-                    return ""
-                return str(content)
+                llm_to_call = self._bind_temperature(temperature)
+                response = await llm_to_call.ainvoke(self._build_input(prompt, system_prompt))
+                return self._extract_content(response)
 
             try:
                 result = await self._invoke_with_retry(_call)
@@ -248,13 +290,90 @@ class LLMClient:
         
         return result
 
+    def _bind_temperature(self, temperature: Optional[float]):
+        """Returns the LLM bound to a per-call temperature, using the provider-specific option shape."""
+        if temperature is None or not hasattr(self.llm, "bind"):
+            return self.llm
+        if self.config.LLM_PROVIDER == "ollama":
+            return self.llm.bind(options={"temperature": temperature})
+        return self.llm.bind(temperature=temperature)
+
+    @staticmethod
+    def _build_input(prompt: str, system_prompt: Optional[str]):
+        if system_prompt:
+            return [SystemMessage(content=system_prompt), HumanMessage(content=prompt)]
+        return prompt
+
+    @staticmethod
+    def _extract_content(response: Any) -> str:
+        """Robustly extracts text from a response or stream chunk (handles list/dict content, e.g., from Gemini)."""
+        content = response.content if hasattr(response, 'content') else response
+
+        if isinstance(content, list):
+            # Robustly handle list of strings or list of dictionaries (Common in some LLM providers like Gemini)
+            parts = []
+            for item in content:
+                if isinstance(item, dict):
+                    # Try to extract common text fields
+                    parts.append(str(item.get('text', item.get('content', str(item)))))
+                else:
+                    parts.append(str(item))
+            return "\n".join(parts)
+        elif isinstance(content, dict):
+            # Handle single dictionary response
+            return str(content.get('text', content.get('content', str(content))))
+        elif content is None:
+            return ""
+        return str(content)
+
+    async def generate_text_stream(self, prompt: str, system_prompt: Optional[str] = None,
+                                   temperature: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Streams text for a prompt chunk by chunk so callers can act on partial output.
+        A cached response is yielded as a single chunk; the full stream is cached once complete.
+        Unlike generate_text, a failed stream is not retried since partial output was already yielded.
+        """
+        if self._is_fixed_temperature_model(self.config.LLM_MODEL):
+            temperature = 1.0
+
+        caching = getattr(self.config, "ENABLE_CACHING", True)
+        cache_key = self._cache_key(prompt, system_prompt, temperature)
+        if caching:
+            cached = self.memory_cache.get(self._memory_cache_key(cache_key))
+            if cached is None:
+                cached = await self.cache_manager.get_llm_cache(cache_key)
+            if cached:
+                yield cached
+                return
+
+        if self.llm == "PlaceholderLLMInstance" or not hasattr(self.llm, "astream"):
+            result = await self.generate_text(prompt, system_prompt=system_prompt, temperature=temperature)
+            if result:
+                yield result
+            return
+
+        parts = []
+        async with self._llm_semaphore:
+            await self._wait_for_rate_limit()
+            async for chunk in self._bind_temperature(temperature).astream(self._build_input(prompt, system_prompt)):
+                text = self._extract_content(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+
+        result = "".join(parts)
+        if caching and result:
+            self.memory_cache.set(self._memory_cache_key(cache_key), result)
+            await self.cache_manager.set_llm_cache(cache_key, result)
+
     async def generate_structured(self, prompt: str, response_model: Type[T]) -> T:
         """Asynchronously generates structured output using LangChain's with_structured_output with robust fallbacks, retries, and caching."""
+        cache_key = self._cache_key(prompt, response_model=response_model)
         if getattr(self.config, "ENABLE_CACHING", True):
-            cached_json = await self.cache_manager.get_llm_cache(prompt)
+            cached_json = await self.cache_manager.get_llm_cache(cache_key)
             if cached_json:
                 try:
-                    logger.info(f"Structured result for {response_model.__name__} retrieved from cache.")
+                    logger.info("Structured result for %s retrieved from cache.", response_model.__name__)
                     return response_model.model_validate_json(cached_json)
                 except Exception as e:
                     logger.warning(f"Failed to validate cached JSON for {response_model.__name__}: {e}")
@@ -263,7 +382,7 @@ class LLMClient:
             result = self._simulate_placeholder_structured(prompt, response_model)
         else:
             async def _call_native():
-                structured_llm = self.llm.with_structured_output(response_model)
+                structured_llm = self._structured_llm(response_model)
                 result = await structured_llm.ainvoke(prompt)
                 if result:
                     return result
@@ -281,16 +400,29 @@ class LLMClient:
                 result = await self._generate_structured_fallback(prompt, response_model)
         
         if getattr(self.config, "ENABLE_CACHING", True) and result:
-            await self.cache_manager.set_llm_cache(prompt, result.model_dump_json())
+            await self.cache_manager.set_llm_cache(cache_key, result.model_dump_json())
         
         return result
 
+    def _structured_llm(self, response_model: Type[T]):
+        """with_structured_output converts the model's schema on every call, so the runnable is built once per model."""
+        cached = self._structured_llms.get(response_model)
+        if cached is None or cached[0] is not self.llm:
+            cached = self._structured_llms[response_model] = (self.llm, self.llm.with_structured_output(response_model))
+        return cached[1]
+
+    def _output_parser(self, response_model: Type[T]) -> tuple:
+        """(PydanticOutputParser, its format instructions) for a model, built once; the instructions embed its JSON schema."""
+        cached = self._output_parsers.get(response_model)
+        if cached is None:
+            from langchain_core.output_parsers import PydanticOutputParser
+            parser = PydanticOutputParser(pydantic_object=response_model)
+            cached = self._output_parsers[response_model] = (parser, parser.get_format_instructions())
+        return cached
+
     async def _generate_structured_fallback(self, prompt: str, response_model: Type[T]) -> T:
         """Fallback that uses PydanticOutputParser and custom robust JSON extraction if parsing fails."""
-        from langchain_core.output_parsers import PydanticOutputParser
-        parser = PydanticOutputParser(pydantic_object=response_model)
-
-        format_instructions = parser.get_format_instructions()
+        parser, format_instructions = self._output_parser(response_model)
         full_prompt = f"{prompt}\n\n{format_instructions}"
 
         try:
@@ -308,25 +440,19 @@ class LLMClient:
 
     def _robust_json_extract(self, text: str, response_model: Type[T]) -> T:
         """Attempts to find and parse JSON even from messy LLM output, with field-level tolerance."""
-        # Clean the text to find potential JSON blocks
-        json_matches = re.findall(r'(\{.*\}|\[.*\])', text, re.DOTALL)
-        
+        # Decode JSON values where they start; prose before, between or after them is skipped
         parsed_data = {}
-        for match in json_matches:
-            try:
-                data = json.loads(match)
-                if isinstance(data, dict):
-                    parsed_data.update(data)
-                elif isinstance(data, list) and hasattr(response_model, 'model_fields'):
-                    # If it's a list, check if the model has a list field that might fit
-                    for field_name, field_info in response_model.model_fields.items():
-                        # Check if annotation is a list (handling List[T] and list[T])
-                        origin = getattr(field_info.annotation, '__origin__', None)
-                        if origin is list or field_info.annotation is list:
-                            parsed_data[field_name] = data
-                            break
-            except json.JSONDecodeError:
-                continue
+        for data in iter_json_values(text):
+            if isinstance(data, dict):
+                parsed_data.update(data)
+            elif isinstance(data, list) and hasattr(response_model, 'model_fields'):
+                # If it's a list, check if the model has a list field that might fit
+                for field_name, field_info in response_model.model_fields.items():
+                    # Check if annotation is a list (handling List[T] and list[T])
+                    origin = getattr(field_info.annotation, '__origin__', None)
+                    if origin is list or field_info.annotation is list:
+                        parsed_data[field_name] = data
+                        break
 
         if not parsed_data:
             logger.error(f"Failed to extract any valid JSON from: {text[:200]}...")
@@ -368,7 +494,7 @@ class LLMClient:
                         try:
                             valid_items.append(item_model.model_validate(item))
                         except ValidationError:
-                            logger.debug(f"Skipping invalid item in {field_name}: {item}")
+                            logger.debug("Skipping invalid item in %s: %s", field_name, item)
                             continue
                     cleaned_data[field_name] = valid_items
         
@@ -379,13 +505,13 @@ class LLMClient:
             return response_model.model_validate({})
 
     def _simulate_placeholder(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        logger.debug(f"LLMClient (Placeholder) generating text for prompt: '{prompt[:80]}...' (System prompt present: {system_prompt is not None})")
+        logger.debug("LLMClient (Placeholder) generating text for prompt: '%.80s...' (System prompt present: %s)", prompt, system_prompt is not None)
         if "evaluate if the summary has sufficiently explored" in prompt.lower():
             return "EVALUATION: CONCLUDE\nQUERY: None"
         return f"Simulated LLM response to: {prompt[:50]}..."
 
     def _simulate_placeholder_structured(self, prompt: str, response_model: Type[T]) -> T:
-        logger.debug(f"LLMClient (Placeholder) generating structured output for: {response_model.__name__}")
+        logger.debug("LLMClient (Placeholder) generating structured output for: %s", response_model.__name__)
 
         if "structured research plan" in prompt.lower():
             from deep_research_project.core.state import ResearchPlanModel, Section
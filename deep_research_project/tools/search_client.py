@@ -1,7 +1,7 @@
-from langchain_community.utilities.duckduckgo_search import DuckDuckGoSearchAPIWrapper
-from langchain_community.utilities import SearxSearchWrapper
 from deep_research_project.config.config import Configuration
 from deep_research_project.core.state import SearchResult
+from deep_research_project.tools.cache_manager import CacheManager
+from dataclasses import asdict
 import logging
 import asyncio
 
@@ -10,9 +10,17 @@ logger = logging.getLogger(__name__)
 class SearchClient:
     def __init__(self, config: Configuration):
         self.config = config
+        # Search results are cached on disk only when a TTL is configured (0 disables)
+        self.cache_ttl = getattr(self.config, "SEARCH_CACHE_TTL_SECONDS", 0)
+        self.cache_manager = CacheManager(
+            cache_dir=getattr(self.config, "CACHE_DIR", ".cache"),
+            enabled=getattr(self.config, "ENABLE_CACHING", True) and self.cache_ttl > 0
+        )
         logger.info(f"Attempting to initialize SearchClient with API: {self.config.SEARCH_API}")
         if self.config.SEARCH_API == "duckduckgo":
             try:
+                # langchain_community is slow to import, so the wrapper is only loaded for the configured API
+                from langchain_community.utilities.duckduckgo_search import DuckDuckGoSearchAPIWrapper
                 self.search_tool = DuckDuckGoSearchAPIWrapper()
                 logger.info("Successfully initialized DuckDuckGo Search Client.")
             except Exception as e:
@@ -30,6 +38,7 @@ class SearchClient:
                 headers = {
                     "User-Agent": user_agent
                 }
+                from langchain_community.utilities import SearxSearchWrapper
                 self.search_tool = SearxSearchWrapper(
                     searx_host=searxng_host,
                     k=k_results,
@@ -46,16 +55,26 @@ class SearchClient:
 
     async def search(self, query: str, num_results: int = 3) -> list[SearchResult]:
         """Asynchronously performs a web search."""
-        logger.info(f"Searching with {self.config.SEARCH_API} for: '{query}', num_results={num_results}")
+        logger.info("Searching with %s for: '%s', num_results=%s", self.config.SEARCH_API, query, num_results)
+
+        cache_key = f"{self.config.SEARCH_API}|{num_results}|{query}"
+        cached = await self.cache_manager.get_search_cache(cache_key, self.cache_ttl)
+        if cached is not None:
+            logger.info("Search results for '%s' retrieved from cache.", query)
+            return [SearchResult(**r) for r in cached]
 
         # Wrapping sync search in a thread to make it non-blocking in async context
         loop = asyncio.get_running_loop()
         try:
-            return await loop.run_in_executor(None, self._sync_search, query, num_results)
+            results = await loop.run_in_executor(None, self._sync_search, query, num_results)
         except Exception as e:
             logger.error(f"Error during search with {self.config.SEARCH_API} for query '{query}': {e}", exc_info=True)
             return []
 
+        if results:
+            await self.cache_manager.set_search_cache(cache_key, [asdict(r) for r in results])
+        return results
+
     def _sync_search(self, query: str, num_results: int) -> list[SearchResult]:
         if self.config.SEARCH_API == "searxng":
             # For SearxSearchWrapper, 'k' was set at init, but let's see if results() supports limit override.
@@ -80,5 +99,5 @@ class SearchClient:
                         snippet=res.get("snippet", "No snippet available.")
                     )
                 )
-        logger.info(f"Found {len(processed_results)} results via SearchClient.")
+        logger.info("Found %s results via SearchClient.", len(processed_results))
         return processed_results